@@ -7,6 +7,8 @@ hiddenimports += collect_submodules("fastapi")
 hiddenimports += collect_submodules("starlette")
 hiddenimports += collect_submodules("uvicorn")
 hiddenimports += collect_submodules("psycopg2")
+hiddenimports += collect_submodules("psycopg")
+hiddenimports += collect_submodules("psycopg_pool")
 
 datas = []
 datas += collect_data_files("fastapi")
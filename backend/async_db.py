@@ -0,0 +1,101 @@
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+from backend.db import (
+    DATABASE_URL,
+    DB_TYPE,
+    build_settings_snapshot,
+    cached_settings_snapshot,
+    int_env,
+    settings_version,
+    targets_from_settings,
+)
+from backend.metrics import cache_hit, cache_miss
+from backend.query_timing import record_pool_wait, timed_async_cursor
+from backend.tenant import current_user_id
+
+# Opt-in: serve the hot read/punch endpoints from an asyncio pool instead of
+# psycopg2 + FastAPI's threadpool. The sync routers stay available as fallback.
+# PostgreSQL only: the SQLite backend is local and has no network round trip to hide.
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1" and DB_TYPE == "postgres"
+
+_ASYNC_POOL = None
+
+
+async def open_async_pool() -> None:
+    """Open the psycopg 3 async pool. Called once from the app startup hook."""
+    global _ASYNC_POOL
+    if _ASYNC_POOL is not None:
+        return
+
+    from psycopg import AsyncCursor
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    pool = AsyncConnectionPool(
+        conninfo=DATABASE_URL,
+        min_size=int_env("DB_ASYNC_POOL_MIN", 1),
+        max_size=int_env("DB_ASYNC_POOL_MAX", 20),
+        timeout=int_env("DB_ASYNC_POOL_TIMEOUT", 30),
+        # prepare_threshold=None keeps us compatible with Supabase's pgbouncer pooler
+        kwargs={
+            "row_factory": dict_row,
+            "prepare_threshold": None,
+            "cursor_factory": timed_async_cursor(AsyncCursor),
+        },
+        open=False,
+    )
+    await pool.open()
+    _ASYNC_POOL = pool
+    logging.info("Async PostgreSQL pool opened | min=%s | max=%s", pool.min_size, pool.max_size)
+
+
+async def close_async_pool() -> None:
+    global _ASYNC_POOL
+    if _ASYNC_POOL is None:
+        return
+    await _ASYNC_POOL.close()
+    _ASYNC_POOL = None
+
+
+@asynccontextmanager
+async def get_async_con():
+    """Borrow an async connection; it goes back to the pool on every exit path."""
+    if _ASYNC_POOL is None:
+        await open_async_pool()
+    start = time.perf_counter()
+    async with _ASYNC_POOL.connection() as con:
+        record_pool_wait(time.perf_counter() - start)
+        yield con
+
+
+async def _settings_snapshot_async(con):
+    snap = cached_settings_snapshot()
+    if snap is not None:
+        cache_hit("settings")
+    else:
+        cache_miss("settings")
+        version = settings_version()
+        cur = con.cursor()
+        await cur.execute("SELECT key, value FROM settings WHERE user_id = %s", (current_user_id(),))
+        snap = build_settings_snapshot(version, await cur.fetchall())
+    return snap
+
+
+async def get_settings_async(con) -> dict[str, str]:
+    return dict((await _settings_snapshot_async(con)).settings)
+
+
+async def get_targets_async(con) -> dict[str, int]:
+    snap = await _settings_snapshot_async(con)
+    if snap.targets is None:
+        return targets_from_settings(snap.settings)
+    return dict(snap.targets)
+
+
+def async_pool_stats() -> dict:
+    if _ASYNC_POOL is None:
+        return {}
+    return _ASYNC_POOL.get_stats()
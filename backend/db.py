@@ -1,8 +1,22 @@
 import os
 import sys
+import time
+import queue
 import logging
+import threading
+import traceback
+import weakref
+from contextlib import contextmanager
+from typing import Optional
 from fastapi import HTTPException
 from dotenv import load_dotenv
+from backend.db_pool import ConnectionPool, PoolTimeout
+from backend.logging_config import get_runtime_dir
+from backend.metrics import cache_hit, cache_miss
+from backend.migrations import run_migrations, set_time_off_exclusion
+from backend.query_timing import record_pool_wait, timed_cursor
+from backend.sqlite_backend import SQLiteCursor, connect_sqlite
+from backend.tenant import current_user_id
 
 def _load_env() -> None:
     candidates = []
@@ -35,17 +49,29 @@ def _load_env() -> None:
 
 _load_env()
 
-# Supabase (PostgreSQL) is required
+# Storage backend:
+#   "postgres" - Supabase, default
+#   "sqlite"   - local file, no network
+#   "hybrid"   - local SQLite replica serves every request; a background worker
+#                replays its outbox to Postgres and pulls remote changes back
+DB_TYPE = os.getenv("DB_TYPE", "postgres").strip().lower()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if not DATABASE_URL:
+if DB_TYPE not in ("postgres", "sqlite", "hybrid"):
+    raise RuntimeError(f"Unsupported DB_TYPE={DB_TYPE!r}. Use 'postgres', 'sqlite' or 'hybrid'.")
+
+# Dialect of the connections handed out by get_con()
+SQL_DIALECT = "postgres" if DB_TYPE == "postgres" else "sqlite"
+
+if DB_TYPE in ("postgres", "hybrid") and not DATABASE_URL:
     raise RuntimeError(
         "DATABASE_URL environment variable is required!\n"
         "Please set it in your .env file with your Supabase connection string.\n"
-        "Get it from: Supabase Console → Settings → Database → Connection String (Session Pooler)"
+        "Get it from: Supabase Console → Settings → Database → Connection String (Session Pooler)\n"
+        "Or set DB_TYPE=sqlite to keep all data in a local timetracker.db file."
     )
 
-DB_TYPE = "postgres"
+SQLITE_PATH = os.getenv("SQLITE_PATH") or os.path.join(get_runtime_dir(), "timetracker.db")
 
 DEFAULT_SETTINGS = {
     "daily_soft_minutes": "360", # 6h
@@ -53,149 +79,372 @@ DEFAULT_SETTINGS = {
     "workdays_per_week": 5 # Mon-Fri
 }
 
+# Postgres only: reject time off ranges that overlap a stored one (409). Not used in
+# hybrid mode, where the replica accepts writes the remote would then refuse.
+TIME_OFF_EXCLUSIVE = os.getenv("TIME_OFF_EXCLUSIVE", "0") == "1"
+
 _POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logging.warning("Invalid int for %s: %s. Falling back to %s", name, raw, default)
+        return default
+
+
+def float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logging.warning("Invalid float for %s: %s. Falling back to %s", name, raw, default)
+        return default
+
+
+# Debug aid: log the checkout stack of any connection held longer than the threshold.
+DB_LEAK_DEBUG = os.getenv("DB_LEAK_DEBUG", "0") == "1"
+DB_LEAK_THRESHOLD_SECONDS = float_env("DB_LEAK_THRESHOLD_SECONDS", 10.0)
+
+_CHECKED_OUT: "weakref.WeakValueDictionary[int, PooledConnection]" = weakref.WeakValueDictionary()
+_CHECKED_OUT_LOCK = threading.Lock()
+# Connections whose wrapper was garbage-collected without close(). SimpleQueue.put is
+# safe to call from __del__, so the actual putconn happens later on a normal code path.
+_ABANDONED: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
 
 
 class PooledConnection:
     def __init__(self, pool, con):
         self._pool = pool
         self._con = con
+        self._returned = False
+        self._after_commit = []
+        # Settings snapshot pinned for the lifetime of this checkout (one request).
+        self.settings_snapshot = None
+        self.settings_dirty = False
+        self.checked_out_at = time.monotonic()
+        self.checkout_stack = None
+        self.leak_reported = False
+        if DB_LEAK_DEBUG:
+            self.checkout_stack = "".join(traceback.format_stack()[:-2])
+            with _CHECKED_OUT_LOCK:
+                _CHECKED_OUT[id(self)] = self
 
     def __getattr__(self, name):
         return getattr(self._con, name)
 
+    def commit(self):
+        self._con.commit()
+        self.settings_dirty = False
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def on_commit(self, callback) -> None:
+        """Run `callback` after the current transaction commits (dropped on rollback)."""
+        self._after_commit.append(callback)
+
     def close(self):
+        """Return the connection to the pool. Safe to call more than once."""
+        if self._returned:
+            return
+        self._returned = True
+        self._after_commit = []
+        self.settings_dirty = False
+        if DB_LEAK_DEBUG:
+            with _CHECKED_OUT_LOCK:
+                _CHECKED_OUT.pop(id(self), None)
+        _return_to_pool(self._pool, self._con)
+
+    def __del__(self):
+        if not self.__dict__.get("_returned", True):
+            self._returned = True
+            _ABANDONED.put((self._pool, self._con))
+
+
+def _return_to_pool(pool, con) -> None:
+    try:
+        con.rollback()
+    except Exception:
+        logging.warning("Rollback failed while returning pooled connection; discarding it", exc_info=True)
+        pool.putconn(con, close=True)
+        return
+    pool.putconn(con)
+
+
+def _reclaim_abandoned() -> None:
+    while True:
         try:
-            self._con.rollback()
-        except Exception:
-            pass
-        self._pool.putconn(self._con)
+            pool, con = _ABANDONED.get_nowait()
+        except queue.Empty:
+            return
+        logging.warning("Pooled connection was garbage-collected without close(); returning it to the pool")
+        _return_to_pool(pool, con)
+
 
+def _leak_watch_loop() -> None:
+    interval = max(0.5, DB_LEAK_THRESHOLD_SECONDS / 2)
+    while True:
+        time.sleep(interval)
+        _reclaim_abandoned()
+        now = time.monotonic()
+        with _CHECKED_OUT_LOCK:
+            held = list(_CHECKED_OUT.values())
+        for wrapper in held:
+            age = now - wrapper.checked_out_at
+            if age < DB_LEAK_THRESHOLD_SECONDS or wrapper.leak_reported:
+                continue
+            wrapper.leak_reported = True
+            logging.warning(
+                "Database connection held for %.1fs (threshold %.1fs) | pool=%s | checked out at:\n%s",
+                age,
+                DB_LEAK_THRESHOLD_SECONDS,
+                pool_stats(),
+                wrapper.checkout_stack,
+            )
 
-def _get_pool():
+
+_TIMED_PG_CURSOR = None
+_TIMED_SQLITE_CURSOR = timed_cursor(SQLiteCursor)
+
+
+def connect_postgres():
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+
+    global _TIMED_PG_CURSOR
+    if _TIMED_PG_CURSOR is None:
+        _TIMED_PG_CURSOR = timed_cursor(RealDictCursor)
+    con = psycopg2.connect(
+        DATABASE_URL,
+        cursor_factory=_TIMED_PG_CURSOR,
+        connect_timeout=int_env("DB_CONNECT_TIMEOUT", 10),
+    )
+    con.autocommit = False
+    return con
+
+
+def _connect_sqlite():
+    os.makedirs(os.path.dirname(os.path.abspath(SQLITE_PATH)), exist_ok=True)
+    return connect_sqlite(SQLITE_PATH, _TIMED_SQLITE_CURSOR)
+
+
+def _get_pool() -> ConnectionPool:
     global _POOL
     if _POOL is None:
-        from psycopg2.extras import RealDictCursor
-        from psycopg2.pool import SimpleConnectionPool
-
-        _POOL = SimpleConnectionPool(
-            minconn=1,
-            maxconn=5,
-            dsn=DATABASE_URL,
-            cursor_factory=RealDictCursor,
-        )
+        with _POOL_LOCK:
+            if _POOL is None:
+                common = dict(
+                    minconn=int_env("DB_POOL_MIN", 1),
+                    maxconn=int_env("DB_POOL_MAX", 5),
+                    timeout=float_env("DB_POOL_TIMEOUT", 10.0),
+                    max_waiters=int_env("DB_POOL_MAX_WAITERS", 64),
+                )
+                if SQL_DIALECT == "sqlite":
+                    # Local file: nothing to keep alive and nothing goes stale.
+                    pool = ConnectionPool(
+                        _connect_sqlite, keepalive_interval=0, max_lifetime=float("inf"), **common
+                    )
+                else:
+                    pool = ConnectionPool(
+                        connect_postgres,
+                        keepalive_interval=float_env("DB_POOL_KEEPALIVE_SECONDS", 30.0),
+                        max_lifetime=float_env("DB_POOL_MAX_LIFETIME_SECONDS", 1800.0),
+                        validate_after=float_env("DB_POOL_VALIDATE_AFTER_SECONDS", 60.0),
+                        **common,
+                    )
+                pool.start_keepalive()
+                if DB_LEAK_DEBUG:
+                    threading.Thread(target=_leak_watch_loop, name="db-leak-watch", daemon=True).start()
+                    logging.info("DB leak debug enabled | threshold=%.1fs", DB_LEAK_THRESHOLD_SECONDS)
+                _POOL = pool
     return _POOL
 
+def pool_stats() -> dict:
+    """Live pool figures (in_use, idle, waiters, wait times, stale discards, ...)."""
+    if _POOL is None:
+        return {}
+    return _POOL.stats()
+
 def get_con():
-    """Get PostgreSQL (Supabase) database connection"""
+    """Get a pooled database connection (Postgres or SQLite). Prefer get_db / db_session."""
     pool = _get_pool()
-    con = pool.getconn()
+    _reclaim_abandoned()
+    start = time.perf_counter()
     try:
-        con.autocommit = False
-        cur = con.cursor()
-        cur.execute("SELECT 1")
-        cur.fetchone()
-        cur.close()
-        return PooledConnection(pool, con)
-    except Exception:
-        logging.warning("Discarding stale PostgreSQL pooled connection", exc_info=True)
-        try:
-            pool.putconn(con, close=True)
-        except Exception:
-            logging.exception("Failed to close stale pooled connection cleanly")
-
-        fresh_con = pool.getconn()
-        fresh_con.autocommit = False
-        fresh_cur = fresh_con.cursor()
-        fresh_cur.execute("SELECT 1")
-        fresh_cur.fetchone()
-        fresh_cur.close()
-        return PooledConnection(pool, fresh_con)
+        con = pool.getconn()
+    except PoolTimeout as exc:
+        record_pool_wait(time.perf_counter() - start)
+        logging.warning("Database pool exhausted | %s | stats=%s", exc, pool.stats())
+        raise HTTPException(503, "Database is busy, please retry.")
+    record_pool_wait(time.perf_counter() - start)
+    return PooledConnection(pool, con)
 
-def init_db() -> None:
-    """Initialize Supabase PostgreSQL database"""
+@contextmanager
+def db_session():
+    """Borrow a pooled connection; it is returned on every exit path, exceptions included."""
     con = get_con()
-    cur = con.cursor()
-    
-    # Create work_day table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS work_day (
-        date TEXT PRIMARY KEY,
-        start_time TEXT,
-        end_time TEXT,
-        break_minutes INTEGER NOT NULL DEFAULT 0,
-        break_started_at TEXT,
-        notes TEXT
-    )
-    """)
-    
-    # Create settings table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS settings (
-        key TEXT PRIMARY KEY,
-        value TEXT NOT NULL
-    )
-    """)
-    
-    # Create recurring_holiday table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS recurring_holiday (
-        id SERIAL PRIMARY KEY,
-        date TEXT NOT NULL,
-        label TEXT,
-        UNIQUE(date)
-    )
-    """)
-    
-    # Create time_off table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS time_off (
-        id SERIAL PRIMARY KEY,
-        start_date TEXT NOT NULL,
-        end_date TEXT NOT NULL,
-        kind TEXT NOT NULL,
-        label TEXT
-    )
-    """)
-    
-    # Seed defaults if missing
-    for k, v in DEFAULT_SETTINGS.items():
-        cur.execute(
-            """INSERT INTO settings(key, value) VALUES(%s, %s) 
-               ON CONFLICT (key) DO NOTHING""",
-            (k, str(v)),
-        )
-    con.commit()
-    cur.close()
-    con.close()
+    try:
+        yield con
+    finally:
+        con.close()
+
+def get_db():
+    """FastAPI dependency: one pooled connection per request."""
+    with db_session() as con:
+        yield con
+
+def init_db() -> None:
+    """Create the schema on the configured backend and seed default settings"""
+    with db_session() as con:
+        create_schema(con, SQL_DIALECT)
+        if DB_TYPE == "postgres":
+            set_time_off_exclusion(con, TIME_OFF_EXCLUSIVE)
+        if DB_TYPE == "hybrid":
+            from backend.replica_sync import create_outbox_schema
+            create_outbox_schema(con)
+
+def create_schema(con, dialect: str) -> None:
+    """Bring the schema up to date (see backend/migrations.py)."""
+    run_migrations(con, dialect)
+
+# Process-wide settings cache, one snapshot per tenant. Every read in steady state
+# is served from memory; upsert_settings() and invalidate_settings_cache() drop it.
+# The TTL only matters when another process writes the same database (defaults to
+# 60s on Postgres). At most TENANT_CACHE_SIZE tenants are kept (oldest dropped).
+SETTINGS_CACHE_TTL_SECONDS = float_env(
+    "SETTINGS_CACHE_TTL_SECONDS", 60.0 if DB_TYPE == "postgres" else 0.0
+)
+TENANT_CACHE_SIZE = max(1, int_env("TENANT_CACHE_SIZE", 1024))
+
+_SETTINGS_CACHE: dict[str, "_SettingsSnapshot"] = {}
+_SETTINGS_VERSION = 0
+_SETTINGS_LOCK = threading.Lock()
+
+
+class _SettingsSnapshot:
+    __slots__ = ("user_id", "version", "loaded_at", "settings", "targets")
+
+    def __init__(self, user_id: str, version: int, settings: dict[str, str]):
+        self.user_id = user_id
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.settings = settings
+        try:
+            self.targets = targets_from_settings(settings)
+        except HTTPException:
+            self.targets = None  # re-raised on every get_targets() call
+
+
+def invalidate_settings_cache(user_id: Optional[str] = None) -> None:
+    """Drop one tenant's cached settings/targets, or every tenant's (e.g. after a replica pull)."""
+    global _SETTINGS_VERSION
+    with _SETTINGS_LOCK:
+        _SETTINGS_VERSION += 1
+        if user_id is None:
+            _SETTINGS_CACHE.clear()
+        else:
+            _SETTINGS_CACHE.pop(user_id, None)
+
+
+def publish_per_tenant(cache: dict, user_id: str, value) -> None:
+    """Store a tenant's entry, dropping the oldest once TENANT_CACHE_SIZE are held (caller locks)."""
+    cache.pop(user_id, None)
+    while len(cache) >= TENANT_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    cache[user_id] = value
+
+
+def cached_settings_snapshot():
+    """The current tenant's cached snapshot, or None when it is missing or expired."""
+    snap = _SETTINGS_CACHE.get(current_user_id())
+    if snap is not None and SETTINGS_CACHE_TTL_SECONDS > 0 and time.monotonic() - snap.loaded_at > SETTINGS_CACHE_TTL_SECONDS:
+        return None
+    return snap
+
+
+def build_settings_snapshot(version: int, rows, publish: bool = True) -> _SettingsSnapshot:
+    """Build the current tenant's snapshot from its settings rows read at `version`."""
+    snap = _SettingsSnapshot(current_user_id(), version, settings_from_rows(rows))
+    if publish:
+        with _SETTINGS_LOCK:
+            # Don't publish a read that raced with an invalidation.
+            if version == _SETTINGS_VERSION:
+                publish_per_tenant(_SETTINGS_CACHE, snap.user_id, snap)
+    return snap
+
+
+def settings_version() -> int:
+    return _SETTINGS_VERSION
+
+
+def _settings_snapshot(con) -> _SettingsSnapshot:
+    pinned = getattr(con, "settings_snapshot", None)
+    if pinned is not None:
+        return pinned
+
+    snap = cached_settings_snapshot()
+    if snap is not None:
+        cache_hit("settings")
+    else:
+        cache_miss("settings")
+        version = _SETTINGS_VERSION
+        cur = con.cursor()
+        cur.execute("SELECT key, value FROM settings WHERE user_id = %s", (current_user_id(),))
+        # Uncommitted writes on this connection must never reach the shared cache.
+        snap = build_settings_snapshot(version, cur.fetchall(), publish=not getattr(con, "settings_dirty", False))
+
+    if isinstance(con, PooledConnection):
+        con.settings_snapshot = snap
+    return snap
 
 def get_settings(con) -> dict[str, str]:
-    """Get settings from PostgreSQL (Supabase)"""
-    cur = con.cursor()
-    
-    cur.execute("SELECT key, value FROM settings")
-    rows = cur.fetchall()
+    """Get settings as stored strings (defaults filled in)"""
+    return dict(_settings_snapshot(con).settings)
+
+def settings_from_rows(rows) -> dict[str, str]:
     out = {r["key"]: r["value"] for r in rows}
-    
+
     # Ensure defaults exist even if DB got weird
     for k, v in DEFAULT_SETTINGS.items():
         out.setdefault(k, str(v))
     return out
 
 def upsert_settings(con, updates: dict[str, str]) -> None:
-    """Upsert settings to PostgreSQL (Supabase)"""
+    """Upsert the current tenant's settings (caller commits)"""
+    user_id = current_user_id()
     cur = con.cursor()
     
     for k, v in updates.items():
         cur.execute(
-            """INSERT INTO settings(key, value) VALUES(%s, %s)
-               ON CONFLICT(key) DO UPDATE SET value=EXCLUDED.value""",
-            (k, v),
+            """INSERT INTO settings(user_id, key, value) VALUES(%s, %s, %s)
+               ON CONFLICT(user_id, key) DO UPDATE SET value=EXCLUDED.value""",
+            (user_id, k, v),
         )
 
+    invalidate_settings_cache(user_id)
+    if isinstance(con, PooledConnection):
+        con.settings_snapshot = None
+        con.settings_dirty = True
+        # Readers between now and COMMIT may re-cache the old values; drop them again.
+        con.on_commit(lambda: invalidate_settings_cache(user_id))
+
 
 def get_targets(con) -> dict[str, int]:
-    s = get_settings(con)
+    snap = _settings_snapshot(con)
+    if snap.targets is None:
+        return targets_from_settings(snap.settings)
+    return dict(snap.targets)
+
+
+def targets_from_settings(s: dict[str, str]) -> dict[str, int]:
     try:
         daily_soft = int(s["daily_soft_minutes"])
         daily_hard = int(s["daily_hard_minutes"])
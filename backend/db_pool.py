@@ -0,0 +1,329 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection became available within the pool timeout."""
+
+
+class _Slot:
+    __slots__ = ("con", "created_at", "last_used")
+
+    def __init__(self, con):
+        now = time.monotonic()
+        self.con = con
+        self.created_at = now
+        self.last_used = now
+
+
+class _Waiter:
+    __slots__ = ("event", "slot", "may_open")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.slot = None
+        self.may_open = False
+
+
+class ConnectionPool:
+    """
+    Thread-safe connection pool with a bounded FIFO wait queue.
+
+    - getconn() blocks up to `timeout` seconds when every connection is busy
+      instead of failing immediately; at most `max_waiters` callers may queue.
+      Returned connections are handed straight to the oldest waiter, so
+      newcomers cannot starve threads that are already queued.
+    - Liveness is checked by a background keepalive thread (ping idle
+      connections, recycle old ones) instead of a SELECT 1 on every checkout.
+      A checkout only pings when the connection sat idle longer than
+      `validate_after` seconds (e.g. the laptop was asleep).
+    - stats() exposes live occupancy and wait figures.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], object],
+        *,
+        minconn: int = 1,
+        maxconn: int = 5,
+        timeout: float = 10.0,
+        max_waiters: int = 64,
+        keepalive_interval: float = 30.0,
+        max_lifetime: float = 1800.0,
+        validate_after: float = 60.0,
+        ping: Callable[[object], None] | None = None,
+        is_broken: Callable[[object], bool] | None = None,
+    ):
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError("invalid pool size: need 0 <= minconn <= maxconn and maxconn >= 1")
+
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_waiters = max_waiters
+        self.keepalive_interval = keepalive_interval
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+        self._ping = ping or _default_ping
+        self._is_broken = is_broken or _default_is_broken
+
+        self._lock = threading.Lock()
+        self._idle: deque[_Slot] = deque()
+        self._in_use: dict[int, _Slot] = {}
+        self._queue: deque[_Waiter] = deque()
+        self._opening = 0
+        self._closed = False
+        self._keepalive_thread = None
+
+        self._checkouts = 0
+        self._waited_checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._stale_discards = 0
+        self._recycled = 0
+
+        for _ in range(minconn):
+            self._idle.append(_Slot(self._connect()))
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def getconn(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        while True:
+            slot = None
+            waiter = None
+            with self._lock:
+                if self._closed:
+                    raise PoolTimeout("connection pool is closed")
+                if self._idle and not self._queue:
+                    slot = self._idle.pop()  # LIFO keeps hot connections hot
+                    self._in_use[id(slot.con)] = slot
+                elif self.size < self.maxconn and not self._queue:
+                    self._opening += 1
+                elif len(self._queue) >= self.max_waiters:
+                    self._timeouts += 1
+                    raise PoolTimeout(f"connection pool wait queue is full ({self.max_waiters} waiters)")
+                else:
+                    waiter = _Waiter()
+                    self._queue.append(waiter)
+
+            if waiter is not None:
+                waited = True
+                waiter.event.wait(max(0.0, deadline - time.monotonic()))
+                with self._lock:
+                    if not waiter.event.is_set():
+                        self._queue.remove(waiter)
+                        self._timeouts += 1
+                        raise PoolTimeout(f"no database connection available within {self.timeout:.1f}s")
+                if waiter.slot is not None:
+                    slot = waiter.slot
+                elif not waiter.may_open:
+                    raise PoolTimeout("connection pool is closed")
+
+            if slot is None:
+                slot = self._open_slot()
+            elif not self._validate(slot):
+                continue
+
+            self._record_checkout(time.monotonic() - start, waited)
+            return slot.con
+
+    def putconn(self, con, close: bool = False) -> None:
+        with self._lock:
+            slot = self._in_use.pop(id(con), None)
+            if slot is None:
+                logging.warning("Returning a connection that is not checked out from this pool")
+                return
+
+            if not (close or self._closed or self._is_broken(con)):
+                slot.last_used = time.monotonic()
+                self._hand_back_locked(slot)
+                return
+
+            if not close:
+                self._stale_discards += 1
+            self._release_capacity_locked()
+        _close_quietly(con)
+
+    def stats(self) -> dict:
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size,
+                "min": self.minconn,
+                "max": self.maxconn,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiters": len(self._queue),
+                "checkouts": checkouts,
+                "waited_checkouts": self._waited_checkouts,
+                "wait_ms_total": round(self._wait_total * 1000, 3),
+                "wait_ms_avg": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+                "timeouts": self._timeouts,
+                "stale_discards": self._stale_discards,
+                "recycled": self._recycled,
+            }
+
+    def start_keepalive(self) -> None:
+        if self.keepalive_interval <= 0 or self._keepalive_thread is not None:
+            return
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive_loop, name="db-pool-keepalive", daemon=True
+        )
+        self._keepalive_thread.start()
+
+    def closeall(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = [slot.con for slot in self._idle]
+            self._idle.clear()
+            while self._queue:
+                self._queue.popleft().event.set()
+        for con in idle:
+            _close_quietly(con)
+
+    def _hand_back_locked(self, slot: _Slot) -> None:
+        if self._queue:
+            waiter = self._queue.popleft()
+            self._in_use[id(slot.con)] = slot
+            waiter.slot = slot
+            waiter.event.set()
+        else:
+            self._idle.append(slot)
+
+    def _release_capacity_locked(self) -> None:
+        """A connection was closed; let the oldest waiter open a replacement."""
+        if self._queue and self.size < self.maxconn:
+            waiter = self._queue.popleft()
+            self._opening += 1
+            waiter.may_open = True
+            waiter.event.set()
+
+    def _open_slot(self) -> _Slot:
+        try:
+            slot = _Slot(self._connect())
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._release_capacity_locked()
+            raise
+        with self._lock:
+            self._opening -= 1
+            self._in_use[id(slot.con)] = slot
+        return slot
+
+    def _validate(self, slot: _Slot) -> bool:
+        """Cheap checks on checkout; only pings connections that idled for too long."""
+        now = time.monotonic()
+        stale = self._is_broken(slot.con) or (now - slot.created_at) > self.max_lifetime
+        if not stale and (now - slot.last_used) > self.validate_after:
+            try:
+                self._ping(slot.con)
+            except Exception:
+                logging.warning("Discarding stale pooled connection", exc_info=True)
+                stale = True
+        if not stale:
+            return True
+
+        self._retire(slot, recycled=False)
+        return False
+
+    def _record_checkout(self, wait: float, waited: bool) -> None:
+        with self._lock:
+            self._checkouts += 1
+            if waited:
+                self._waited_checkouts += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+    def _keepalive_loop(self) -> None:
+        while not self._closed:
+            time.sleep(self.keepalive_interval)
+            try:
+                self._keepalive_once()
+            except Exception:
+                logging.exception("Connection pool keepalive failed")
+
+    def _keepalive_once(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            # Take idle connections out of circulation while they are checked.
+            due = [s for s in self._idle if now - s.last_used >= self.keepalive_interval]
+            for slot in due:
+                self._idle.remove(slot)
+                self._in_use[id(slot.con)] = slot
+
+        for slot in due:
+            if now - slot.created_at > self.max_lifetime:
+                self._retire(slot, recycled=True)
+                continue
+            try:
+                self._ping(slot.con)
+            except Exception:
+                logging.warning("Keepalive discarded a stale pooled connection", exc_info=True)
+                self._retire(slot, recycled=False)
+                continue
+            with self._lock:
+                self._in_use.pop(id(slot.con), None)
+                slot.last_used = time.monotonic()
+                self._hand_back_locked(slot)
+
+        # Top back up to minconn so the first request after a recycle is not cold.
+        while True:
+            with self._lock:
+                if self._closed or self.size >= self.minconn:
+                    return
+                self._opening += 1
+            try:
+                slot = _Slot(self._connect())
+            except Exception:
+                with self._lock:
+                    self._opening -= 1
+                    self._release_capacity_locked()
+                logging.warning("Keepalive could not open a replacement connection", exc_info=True)
+                return
+            with self._lock:
+                self._opening -= 1
+                self._hand_back_locked(slot)
+
+    def _retire(self, slot: _Slot, recycled: bool) -> None:
+        with self._lock:
+            self._in_use.pop(id(slot.con), None)
+            if recycled:
+                self._recycled += 1
+            else:
+                self._stale_discards += 1
+            self._release_capacity_locked()
+        _close_quietly(slot.con)
+
+
+def _default_ping(con) -> None:
+    cur = con.cursor()
+    try:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    finally:
+        cur.close()
+    con.rollback()
+
+
+def _default_is_broken(con) -> bool:
+    return bool(getattr(con, "closed", False))
+
+
+def _close_quietly(con) -> None:
+    try:
+        con.close()
+    except Exception:
+        pass
@@ -0,0 +1,123 @@
+import logging
+
+# work_day.gross_minutes / net_minutes hold the figures of a *completed* day
+# (start and end set, end not before start). They are written by triggers on
+# every insert/update, so no code path can forget them, and stay NULL for
+# running days and for times the triggers don't recognise; readers then fall
+# back to computing from start_time/end_time. Daily status is not stored: it
+# depends on the current settings and is a comparison against net_minutes.
+#
+# Rebuild for existing data:  python -m backend.derived_columns
+
+DERIVED_COLUMNS = ("gross_minutes", "net_minutes")
+
+
+def _minutes_sql(col: str, dialect: str) -> str:
+    """Minutes since midnight: from a TIME on Postgres, from a strict HH:MM value on SQLite, else NULL."""
+    if dialect == "postgres":
+        return f"((EXTRACT(HOUR FROM {col}) * 60 + EXTRACT(MINUTE FROM {col}))::int)"
+    strict = f"{col} GLOB '[0-2][0-9]:[0-5][0-9]'"
+    hours = f"CAST(substr({col}, 1, 2) AS INTEGER)"
+    minutes = f"CAST(substr({col}, 4, 2) AS INTEGER)"
+    return f"(CASE WHEN {strict} AND substr({col}, 1, 2) < '24' THEN {hours} * 60 + {minutes} END)"
+
+
+def gross_minutes_sql(ref: str, dialect: str) -> str:
+    start = _minutes_sql(f"{ref}start_time", dialect)
+    end = _minutes_sql(f"{ref}end_time", dialect)
+    return f"(CASE WHEN {start} IS NOT NULL AND {end} >= {start} THEN {end} - {start} END)"
+
+
+def net_minutes_sql(gross: str, ref: str, dialect: str) -> str:
+    return f"(CASE WHEN {gross} IS NOT NULL THEN {_greatest(dialect)}(0, {gross} - COALESCE({ref}break_minutes, 0)) END)"
+
+
+def _greatest(dialect: str) -> str:
+    return "GREATEST" if dialect == "postgres" else "MAX"
+
+
+def create_derived_columns(con, dialect: str) -> bool:
+    """Add the columns and their triggers (idempotent). True when the columns were just added."""
+    cur = con.cursor()
+    added = False
+    if dialect == "postgres":
+        cur.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = 'work_day' AND column_name = ANY(%s)",
+            (list(DERIVED_COLUMNS),),
+        )
+        existing = {r["column_name"] for r in cur.fetchall()}
+    else:
+        cur.execute("PRAGMA table_info(work_day)")
+        existing = {r["name"] for r in cur.fetchall()}
+    for col in DERIVED_COLUMNS:
+        if col not in existing:
+            cur.execute(f"ALTER TABLE work_day ADD COLUMN {col} INTEGER")
+            added = True
+
+    if dialect == "postgres":
+        gross = gross_minutes_sql("NEW.", dialect)
+        cur.execute(f"""
+        CREATE OR REPLACE FUNCTION work_day_derive() RETURNS trigger AS $$
+        BEGIN
+            NEW.gross_minutes := {gross};
+            NEW.net_minutes := {net_minutes_sql("NEW.gross_minutes", "NEW.", dialect)};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+        cur.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'work_day_derive') THEN
+                CREATE TRIGGER work_day_derive BEFORE INSERT OR UPDATE ON work_day
+                FOR EACH ROW EXECUTE FUNCTION work_day_derive();
+            END IF;
+        END
+        $$
+        """)
+    else:
+        # SQLite triggers cannot assign NEW, so they patch the row right after the write.
+        gross = gross_minutes_sql("NEW.", dialect)
+        set_clause = f"gross_minutes = {gross}, net_minutes = {net_minutes_sql(gross, 'NEW.', dialect)}"
+        row = "user_id = NEW.user_id AND date = NEW.date" if "user_id" in existing else "date = NEW.date"
+        for name, event in (
+            ("work_day_derive_insert", "INSERT"),
+            ("work_day_derive_update", "UPDATE OF start_time, end_time, break_minutes"),
+        ):
+            cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON work_day
+            BEGIN
+                UPDATE work_day SET {set_clause} WHERE {row};
+            END
+            """)
+    return added
+
+
+def rebuild_derived_columns(con, dialect: str) -> int:
+    """Recompute gross/net for every row whose stored values are out of date (caller commits)."""
+    gross = gross_minutes_sql("", dialect)
+    net = net_minutes_sql(gross, "", dialect)
+    differs = "IS DISTINCT FROM" if dialect == "postgres" else "IS NOT"
+    cur = con.cursor()
+    cur.execute(
+        f"UPDATE work_day SET gross_minutes = {gross}, net_minutes = {net} "
+        f"WHERE gross_minutes {differs} {gross} OR net_minutes {differs} {net}"
+    )
+    return cur.rowcount
+
+
+def main() -> None:
+    from backend.db import SQL_DIALECT, db_session
+    from backend.logging_config import setup_logging
+    from backend.migrations import run_migrations
+
+    setup_logging()
+    with db_session() as con:
+        run_migrations(con, SQL_DIALECT)
+        updated = rebuild_derived_columns(con, SQL_DIALECT)
+        con.commit()
+    logging.info("Rebuilt derived work_day columns | updated_rows=%s", updated)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,158 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
 import os
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
 import sys
 
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are generated
+    brotli = None
+
 ENV = "dev" if "--reload" in sys.argv else "prod"
+# SERVE_FRONTEND=0: API only (benchmarks, or a checkout without a frontend build)
+SERVE_FRONTEND = os.getenv("SERVE_FRONTEND", "1") == "1"
+
+# Vite puts content-hashed files under assets/: a URL there never changes content.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# Everything else (index.html, build-info.json, ...) is revalidated via its ETag.
+REVALIDATE_CACHE = "no-cache"
+
+_COMPRESSIBLE = {".js", ".mjs", ".css", ".html", ".svg", ".json", ".txt", ".map", ".xml", ".ico", ".webmanifest"}
+_MIN_COMPRESS_BYTES = 1024
+# Windows' registry can map .js to text/plain; browsers refuse such module scripts.
+_CONTENT_TYPES = {".js": "text/javascript", ".mjs": "text/javascript", ".css": "text/css", ".svg": "image/svg+xml"}
+
+
+# Each encoded variant is a different representation and needs its own strong ETag.
+_ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+
+class _Asset:
+    __slots__ = ("body", "digest", "etag", "content_type", "cache_control", "variants")
+
+    def __init__(self, body: bytes, content_type: str, cache_control: str):
+        self.body = body
+        self.digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.etag = '"' + self.digest + '"'
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.variants: dict[str, bytes] = {}  # content-coding -> body
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        """The ETag of the identity body (coding None) or of one encoded variant."""
+        if coding is None:
+            return self.etag
+        return '"' + self.digest + _ETAG_SUFFIXES[coding] + '"'
+
+
+def _content_type(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    content_type = _CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or ext in (".json", ".webmanifest"):
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def _read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _variants(path: str, body: bytes) -> dict[str, bytes]:
+    """br/gzip bodies: prebuilt `<file>.br` / `<file>.gz` when the build made them, else compressed now."""
+    if os.path.splitext(path)[1].lower() not in _COMPRESSIBLE or len(body) < _MIN_COMPRESS_BYTES:
+        return {}
+    out = {}
+    br = _read(path + ".br")
+    if br is None and brotli is not None:
+        br = brotli.compress(body, quality=11)
+    if br is not None and len(br) < len(body):
+        out["br"] = br
+    gz = _read(path + ".gz")
+    if gz is None:
+        gz = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(gz) < len(body):
+        out["gzip"] = gz
+    return out
+
+
+def build_asset_index(dist_dir: str) -> dict[str, _Asset]:
+    """Every file of the build, keyed by URL path relative to dist (held in memory)."""
+    index: dict[str, _Asset] = {}
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith((".br", ".gz")) and os.path.isfile(path[:-3]):
+                continue  # a variant of a file we index anyway
+            rel = os.path.relpath(path, dist_dir).replace(os.sep, "/")
+            body = _read(path)
+            if body is None:
+                continue
+            cache = IMMUTABLE_CACHE if rel.startswith("assets/") else REVALIDATE_CACHE
+            asset = _Asset(body, _content_type(path), cache)
+            asset.variants = _variants(path, body)
+            index[rel] = asset
+    return index
+
+
+def _accepted_codings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _chosen_coding(request: Request, asset: _Asset) -> Optional[str]:
+    accepted = _accepted_codings(request.headers.get("accept-encoding", ""))
+    for coding in ("br", "gzip"):
+        if coding in asset.variants and coding in accepted:
+            return coding
+    return None
+
+
+def asset_response(request: Request, asset: _Asset) -> Response:
+    # Pick the variant first: If-None-Match is matched against the tag of what we would send.
+    coding = _chosen_coding(request, asset) if asset.variants else None
+    etag = asset.etag_for(coding)
+    headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+    if asset.variants:
+        headers["Vary"] = "Accept-Encoding"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (etag in if_none_match or if_none_match.strip() == "*"):
+        return Response(status_code=304, headers=headers)
+
+    body = asset.body
+    if coding is not None:
+        body = asset.variants[coding]
+        headers["Content-Encoding"] = coding
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(len(body))
+        return Response(status_code=200, headers=headers, media_type=asset.content_type)
+    return Response(body, headers=headers, media_type=asset.content_type)
+
 
 def mount_react_spa(app: FastAPI) -> None:
     """
     Serve the Vite build output at:
         - /            -> index.html
-        - /assets/*    -> static assets
+        - /assets/*    -> static assets (immutable, hashed names)
         - /<anything>    -> SPA fallback to index.html (unless it's a real file)
     Assumes build output is at: /frontend/dist
+    The build is indexed and compressed once here; requests never touch the disk.
     """
-    if ENV != "prod":
+    if ENV != "prod" or not SERVE_FRONTEND:
         return
 
     if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
@@ -32,19 +170,28 @@ def mount_react_spa(app: FastAPI) -> None:
         raise RuntimeError(f"Frontend assets folder not found: {assets_dir}. Run `npm run build` in /frontend.")
     if not os.path.isfile(index_path):
         raise RuntimeError(f"Frontend index file not found: {index_path}. The packaged frontend build is incomplete.")
-    
-    # Mount static assets first
-    app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+
+    files = build_asset_index(dist_dir)
+    index_html = files["index.html"]
+    logging.info(
+        "Frontend indexed | files=%s | bytes=%s | brotli=%s",
+        len(files),
+        sum(len(a.body) for a in files.values()),
+        brotli is not None,
+    )
 
     # Serve index at root
-    @app.get("/", include_in_schema=False)
-    def serve_index():
-        return FileResponse(index_path)
-    
+    @app.api_route("/", methods=["GET", "HEAD"], include_in_schema=False)
+    def serve_index(request: Request):
+        return asset_response(request, index_html)
+
     # Serve any real file if it exists, otherwise fallback to SPA index
-    @app.get("/{path:path}", include_in_schema=False)
-    def serve_spa(path: str):
-        full_path = os.path.join(dist_dir, path)
-        if os.path.isfile(full_path):
-            return FileResponse(full_path)
-        return FileResponse(index_path)
+    @app.api_route("/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    def serve_spa(path: str, request: Request):
+        asset = files.get(path)
+        if asset is not None:
+            return asset_response(request, asset)
+        if path.startswith("assets/"):
+            # A stale hashed name: HTML here would be parsed as a script or stylesheet.
+            return Response(status_code=404)
+        return asset_response(request, index_html)
@@ -7,7 +7,7 @@ from logging.handlers import RotatingFileHandler
 LOG_TO_FILE = os.getenv("LOG_TO_FILE", "0") == "1"
 
 
-def _get_runtime_dir() -> str:
+def get_runtime_dir() -> str:
     if getattr(sys, "frozen", False):
         if sys.platform == "darwin":
             return os.path.expanduser("~/Library/Application Support/TimeTracker")
@@ -18,7 +18,7 @@ def _get_runtime_dir() -> str:
 
 
 def get_log_file_path() -> str:
-    runtime_dir = _get_runtime_dir()
+    runtime_dir = get_runtime_dir()
     os.makedirs(runtime_dir, exist_ok=True)
     return os.path.join(runtime_dir, "timetracker.log")
 
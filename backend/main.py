@@ -1,34 +1,79 @@
-
+from backend.startup import DB_INIT_MODE, add_readiness_gate, mark_phase, mark_ready, start_background_init
+from contextlib import asynccontextmanager
 from backend.frontend_hosting import mount_react_spa
 from fastapi import FastAPI
 from backend.db import init_db
+from backend.async_db import DB_ASYNC, open_async_pool, close_async_pool
+from backend.replica_sync import start_sync_worker, stop_sync_worker
 from backend.logging_config import setup_logging
 from backend.middleware import add_request_logging
 from backend.sentry_config import init_sentry
-from backend.routers.day_router import router as day_router
-from backend.routers.week_router import router as week_router
-from backend.routers.settings_router import router as settings_router
-from backend.routers.recurring_holiday_router import router as recurring_holiday_router
-from backend.routers.timeoff_router import router as timeoff_router
-from backend.routers.calendar_router import router as calendar_router
-from backend.routers.dashboard_router import router as dashboard_router
-from backend.routers.debug_router import router as debug_router
+from backend.services.stream_service import close_streams, watch_exit_signals
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_ASYNC:
+        await open_async_pool()
+    if DB_INIT_MODE == "background":
+        start_background_init(init_db, start_sync_worker)
+    else:
+        start_sync_worker()
+        mark_ready()
+    watch_exit_signals()
+    yield
+    close_streams()
+    stop_sync_worker()
+    if DB_ASYNC:
+        await close_async_pool()
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Time Tracker API")
+    app = FastAPI(title="Time Tracker API", lifespan=lifespan)
     add_request_logging(app)
+    if DB_INIT_MODE == "background":
+        add_readiness_gate(app)
+    # Only the variant in use is imported.
+    if DB_ASYNC:
+        from backend.routers.async_day_router import router as day_router
+        from backend.routers.async_week_router import router as week_router
+        from backend.routers.async_dashboard_router import router as dashboard_router
+        from backend.routers.async_calendar_router import router as calendar_router
+    else:
+        from backend.routers.day_router import router as day_router
+        from backend.routers.week_router import router as week_router
+        from backend.routers.dashboard_router import router as dashboard_router
+        from backend.routers.calendar_router import router as calendar_router
+    from backend.routers.settings_router import router as settings_router
+    from backend.routers.recurring_holiday_router import router as recurring_holiday_router
+    from backend.routers.timeoff_router import router as timeoff_router
+    from backend.routers.report_router import router as report_router
+    from backend.routers.export_router import router as export_router
+    from backend.routers.import_router import router as import_router
+    from backend.routers.stream_router import router as stream_router
+    from backend.routers.debug_router import router as debug_router
+    from backend.routers.metrics_router import router as metrics_router
+
     app.include_router(day_router)
     app.include_router(week_router)
-    app.include_router(settings_router)
     app.include_router(dashboard_router)
+    app.include_router(calendar_router)
+    app.include_router(settings_router)
     app.include_router(recurring_holiday_router)
     app.include_router(timeoff_router)
-    app.include_router(calendar_router)
+    app.include_router(report_router)
+    app.include_router(export_router)
+    app.include_router(import_router)
+    app.include_router(stream_router)
     app.include_router(debug_router)
+    app.include_router(metrics_router)
     mount_react_spa(app)
     return app
 
 setup_logging()
+mark_phase("imports")
 init_sentry()
-init_db()
+mark_phase("sentry")
+if DB_INIT_MODE != "background":
+    init_db()
+    mark_phase("db_init")
 app = create_app()
+mark_phase("app")
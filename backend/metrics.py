@@ -0,0 +1,186 @@
+import threading
+from bisect import bisect_left
+
+# In-process metrics, rendered at /metrics in the Prometheus text format (no
+# client library, nothing to run next to the app). Request metrics are updated
+# by the request middleware, which runs on the event loop thread, so they are
+# plain dict/list updates with no lock. Cache counters are bumped from worker
+# threads and take a lock. Pool figures are read from the pools at scrape time.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"  # 404s, requests rejected before routing: keeps label cardinality bounded
+
+
+class _RouteStats:
+    __slots__ = ("buckets", "sum", "statuses", "db_queries", "db_seconds")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # per bucket, last one is +Inf
+        self.sum = 0.0
+        self.statuses: dict[int, int] = {}
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+_ROUTES: dict[tuple[str, str], _RouteStats] = {}
+_IN_FLIGHT = 0
+
+_CACHES: dict[str, list[int]] = {}  # name -> [hits, misses]
+_CACHE_LOCK = threading.Lock()
+
+
+def route_template(request) -> str:
+    """The matched route's path template (e.g. /api/day/{day_str}), never the raw path."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def request_started() -> None:
+    global _IN_FLIGHT
+    _IN_FLIGHT += 1
+
+
+def request_finished(method: str, route: str, status: int, seconds: float, db_stats=None) -> None:
+    global _IN_FLIGHT
+    _IN_FLIGHT -= 1
+    key = (method, route)
+    stats = _ROUTES.get(key)
+    if stats is None:
+        stats = _ROUTES[key] = _RouteStats()
+    stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    stats.sum += seconds
+    stats.statuses[status] = stats.statuses.get(status, 0) + 1
+    if db_stats is not None:
+        stats.db_queries += db_stats.queries
+        stats.db_seconds += db_stats.db_seconds
+
+
+def cache_hit(name: str) -> None:
+    with _CACHE_LOCK:
+        counts = _CACHES.get(name) or _CACHES.setdefault(name, [0, 0])
+        counts[0] += 1
+
+
+def cache_miss(name: str) -> None:
+    with _CACHE_LOCK:
+        counts = _CACHES.get(name) or _CACHES.setdefault(name, [0, 0])
+        counts[1] += 1
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _num(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+def _family(out: list, name: str, kind: str, help_text: str) -> None:
+    out.append(f"# HELP {name} {help_text}")
+    out.append(f"# TYPE {name} {kind}")
+
+
+def _request_metrics(out: list) -> None:
+    routes = sorted(_ROUTES.items())
+
+    name = "timetracker_http_request_duration_seconds"
+    _family(out, name, "histogram", "Time until the response starts, per route template.")
+    for (method, route), stats in routes:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+            cumulative += count
+            le = bound if isinstance(bound, str) else repr(bound)
+            out.append(f"{name}_bucket{_labels(method=method, route=route, le=le)} {cumulative}")
+        out.append(f"{name}_sum{_labels(method=method, route=route)} {_num(stats.sum)}")
+        out.append(f"{name}_count{_labels(method=method, route=route)} {cumulative}")
+
+    name = "timetracker_http_requests_total"
+    _family(out, name, "counter", "Requests by route template and status code.")
+    for (method, route), stats in routes:
+        for status, count in sorted(stats.statuses.items()):
+            out.append(f"{name}{_labels(method=method, route=route, status=status)} {count}")
+
+    name = "timetracker_http_requests_in_flight"
+    _family(out, name, "gauge", "Requests currently being handled.")
+    out.append(f"{name} {_IN_FLIGHT}")
+
+    name = "timetracker_http_db_queries_total"
+    _family(out, name, "counter", "SQL statements run while handling requests, per route template.")
+    for (method, route), stats in routes:
+        out.append(f"{name}{_labels(method=method, route=route)} {stats.db_queries}")
+
+    name = "timetracker_http_db_seconds_total"
+    _family(out, name, "counter", "Time spent in SQL statements while handling requests, per route template.")
+    for (method, route), stats in routes:
+        out.append(f"{name}{_labels(method=method, route=route)} {_num(stats.db_seconds)}")
+
+
+# (pool_stats() key, metric suffix, type, help, scale)
+_POOL_FIELDS = (
+    ("size", "size", "gauge", "Open connections.", 1),
+    ("max", "max_size", "gauge", "Configured maximum connections.", 1),
+    ("in_use", "in_use", "gauge", "Connections checked out.", 1),
+    ("idle", "idle", "gauge", "Idle connections.", 1),
+    ("waiters", "waiters", "gauge", "Callers queued for a connection.", 1),
+    ("checkouts", "checkouts_total", "counter", "Connection checkouts.", 1),
+    ("waited_checkouts", "waited_checkouts_total", "counter", "Checkouts that had to queue.", 1),
+    ("wait_ms_total", "wait_seconds_total", "counter", "Time spent waiting for a connection.", 0.001),
+    ("wait_ms_max", "wait_seconds_max", "gauge", "Longest wait for a connection.", 0.001),
+    ("timeouts", "timeouts_total", "counter", "Checkouts that gave up (HTTP 503).", 1),
+    ("stale_discards", "stale_discards_total", "counter", "Broken connections discarded.", 1),
+    ("recycled", "recycled_total", "counter", "Connections closed for age.", 1),
+)
+
+# psycopg_pool get_stats() keys that are current values; every other key only grows.
+_ASYNC_POOL_GAUGES = {"pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting"}
+
+
+def _pool_metrics(out: list) -> None:
+    from backend.async_db import async_pool_stats
+    from backend.db import pool_stats
+
+    stats = pool_stats()
+    if stats:
+        for key, suffix, kind, help_text, scale in _POOL_FIELDS:
+            name = f"timetracker_db_pool_{suffix}"
+            _family(out, name, kind, help_text)
+            value = stats.get(key, 0)
+            out.append(f"{name} {_num(value * scale)}")
+
+    # psycopg_pool's own figures: a few gauges, the rest cumulative counters
+    # (requests_num, requests_wait_ms, connections_lost, ...); *_ms become seconds.
+    for key, value in sorted(async_pool_stats().items()):
+        if not isinstance(value, (int, float)):
+            continue
+        if key in _ASYNC_POOL_GAUGES:
+            name, kind = f"timetracker_db_async_pool_{key}", "gauge"
+        elif key.endswith("_ms"):
+            name, kind, value = f"timetracker_db_async_pool_{key[:-3]}_seconds_total", "counter", value * 0.001
+        else:
+            name, kind = f"timetracker_db_async_pool_{key}_total", "counter"
+        _family(out, name, kind, f"psycopg_pool statistic {key}.")
+        out.append(f"{name} {_num(value)}")
+
+
+def _cache_metrics(out: list) -> None:
+    with _CACHE_LOCK:
+        caches = sorted((name, list(counts)) for name, counts in _CACHES.items())
+    for index, (metric, help_text) in enumerate(
+        (("timetracker_cache_hits_total", "Cache lookups served from memory."),
+         ("timetracker_cache_misses_total", "Cache lookups that went to the database."))
+    ):
+        _family(out, metric, "counter", help_text)
+        for name, counts in caches:
+            out.append(f"{metric}{_labels(cache=name)} {counts[index]}")
+
+
+def render_metrics() -> str:
+    out: list[str] = []
+    _request_metrics(out)
+    _pool_metrics(out)
+    _cache_metrics(out)
+    return "\n".join(out) + "\n"
@@ -2,18 +2,36 @@ import logging
 import time
 import os
 import uuid
-import sentry_sdk
-from fastapi import Request
+from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
+from backend.db import DB_TYPE
+from backend.metrics import request_finished, request_started, route_template
+from backend.query_timing import begin_request, end_request, log_fields, server_timing
+from backend.replica_sync import SYNC_USER_ID
+from backend.sentry_config import capture_request_exception
+from backend.tenant import begin_tenant, end_tenant, user_id_from_request
+from backend.services.stream_service import notify_change
 
 LOG_BODY = os.getenv("LOG_BODY", "0") == "1"
 
+
+def _request_user_id(request: Request) -> str:
+    if DB_TYPE == "hybrid":
+        return SYNC_USER_ID  # a replica holds one user's data
+    return user_id_from_request(request)
+
 def add_request_logging(app):
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
         start = time.time()
         request_id = uuid.uuid4().hex[:12]
         request.state.request_id = request_id
+        try:
+            user_id = _request_user_id(request)
+        except HTTPException as exc:
+            return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers={"X-Request-ID": request_id})
+        tenant_token = begin_tenant(user_id)
+        db_stats, db_token = begin_request(request_id)
 
         body_bytes = b""
         if LOG_BODY:
@@ -23,45 +41,46 @@ def add_request_logging(app):
                 return { "type": "http.request", "body": body_bytes, "more_body": False }
             request._receive = receive
 
+        request_started()
         try:
             response = await call_next(request)
         except Exception:
             ms = (time.time() - start) * 1000
-            with sentry_sdk.push_scope() as scope:
-                scope.set_tag("request_id", request_id)
-                scope.set_context(
-                    "request",
-                    {
-                        "method": request.method,
-                        "path": request.url.path,
-                        "query": request.url.query,
-                    },
-                )
-                sentry_sdk.capture_exception()
+            request_finished(request.method, route_template(request), 500, ms / 1000, db_stats)
+            capture_request_exception(request_id, request)
             logging.exception(
-                "Unhandled exception | request_id=%s | %s %s | query=%s | %.1fms | body=%s",
+                "Unhandled exception | request_id=%s | %s %s | query=%s | %.1fms%s | body=%s",
                 request_id,
                 request.method,
                 request.url.path,
                 request.url.query,
                 ms,
+                log_fields(db_stats),
                 body_bytes.decode("utf-8", errors="ignore") if LOG_BODY else "",
             )
             return JSONResponse(
                 status_code=500,
                 content={"detail": "Internal server error", "request_id": request_id},
-                headers={"X-Request-ID": request_id},
+                headers={"X-Request-ID": request_id, "Server-Timing": server_timing(db_stats, ms)},
             )
+        finally:
+            end_request(db_token)
+            end_tenant(tenant_token)
 
         ms = (time.time() - start) * 1000
+        request_finished(request.method, route_template(request), response.status_code, ms / 1000, db_stats)
         logging.info(
-            "%s %s | %s | %.1fms | request_id=%s%s",
+            "%s %s | %s | %.1fms | request_id=%s%s%s",
             request.method,
             request.url.path,
             response.status_code,
             ms,
             request_id,
+            log_fields(db_stats),
             f" | body={body_bytes.decode('utf-8', errors='ignore')}" if LOG_BODY else "",
         )
         response.headers["X-Request-ID"] = request_id
+        response.headers["Server-Timing"] = server_timing(db_stats, ms)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            notify_change()  # push the new state to /api/stream subscribers
         return response
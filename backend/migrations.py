@@ -0,0 +1,554 @@
+import logging
+import secrets
+
+from backend.derived_columns import create_derived_columns, rebuild_derived_columns
+
+# Versioned schema migrations. Each step runs once per database, in its own
+# transaction, and is recorded in schema_migrations; a database that is up to
+# date costs a single query at startup and no DDL. Steps must be safe on
+# databases created before this table existed (they used the same DDL).
+#
+# Apply by hand:  python -m backend.migrations
+# Partition work_day by tenant (Postgres, optional):
+#                 python -m backend.migrations --partition-work-day 16
+
+
+def _base_tables(con, dialect: str) -> None:
+    from backend.db import DEFAULT_SETTINGS
+
+    cur = con.cursor()
+    id_column = "INTEGER PRIMARY KEY AUTOINCREMENT" if dialect == "sqlite" else "SERIAL PRIMARY KEY"
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS work_day (
+        date TEXT PRIMARY KEY,
+        start_time TEXT,
+        end_time TEXT,
+        break_minutes INTEGER NOT NULL DEFAULT 0,
+        break_started_at TEXT,
+        notes TEXT
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS settings (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """)
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS recurring_holiday (
+        id {id_column},
+        date TEXT NOT NULL,
+        label TEXT,
+        UNIQUE(date)
+    )
+    """)
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS time_off (
+        id {id_column},
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        label TEXT
+    )
+    """)
+    for k, v in DEFAULT_SETTINGS.items():
+        cur.execute(
+            "INSERT INTO settings(key, value) VALUES(%s, %s) ON CONFLICT (key) DO NOTHING",
+            (k, str(v)),
+        )
+
+
+# Postgres only: native types instead of the TEXT the app used to write.
+# SQLite has no such types; its ISO strings already sort and compare correctly.
+_TYPED_COLUMNS = {
+    "work_day": {"date": "DATE", "start_time": "TIME", "end_time": "TIME", "break_started_at": "TIMESTAMP"},
+    "time_off": {"start_date": "DATE", "end_date": "DATE"},
+}
+
+
+def _typed_columns(con, dialect: str) -> None:
+    if dialect != "postgres":
+        return
+    cur = con.cursor()
+    for table, columns in _TYPED_COLUMNS.items():
+        cur.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = %s AND column_name = ANY(%s) AND data_type = 'text'",
+            (table, list(columns)),
+        )
+        text_columns = [r["column_name"] for r in cur.fetchall()]
+        if not text_columns:
+            continue  # created typed by hand
+        alters = ", ".join(
+            f"ALTER COLUMN {col} TYPE {columns[col]} USING NULLIF({col}, '')::{columns[col].lower()}"
+            for col in text_columns
+        )
+        cur.execute(f"ALTER TABLE {table} {alters}")
+
+
+def _derived_columns(con, dialect: str) -> None:
+    # Also re-creates the Postgres trigger function for the typed columns.
+    create_derived_columns(con, dialect)
+    rebuild_derived_columns(con, dialect)
+
+
+def _range_indexes(con, dialect: str) -> None:
+    # work_day.date is the primary key; time_off is filtered by overlap with a date range.
+    cur = con.cursor()
+    cur.execute("CREATE INDEX IF NOT EXISTS time_off_start_end_idx ON time_off (start_date, end_date)")
+    cur.execute("CREATE INDEX IF NOT EXISTS time_off_end_idx ON time_off (end_date)")
+
+
+def _time_off_range_index(con, dialect: str) -> None:
+    # SQLite keeps the B-tree indexes: an R*Tree cannot lead with the tenant, so
+    # the tenants migration would drop it again.
+    if dialect != "postgres":
+        return
+    cur = con.cursor()
+    # Serves `daterange(start_date, end_date, '[]') && daterange(...)` overlap filters.
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS time_off_range_gist ON time_off USING gist (daterange(start_date, end_date, '[]'))"
+    )
+
+
+DATA_VERSION_TABLES = ("work_day", "settings", "recurring_holiday", "time_off")
+
+
+def _data_versions(con, dialect: str) -> None:
+    # One counter per table, bumped by triggers on every write (API, import,
+    # replica pull or another process). ETags are derived from these; the
+    # random epoch keeps a recreated database from reusing old tags.
+    cur = con.cursor()
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS data_version (
+        name TEXT PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    )
+    """)
+    cur.execute(
+        "INSERT INTO data_version (name, version) VALUES (%s, %s) ON CONFLICT (name) DO NOTHING",
+        ("epoch", secrets.randbits(31)),
+    )
+    for table in DATA_VERSION_TABLES:
+        cur.execute("INSERT INTO data_version (name) VALUES (%s) ON CONFLICT (name) DO NOTHING", (table,))
+
+    if dialect == "postgres":
+        cur.execute("""
+        CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE data_version SET version = version + 1 WHERE name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+        for table in DATA_VERSION_TABLES:
+            cur.execute(f"DROP TRIGGER IF EXISTS {table}_data_version ON {table}")
+            cur.execute(
+                f"CREATE TRIGGER {table}_data_version AFTER INSERT OR UPDATE OR DELETE ON {table} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()"
+            )
+        return
+
+    # SQLite has no statement triggers: one bump per changed row.
+    for table in DATA_VERSION_TABLES:
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_data_version_{event.lower()} AFTER {event} ON {table}
+            BEGIN
+                UPDATE data_version SET version = version + 1 WHERE name = '{table}';
+            END
+            """)
+
+
+# Tenancy: every table gets a user_id, and keys and indexes lead with it so a
+# tenant's queries stay index range scans however many tenants share the
+# database. Existing rows belong to DEFAULT_USER_ID. The column has no default:
+# a write that forgets the tenant fails instead of landing in someone's data.
+_TENANT_KEYS = {
+    # table -> (constraint, key columns after user_id)
+    "work_day": ("PRIMARY KEY", "date"),
+    "settings": ("PRIMARY KEY", "key"),
+    "recurring_holiday": ("UNIQUE", "date"),
+}
+
+# work_day is WITHOUT ROWID: stored in (user_id, date) order, so a tenant's
+# range reads touch its own pages however the tenants' writes interleave.
+_SQLITE_TENANT_TABLES = {
+    "work_day": """
+        user_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        start_time TEXT,
+        end_time TEXT,
+        break_minutes INTEGER NOT NULL DEFAULT 0,
+        break_started_at TEXT,
+        notes TEXT,
+        gross_minutes INTEGER,
+        net_minutes INTEGER,
+        PRIMARY KEY (user_id, date)
+    """,
+    "settings": """
+        user_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (user_id, key)
+    """,
+    "recurring_holiday": """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        label TEXT,
+        UNIQUE (user_id, date)
+    """,
+    "time_off": """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        label TEXT
+    """,
+}
+
+
+def _tenant_keys_postgres(con) -> None:
+    from backend.tenant import DEFAULT_USER_ID
+
+    cur = con.cursor()
+    for table in DATA_VERSION_TABLES:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS user_id TEXT NOT NULL DEFAULT %s", (DEFAULT_USER_ID,))
+        cur.execute(f"ALTER TABLE {table} ALTER COLUMN user_id DROP DEFAULT")
+    for table, (constraint, column) in _TENANT_KEYS.items():
+        cur.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = %s",
+            (table, "p" if constraint == "PRIMARY KEY" else "u"),
+        )
+        for r in cur.fetchall():
+            cur.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{r["conname"]}"')
+        cur.execute(f"ALTER TABLE {table} ADD {constraint} (user_id, {column})")
+
+    # The exclusion constraint compared ranges across everyone; set_time_off_exclusion
+    # re-adds it per tenant.
+    cur.execute("ALTER TABLE time_off DROP CONSTRAINT IF EXISTS time_off_no_overlap")
+    _time_off_range_gist(con)
+
+
+def _time_off_range_gist(con) -> None:
+    """Postgres: the GiST index behind time_off_overlap_clause, led by user_id when btree_gist allows."""
+    cur = con.cursor()
+    if _ensure_btree_gist(con):
+        cur.execute("DROP INDEX IF EXISTS time_off_range_gist")
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS time_off_user_range_gist "
+            "ON time_off USING gist (user_id, daterange(start_date, end_date, '[]'))"
+        )
+    else:
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS time_off_range_gist ON time_off USING gist (daterange(start_date, end_date, '[]'))"
+        )
+
+
+def _ensure_btree_gist(con) -> bool:
+    """Postgres: btree_gist lets GiST indexes and constraints lead with user_id."""
+    cur = con.cursor()
+    cur.execute("SAVEPOINT btree_gist")
+    try:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    except Exception as exc:
+        cur.execute("ROLLBACK TO SAVEPOINT btree_gist")
+        logging.warning("btree_gist is not available; time off ranges keep a GiST index without user_id | %s", exc)
+        return False
+    cur.execute("RELEASE SAVEPOINT btree_gist")
+    return True
+
+
+def _tenant_keys_sqlite(con) -> None:
+    from backend.tenant import DEFAULT_USER_ID
+
+    # SQLite cannot change a primary key in place: rebuild each table. Dropping
+    # the old table drops its triggers. Databases built before migration 5 became
+    # a no-op on SQLite still have its R*Tree: it cannot lead with the tenant and
+    # goes too, overlap queries use the (user_id, ...) B-tree instead.
+    cur = con.cursor()
+    for event in ("insert", "update", "delete"):
+        cur.execute(f"DROP TRIGGER IF EXISTS time_off_rtree_{event}")
+    cur.execute("DROP TABLE IF EXISTS time_off_rtree")
+    for table, columns in _SQLITE_TENANT_TABLES.items():
+        cur.execute(f"PRAGMA table_info({table})")
+        copied = ", ".join(r["name"] for r in cur.fetchall())
+        options = " WITHOUT ROWID" if table == "work_day" else ""
+        cur.execute(f"CREATE TABLE {table}_tenant ({columns}){options}")
+        cur.execute(f"INSERT INTO {table}_tenant (user_id, {copied}) SELECT %s, {copied} FROM {table}", (DEFAULT_USER_ID,))
+        cur.execute(f"DROP TABLE {table}")
+        cur.execute(f"ALTER TABLE {table}_tenant RENAME TO {table}")
+    create_derived_columns(con, "sqlite")
+
+
+def _tenants(con, dialect: str) -> None:
+    if dialect == "postgres":
+        _tenant_keys_postgres(con)
+    else:
+        _tenant_keys_sqlite(con)
+
+    cur = con.cursor()
+    cur.execute("DROP INDEX IF EXISTS time_off_start_end_idx")
+    cur.execute("DROP INDEX IF EXISTS time_off_end_idx")
+    cur.execute("CREATE INDEX IF NOT EXISTS time_off_user_start_end_idx ON time_off (user_id, start_date, end_date)")
+    cur.execute("CREATE INDEX IF NOT EXISTS time_off_user_end_idx ON time_off (user_id, end_date)")
+
+    # Counters per (tenant, table), so one tenant's writes leave the others' ETags
+    # and streams alone. The epoch keeps its value under user_id ''.
+    cur.execute("SELECT version FROM data_version WHERE name = 'epoch'")
+    row = cur.fetchone()
+    epoch = row["version"] if row else secrets.randbits(31)
+    cur.execute("DROP TABLE data_version")
+    cur.execute("""
+    CREATE TABLE data_version (
+        user_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        version BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, name)
+    )
+    """)
+    cur.execute("INSERT INTO data_version (user_id, name, version) VALUES ('', 'epoch', %s)", (epoch,))
+    create_tenant_data_version_triggers(con, dialect, DATA_VERSION_TABLES)
+
+
+def create_tenant_data_version_triggers(con, dialect: str, tables) -> None:
+    """(Re)create the triggers that bump data_version for each written tenant."""
+    cur = con.cursor()
+    if dialect == "postgres":
+        # Statement triggers over transition tables: one upsert per tenant touched.
+        cur.execute("""
+        CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO data_version (user_id, name, version)
+                SELECT DISTINCT user_id, TG_TABLE_NAME, 1 FROM new_rows
+                ON CONFLICT (user_id, name) DO UPDATE SET version = data_version.version + 1;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO data_version (user_id, name, version)
+                SELECT user_id, TG_TABLE_NAME, 1 FROM new_rows UNION SELECT user_id, TG_TABLE_NAME, 1 FROM old_rows
+                ON CONFLICT (user_id, name) DO UPDATE SET version = data_version.version + 1;
+            ELSE
+                INSERT INTO data_version (user_id, name, version)
+                SELECT DISTINCT user_id, TG_TABLE_NAME, 1 FROM old_rows
+                ON CONFLICT (user_id, name) DO UPDATE SET version = data_version.version + 1;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """)
+        for table in tables:
+            cur.execute(f"DROP TRIGGER IF EXISTS {table}_data_version ON {table}")
+            for event, referencing in (
+                ("INSERT", "NEW TABLE AS new_rows"),
+                ("UPDATE", "NEW TABLE AS new_rows OLD TABLE AS old_rows"),
+                ("DELETE", "OLD TABLE AS old_rows"),
+            ):
+                name = f"{table}_data_version_{event.lower()}"
+                cur.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+                cur.execute(
+                    f"CREATE TRIGGER {name} AFTER {event} ON {table} REFERENCING {referencing} "
+                    "FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()"
+                )
+        return
+
+    for table in tables:
+        for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+            name = f"{table}_data_version_{event.lower()}"
+            cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cur.execute(f"""
+            CREATE TRIGGER {name} AFTER {event} ON {table}
+            BEGIN
+                INSERT INTO data_version (user_id, name, version) VALUES ({ref}.user_id, '{table}', 1)
+                ON CONFLICT (user_id, name) DO UPDATE SET version = version + 1;
+            END
+            """)
+
+
+def _time_off_sync_ids(con, dialect: str) -> None:
+    # time_off ids are assigned independently by each database, so a replica and
+    # Postgres can hand the same id to different ranges. Rows are matched across
+    # databases by sync_id instead, generated by whoever inserts the row. Existing
+    # rows get 'legacy-<id>', which pairs the ids a replica already pushed verbatim.
+    cur = con.cursor()
+    cur.execute("ALTER TABLE time_off ADD COLUMN sync_id TEXT")
+    cur.execute("UPDATE time_off SET sync_id = 'legacy-' || id")
+    if dialect == "postgres":
+        cur.execute("ALTER TABLE time_off ALTER COLUMN sync_id SET NOT NULL")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS time_off_user_sync_id_idx ON time_off (user_id, sync_id)")
+    if dialect == "sqlite":
+        # A hybrid replica's queued time_off keys were ids; re-key them the same way.
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sync_outbox'")
+        if cur.fetchone():
+            cur.execute("UPDATE sync_outbox SET row_key = 'legacy-' || row_key WHERE table_name = 'time_off'")
+
+
+def _time_off_range_gist_fallback(con, dialect: str) -> None:
+    # Databases migrated to tenants without btree_gist lost their only range index.
+    if dialect != "postgres":
+        return
+    cur = con.cursor()
+    cur.execute("SELECT COALESCE(to_regclass('time_off_user_range_gist'), to_regclass('time_off_range_gist')) AS idx")
+    if cur.fetchone()["idx"] is None:
+        _time_off_range_gist(con)
+
+
+MIGRATIONS = [
+    (1, "base_tables", _base_tables),
+    (2, "typed_columns", _typed_columns),
+    (3, "derived_columns", _derived_columns),
+    (4, "range_indexes", _range_indexes),
+    (5, "time_off_range_index", _time_off_range_index),
+    (6, "data_versions", _data_versions),
+    (7, "tenants", _tenants),
+    (8, "time_off_sync_ids", _time_off_sync_ids),
+    (9, "time_off_range_gist_fallback", _time_off_range_gist_fallback),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _schema_is_current(cur) -> bool:
+    """One round trip: does schema_migrations record every known step?"""
+    cur.execute("SELECT COUNT(*) AS n, MAX(version) AS latest FROM schema_migrations")
+    row = cur.fetchone()
+    return row["n"] == len(MIGRATIONS) and row["latest"] == LATEST_VERSION
+
+
+def _applied_versions(cur) -> set[int]:
+    cur.execute("SELECT version FROM schema_migrations")
+    return {r["version"] for r in cur.fetchall()}
+
+
+def run_migrations(con, dialect: str) -> list[int]:
+    """Apply pending migrations in order. Returns the versions applied now."""
+    cur = con.cursor()
+    try:
+        if _schema_is_current(cur):
+            con.rollback()
+            return []
+    except Exception:
+        con.rollback()  # no schema_migrations table yet
+        cur = con.cursor()
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """)
+        con.commit()
+
+    done = []
+    for version, name, migrate in MIGRATIONS:
+        if dialect == "postgres":
+            # Other app instances may be starting against the same database.
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))")
+        if version in _applied_versions(cur):
+            con.rollback()
+            continue
+        try:
+            migrate(con, dialect)
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (%s, %s, CURRENT_TIMESTAMP)",
+                (version, name),
+            )
+            con.commit()
+        except Exception:
+            con.rollback()
+            logging.exception("Schema migration failed | version=%s | name=%s", version, name)
+            raise
+        logging.info("Applied schema migration | version=%s | name=%s", version, name)
+        done.append(version)
+    return done
+
+
+def set_time_off_exclusion(con, enabled: bool) -> None:
+    """
+    Postgres: add or drop the constraint that rejects overlapping time off
+    ranges of the same tenant. Configuration rather than a migration, so it
+    follows TIME_OFF_EXCLUSIVE; existing overlaps keep it from being added.
+    Needs btree_gist to compare user_id inside the GiST constraint.
+    """
+    cur = con.cursor()
+    cur.execute("SELECT 1 FROM pg_constraint WHERE conname = 'time_off_no_overlap'")
+    present = cur.fetchone() is not None
+    try:
+        if enabled and not present:
+            if not _ensure_btree_gist(con):
+                con.rollback()
+                logging.warning("TIME_OFF_EXCLUSIVE is ignored: the per-user constraint needs btree_gist")
+                return
+            cur.execute(
+                "ALTER TABLE time_off ADD CONSTRAINT time_off_no_overlap "
+                "EXCLUDE USING gist (user_id WITH =, daterange(start_date, end_date, '[]') WITH &&)"
+            )
+        elif present and not enabled:
+            cur.execute("ALTER TABLE time_off DROP CONSTRAINT time_off_no_overlap")
+        con.commit()
+    except Exception as exc:
+        con.rollback()
+        logging.warning("Could not add time_off_no_overlap (overlapping ranges already stored?) | %s", exc)
+
+
+def partition_work_day(con, partitions: int) -> bool:
+    """
+    Postgres: turn work_day into a table hash-partitioned on user_id. Opt-in:
+    every tenant's rows stay together in one partition, so vacuum and index
+    maintenance scale with the partition instead of the whole team. Rewrites
+    the table under an exclusive lock. False when it is already partitioned.
+    """
+    cur = con.cursor()
+    cur.execute("SELECT relkind FROM pg_class WHERE relname = 'work_day' AND relkind IN ('r', 'p')")
+    if cur.fetchone()["relkind"] == "p":
+        con.rollback()
+        return False
+    cur.execute("ALTER TABLE work_day RENAME TO work_day_unpartitioned")
+    cur.execute("ALTER TABLE work_day_unpartitioned RENAME CONSTRAINT work_day_pkey TO work_day_unpartitioned_pkey")
+    cur.execute("CREATE TABLE work_day (LIKE work_day_unpartitioned INCLUDING DEFAULTS) PARTITION BY HASH (user_id)")
+    cur.execute("ALTER TABLE work_day ADD PRIMARY KEY (user_id, date)")
+    for remainder in range(partitions):
+        cur.execute(
+            f"CREATE TABLE work_day_p{remainder} PARTITION OF work_day "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    # Copy before creating the triggers (the old table's go with it): the rows
+    # keep their derived values and no tenant's data_version moves.
+    cur.execute("INSERT INTO work_day SELECT * FROM work_day_unpartitioned")
+    cur.execute("DROP TABLE work_day_unpartitioned")
+    create_derived_columns(con, "postgres")
+    create_tenant_data_version_triggers(con, "postgres", ("work_day",))
+    con.commit()
+    return True
+
+
+def main(argv=None) -> None:
+    import argparse
+
+    from backend.db import SQL_DIALECT, db_session
+    from backend.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument(
+        "--partition-work-day",
+        type=int,
+        metavar="N",
+        help="Postgres: also hash-partition work_day on user_id into N partitions",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    with db_session() as con:
+        applied = run_migrations(con, SQL_DIALECT)
+        if args.partition_work_day:
+            if SQL_DIALECT != "postgres":
+                parser.error("--partition-work-day needs Postgres")
+            if partition_work_day(con, args.partition_work_day):
+                logging.info("Partitioned work_day | partitions=%s", args.partition_work_day)
+            else:
+                logging.info("work_day is already partitioned")
+    logging.info("Schema is at version %s | applied_now=%s", LATEST_VERSION, applied)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# Per-request database figures. The request middleware opens a RequestDbStats
+# for each request; the cursors handed out by the pools add every statement to
+# it (and get_con adds the time spent waiting for a connection). Sync
+# endpoints run in worker threads, but FastAPI copies the context into them, so
+# they update the same object. Statements slower than SLOW_QUERY_MS are logged
+# on their own line, inside a request or not.
+
+
+def _float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logging.warning("Invalid float for %s: %s. Falling back to %s", name, raw, default)
+        return default
+
+
+SLOW_QUERY_MS = _float_env("SLOW_QUERY_MS", 200.0)  # <= 0 disables the slow-query log
+_SQL_LOG_CHARS = 300
+_SPACES = re.compile(r"\s+")
+
+
+class RequestDbStats:
+    __slots__ = ("request_id", "queries", "db_seconds", "pool_wait_seconds", "slowest_seconds", "slowest_sql")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_sql = None
+
+
+_CURRENT: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def begin_request(request_id: str):
+    """Start collecting for the current request; returns (stats, token for end_request)."""
+    stats = RequestDbStats(request_id)
+    return stats, _CURRENT.set(stats)
+
+
+def end_request(token) -> None:
+    _CURRENT.reset(token)
+
+
+def short_sql(sql, limit: int = _SQL_LOG_CHARS) -> str:
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", errors="replace")
+    text = _SPACES.sub(" ", str(sql)).strip()
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def record_query(sql, seconds: float) -> None:
+    stats = _CURRENT.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+        if seconds > stats.slowest_seconds:
+            stats.slowest_seconds = seconds
+            stats.slowest_sql = sql
+    if SLOW_QUERY_MS > 0 and seconds * 1000 >= SLOW_QUERY_MS:
+        # Parameters are left out on purpose: they are user data.
+        logging.warning(
+            "Slow query | %.1fms | request_id=%s | sql=%s",
+            seconds * 1000,
+            stats.request_id if stats is not None else "-",
+            short_sql(sql),
+        )
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _CURRENT.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def server_timing(stats: RequestDbStats, total_ms: float) -> str:
+    """Server-Timing header value (shown per request in the browser's network panel)."""
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"pool;dur={stats.pool_wait_seconds * 1000:.1f}, "
+        f"slowest;dur={stats.slowest_seconds * 1000:.1f}, "
+        f"total;dur={total_ms:.1f}"
+    )
+
+
+def log_fields(stats: RequestDbStats) -> str:
+    """Suffix for the request log line; empty when the request ran no SQL."""
+    if not stats.queries and stats.pool_wait_seconds < 0.001:
+        return ""
+    return " | db=%sq/%.1fms | pool_wait=%.1fms | slowest=%.1fms %s" % (
+        stats.queries,
+        stats.db_seconds * 1000,
+        stats.pool_wait_seconds * 1000,
+        stats.slowest_seconds * 1000,
+        short_sql(stats.slowest_sql, 80) if stats.slowest_sql is not None else "",
+    )
+
+
+def timed_cursor(base):
+    """Subclass of a sync cursor class whose execute/executemany are timed."""
+
+    class TimedCursor(base):
+        def execute(self, query, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return super().execute(query, *args, **kwargs)
+            finally:
+                record_query(query, time.perf_counter() - start)
+
+        def executemany(self, query, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return super().executemany(query, *args, **kwargs)
+            finally:
+                record_query(query, time.perf_counter() - start)
+
+    TimedCursor.__name__ = TimedCursor.__qualname__ = "Timed" + base.__name__
+    return TimedCursor
+
+
+def timed_async_cursor(base):
+    """Same as timed_cursor for psycopg 3's AsyncCursor."""
+
+    class TimedAsyncCursor(base):
+        async def execute(self, query, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await super().execute(query, *args, **kwargs)
+            finally:
+                record_query(query, time.perf_counter() - start)
+
+        async def executemany(self, query, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await super().executemany(query, *args, **kwargs)
+            finally:
+                record_query(query, time.perf_counter() - start)
+
+    TimedAsyncCursor.__name__ = TimedAsyncCursor.__qualname__ = "Timed" + base.__name__
+    return TimedAsyncCursor
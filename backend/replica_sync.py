@@ -0,0 +1,296 @@
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Optional
+
+from backend.db import DB_TYPE, connect_postgres, create_schema, db_session, float_env, int_env, invalidate_settings_cache
+from backend.services.offday_index import invalidate_offday_index
+from backend.tenant import DEFAULT_USER_ID
+
+# Hybrid mode (DB_TYPE=hybrid): every request reads and writes the local SQLite
+# replica. SQLite triggers record each changed key in a durable outbox in the
+# same transaction as the change, and this worker replays the outbox to Postgres
+# and pulls remote changes back.
+#
+# Conflict rule, per row key (work_day.date, settings.key, recurring_holiday.date,
+# time_off.sync_id): a key with pending outbox entries is owned by the replica and its
+# current local state overwrites the remote row on push; once the key's outbox is
+# drained, the remote row wins on the next pull.
+#
+# A replica belongs to one tenant, SYNC_USER_ID: every request on it runs as
+# that user, and only that user's rows are pushed and pulled.
+
+SYNC_INTERVAL_SECONDS = float_env("SYNC_INTERVAL_SECONDS", 5.0)
+SYNC_PULL_INTERVAL_SECONDS = float_env("SYNC_PULL_INTERVAL_SECONDS", 60.0)
+SYNC_PULL_DAYS = int_env("SYNC_PULL_DAYS", 400)
+SYNC_BATCH_SIZE = int_env("SYNC_BATCH_SIZE", 500)
+SYNC_USER_ID = os.getenv("SYNC_USER_ID", DEFAULT_USER_ID)
+
+# table -> key that identifies the same row on both sides
+SYNC_TABLES = {
+    "settings": "key",
+    "recurring_holiday": "date",
+    "time_off": "sync_id",
+    "work_day": "date",
+}
+# Surrogate keys assigned independently on each side; never copied.
+_LOCAL_ONLY_COLUMNS = {"recurring_holiday": {"id"}, "time_off": {"id"}}
+
+_WORKER = None
+_STOP = threading.Event()
+_WAKE = threading.Event()
+_STATUS = {"last_push_at": None, "last_pull_at": None, "last_error": None, "pushed": 0, "pulled": 0}
+
+
+def create_outbox_schema(con) -> None:
+    cur = con.cursor()
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS sync_outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_key TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    # A row here (only ever inside the pull transaction) mutes the outbox triggers.
+    cur.execute("CREATE TABLE IF NOT EXISTS sync_suppress (flag INTEGER)")
+    cur.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+
+    for table, key_col in SYNC_TABLES.items():
+        for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+            extra = ""
+            if event == "UPDATE":
+                # A key change also has to delete the old key remotely.
+                extra = (
+                    f" INSERT INTO sync_outbox(table_name, row_key) SELECT '{table}', OLD.{key_col}"
+                    f" WHERE OLD.{key_col} IS NOT NEW.{key_col};"
+                )
+            # Recreated every start so a changed sync key takes effect.
+            cur.execute(f"DROP TRIGGER IF EXISTS {table}_outbox_{event.lower()}")
+            cur.execute(f"""
+            CREATE TRIGGER {table}_outbox_{event.lower()}
+            AFTER {event} ON {table}
+            WHEN NOT EXISTS (SELECT 1 FROM sync_suppress)
+            BEGIN
+                INSERT INTO sync_outbox(table_name, row_key) VALUES ('{table}', {ref}.{key_col});{extra}
+            END
+            """)
+    con.commit()
+
+
+def _local_value(value):
+    """Postgres may hand back native types; the replica stores the API's string forms."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, dtime):
+        return value.strftime("%H:%M")
+    return value
+
+
+def _upsert(cur, table: str, row: dict) -> None:
+    skip = _LOCAL_ONLY_COLUMNS.get(table, set())
+    key_col = SYNC_TABLES[table]
+    cols = [c for c in row if c not in skip]
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in cols if c not in (key_col, "user_id"))
+    cur.execute(
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))}) "
+        f"ON CONFLICT (user_id, {key_col}) DO UPDATE SET {updates}",
+        [row[c] for c in cols],
+    )
+
+
+def _push(local, remote) -> int:
+    cur = local.cursor()
+    cur.execute("SELECT id, table_name, row_key FROM sync_outbox ORDER BY id LIMIT %s", (SYNC_BATCH_SIZE,))
+    entries = cur.fetchall()
+    if not entries:
+        return 0
+
+    rcur = remote.cursor()
+    keys = dict.fromkeys((e["table_name"], e["row_key"]) for e in entries)
+    for table, key in keys:
+        key_col = SYNC_TABLES[table]
+        # Push the row's *current* state: several edits to one key collapse into one write.
+        cur.execute(f"SELECT * FROM {table} WHERE user_id = %s AND {key_col} = %s", (SYNC_USER_ID, key))
+        row = cur.fetchone()
+        if row is None:
+            rcur.execute(f"DELETE FROM {table} WHERE user_id = %s AND {key_col} = %s", (SYNC_USER_ID, key))
+        else:
+            _upsert(rcur, table, row)
+    remote.commit()
+
+    # Entries added while we were pushing have larger ids and stay queued.
+    cur.execute("DELETE FROM sync_outbox WHERE id <= %s", (entries[-1]["id"],))
+    local.commit()
+    return len(keys)
+
+
+def _pull_filter(table: str, since: Optional[str]) -> tuple[str, tuple]:
+    where, params = " WHERE user_id = %s", (SYNC_USER_ID,)
+    if table == "work_day" and since:
+        where += " AND date >= %s"
+        params += (since,)
+    return where, params
+
+
+def _pull(local, remote, full: bool) -> int:
+    since = None if full else (date.today() - timedelta(days=SYNC_PULL_DAYS)).isoformat()
+
+    # Read the remote side first: no local write lock is held over the network,
+    # so punches keep committing while a pull is downloading.
+    rcur = remote.cursor()
+    remote_tables = {}
+    for table, key_col in SYNC_TABLES.items():
+        where, params = _pull_filter(table, since)
+        rcur.execute(f"SELECT * FROM {table}{where}", params)
+        remote_rows = {}
+        for r in rcur.fetchall():
+            row = {k: _local_value(v) for k, v in r.items()}
+            remote_rows[str(row[key_col])] = row
+        remote_tables[table] = remote_rows
+    remote.rollback()
+
+    changed = 0
+    changed_tables = set()
+    cur = local.cursor()
+    # Starts the (local only, short) write transaction; the outbox is read inside
+    # it so a punch committed during the download still counts as pending.
+    cur.execute("INSERT INTO sync_suppress(flag) VALUES (1)")
+    try:
+        cur.execute("SELECT DISTINCT table_name, row_key FROM sync_outbox")
+        pending = {(r["table_name"], r["row_key"]) for r in cur.fetchall()}
+
+        for table, key_col in SYNC_TABLES.items():
+            where, params = _pull_filter(table, since)
+            cur.execute(f"SELECT * FROM {table}{where}", params)
+            local_rows = {str(r[key_col]): r for r in cur.fetchall()}
+            remote_rows = remote_tables[table]
+
+            skip = _LOCAL_ONLY_COLUMNS.get(table, set())
+            for key, row in remote_rows.items():
+                if (table, key) in pending:
+                    continue
+                local_row = local_rows.get(key)
+                if local_row is not None and all(local_row.get(c) == v for c, v in row.items() if c not in skip):
+                    continue
+                _upsert(cur, table, row)
+                changed += 1
+                changed_tables.add(table)
+
+            # Small reference tables are mirrored, including remote deletes.
+            if table in ("recurring_holiday", "time_off"):
+                for key in local_rows.keys() - remote_rows.keys():
+                    if (table, key) not in pending:
+                        cur.execute(f"DELETE FROM {table} WHERE user_id = %s AND {key_col} = %s", (SYNC_USER_ID, key))
+                        changed += 1
+                        changed_tables.add(table)
+
+        cur.execute("DELETE FROM sync_suppress")
+        if full:
+            cur.execute(
+                "INSERT INTO sync_state(key, value) VALUES ('last_full_pull', %s) "
+                "ON CONFLICT(key) DO UPDATE SET value = EXCLUDED.value",
+                (datetime.now().isoformat(),),
+            )
+        local.commit()
+    except Exception:
+        local.rollback()
+        raise
+
+    if "settings" in changed_tables:
+        invalidate_settings_cache(SYNC_USER_ID)
+    if changed_tables & {"recurring_holiday", "time_off"}:
+        invalidate_offday_index(SYNC_USER_ID)
+    return changed
+
+
+def _needs_full_pull(local) -> bool:
+    cur = local.cursor()
+    cur.execute("SELECT value FROM sync_state WHERE key = 'last_full_pull'")
+    return cur.fetchone() is None
+
+
+def sync_once(remote, pull: bool = True) -> None:
+    with db_session() as local:
+        _STATUS["pushed"] += _push(local, remote)
+        _STATUS["last_push_at"] = datetime.now().isoformat()
+        if pull:
+            _STATUS["pulled"] += _pull(local, remote, _needs_full_pull(local))
+            _STATUS["last_pull_at"] = datetime.now().isoformat()
+
+
+def sync_status() -> dict:
+    with db_session() as local:
+        cur = local.cursor()
+        cur.execute("SELECT COUNT(*) AS n FROM sync_outbox")
+        pending = cur.fetchone()["n"]
+    return {**_STATUS, "pending": pending}
+
+
+def request_sync() -> None:
+    """Wake the worker now instead of at the next interval."""
+    _WAKE.set()
+
+
+def _worker_loop() -> None:
+    remote = None
+    next_pull = 0.0
+    backoff = SYNC_INTERVAL_SECONDS
+    while not _STOP.is_set():
+        try:
+            if remote is None or remote.closed:
+                remote = connect_postgres()
+                create_schema(remote, "postgres")
+                next_pull = 0.0
+            pull = time.monotonic() >= next_pull
+            sync_once(remote, pull=pull)
+            if pull:
+                next_pull = time.monotonic() + SYNC_PULL_INTERVAL_SECONDS
+            _STATUS["last_error"] = None
+            backoff = SYNC_INTERVAL_SECONDS
+        except Exception as exc:
+            # Offline or Supabase hiccup: the outbox keeps every change until a push succeeds.
+            if _STATUS["last_error"] is None:
+                logging.warning("Replica sync failed; retrying in the background | %s", exc)
+            _STATUS["last_error"] = str(exc)
+            if remote is not None:
+                try:
+                    remote.close()
+                except Exception:
+                    pass
+                remote = None
+            backoff = min(backoff * 2, 300.0)
+
+        _WAKE.wait(backoff)
+        _WAKE.clear()
+
+    if remote is not None:
+        remote.close()
+
+
+def start_sync_worker() -> None:
+    global _WORKER
+    if DB_TYPE != "hybrid" or _WORKER is not None:
+        return
+    _STOP.clear()
+    _WORKER = threading.Thread(target=_worker_loop, name="replica-sync", daemon=True)
+    _WORKER.start()
+    logging.info(
+        "Replica sync worker started | interval=%ss | pull_interval=%ss",
+        SYNC_INTERVAL_SECONDS,
+        SYNC_PULL_INTERVAL_SECONDS,
+    )
+
+
+def stop_sync_worker() -> None:
+    global _WORKER
+    if _WORKER is None:
+        return
+    _STOP.set()
+    _WAKE.set()
+    _WORKER.join(timeout=10)
+    _WORKER = None
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from backend.async_db import get_async_con
+from backend.services.calendar_service import compute_year_calendar_async, year_bounds
+from backend.services.etag_service import DAY_VIEW_TABLES, not_modified_async
+
+
+router = APIRouter(prefix="/api/calendar", tags=["calendar"])
+
+
+@router.get("/year/{year}")
+async def get_calendar_year(year: int, request: Request, response: Response):
+    if year < 1900 or year > 2100:
+        raise HTTPException(status_code=400, detail="year must be between 1900 and 2100")
+
+    async with get_async_con() as con:
+        cached = await not_modified_async(con, request, response, f"calendar:{year}", DAY_VIEW_TABLES, year_bounds(year))
+        if cached is not None:
+            return cached
+        return await compute_year_calendar_async(con, year)
@@ -0,0 +1,21 @@
+from datetime import date
+
+from fastapi import APIRouter, Request, Response
+
+from backend.async_db import get_async_con
+from backend.services.dashboard_service import dashboard_range, load_dashboard_async
+from backend.services.etag_service import DAY_VIEW_TABLES, not_modified_async
+from backend.time_utils import parse_date
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+
+@router.get("/{day_str}")
+async def get_dashboard(day_str: str, request: Request, response: Response):
+    _ = parse_date(day_str)
+    key = f"dashboard:{day_str}:{date.today().isoformat()}"
+    async with get_async_con() as con:
+        cached = await not_modified_async(con, request, response, key, DAY_VIEW_TABLES, dashboard_range(day_str))
+        if cached is not None:
+            return cached
+        return await load_dashboard_async(con, day_str)
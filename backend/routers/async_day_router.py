@@ -0,0 +1,149 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from datetime import datetime
+from backend.async_db import get_async_con, get_targets_async
+from backend.schemas import MinutesBody, DayPatch, StartAtBody, EndAtBody
+from backend.time_utils import parse_date, validate_hhmm, normalize_hhmm
+from backend.services.day_service import get_or_create_day_async, compute_day_summary
+from backend.services.day_mutation_service import (
+    run_day_mutation_async,
+    day_response_async,
+    upsert_day_stmt,
+    start_now_stmt,
+    end_now_stmt,
+    end_at_stmt,
+    break_add_stmt,
+    break_subtract_stmt,
+    break_start_stmt,
+    break_end_stmt,
+    end_after_start_check,
+)
+
+# Same routes as day_router, served from the asyncio pool (DB_ASYNC=1).
+router = APIRouter(prefix="/api/day", tags=["day"])
+
+
+def _include_week(include: Optional[str]) -> bool:
+    return include == "week"
+
+
+async def _not_started(con, day_str: str):
+    _ = await get_or_create_day_async(con, day_str)
+    raise HTTPException(400, "Day not started yet (no start_time).")
+
+
+async def _break_precondition_failed(con, day_str: str, starting: bool):
+    row = await get_or_create_day_async(con, day_str)
+    if not row["start_time"]:
+        raise HTTPException(400, "Day not started yet (no start_time).")
+    if row["end_time"]:
+        raise HTTPException(400, "Day already ended.")
+    if starting:
+        raise HTTPException(400, "Break already started.")
+    raise HTTPException(400, "No active break to end.")
+
+
+async def _break_not_startable(con, day_str: str):
+    await _break_precondition_failed(con, day_str, starting=True)
+
+
+async def _break_not_endable(con, day_str: str):
+    await _break_precondition_failed(con, day_str, starting=False)
+
+
+async def _already_started(con, day_str: str):
+    row = await get_or_create_day_async(con, day_str)
+    return { "ok": True, "message": "Already started", "start_time": normalize_hhmm(row["start_time"])}
+
+
+async def _mutate(day_str: str, stmt, include: Optional[str], check=None, on_miss=None):
+    """Run one mutation; `on_miss` explains a guarded statement that matched no row."""
+    async with get_async_con() as con:
+        row, week_rows = await run_day_mutation_async(con, day_str, stmt, _include_week(include), check)
+        if row is None:
+            return await on_miss(con, day_str)
+        return await day_response_async(con, day_str, row, week_rows)
+
+@router.get("/{day_str}")
+async def get_day(day_str: str):
+    _ = parse_date(day_str)
+    async with get_async_con() as con:
+        row = await get_or_create_day_async(con, day_str)
+        return compute_day_summary(None, day_str, row, await get_targets_async(con))
+
+@router.post("/{day_str}/start-now")
+async def start_now(day_str: str, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    return await _mutate(day_str, start_now_stmt(day_str, datetime.now()), include, on_miss=_already_started)
+
+@router.post("/{day_str}/start-at")
+async def start_at(day_str: str, body: StartAtBody, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    validate_hhmm(body.start_time)
+
+    stmt = upsert_day_stmt(day_str, {"start_time": body.start_time, "end_time": None, "break_started_at": None})
+    return await _mutate(day_str, stmt, include)
+
+@router.post("/{day_str}/end-now")
+async def end_now(day_str: str, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    return await _mutate(day_str, end_now_stmt(day_str, datetime.now()), include, on_miss=_not_started)
+
+@router.post("/{day_str}/end-at")
+async def end_at(day_str: str, body: EndAtBody, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    validate_hhmm(body.end_time)
+
+    return await _mutate(
+        day_str,
+        end_at_stmt(day_str, body.end_time),
+        include,
+        check=end_after_start_check(day_str, body.end_time),
+        on_miss=_not_started,
+    )
+
+@router.post("/{day_str}/clear-end")
+async def clear_end(day_str: str, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    return await _mutate(day_str, upsert_day_stmt(day_str, {"end_time": None}), include)
+
+@router.post("/{day_str}/break/add")
+async def break_add(day_str: str, body: MinutesBody, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    return await _mutate(day_str, break_add_stmt(day_str, body.minutes), include)
+
+@router.post("/{day_str}/break/start")
+async def break_start(day_str: str, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    return await _mutate(day_str, break_start_stmt(day_str, datetime.now()), include, on_miss=_break_not_startable)
+
+@router.post("/{day_str}/break/end")
+async def break_end(day_str: str, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    return await _mutate(day_str, break_end_stmt(day_str, datetime.now()), include, on_miss=_break_not_endable)
+
+@router.post("/{day_str}/break/subtract")
+async def break_subtract(day_str: str, body: MinutesBody, include: Optional[str] = None):
+    _ = parse_date(day_str)
+    return await _mutate(day_str, break_subtract_stmt(day_str, body.minutes), include)
+
+@router.patch("/{day_str}")
+async def patch_day(day_str: str, body: DayPatch, include: Optional[str] = None):
+    _ = parse_date(day_str)
+
+    data = body.model_dump(exclude_unset=True)
+
+    for k in ("start_time", "end_time"):
+        if k in data and data[k] == "":
+            data[k] = None
+
+    if "start_time" in data and data["start_time"] is not None:
+        validate_hhmm(data["start_time"])
+    if "end_time" in data and data["end_time"] is not None:
+        validate_hhmm(data["end_time"])
+
+    if not data:
+        async with get_async_con() as con:
+            _ = await get_or_create_day_async(con, day_str)
+        return {"ok": True}
+    return await _mutate(day_str, upsert_day_stmt(day_str, data), include)
@@ -0,0 +1,17 @@
+from datetime import date
+
+from fastapi import APIRouter, Request, Response
+from backend.async_db import get_async_con
+from backend.services.etag_service import DAY_VIEW_TABLES, not_modified_async
+from backend.services.week_service import compute_week_async, week_bounds
+
+router = APIRouter(prefix="/api/week", tags=["week"])
+
+@router.get("/{day_str}")
+async def get_week(day_str: str, request: Request, response: Response):
+    key = f"week:{day_str}:{date.today().isoformat()}"
+    async with get_async_con() as con:
+        cached = await not_modified_async(con, request, response, key, DAY_VIEW_TABLES, week_bounds(day_str))
+        if cached is not None:
+            return cached
+        return await compute_week_async(con, day_str)
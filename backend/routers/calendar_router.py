@@ -1,18 +1,20 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
-from backend.db import get_con
-from backend.services.calendar_service import compute_year_calendar
+from backend.db import get_db
+from backend.services.calendar_service import compute_year_calendar, year_bounds
+from backend.services.etag_service import DAY_VIEW_TABLES, not_modified
 
 
 router = APIRouter(prefix="/api/calendar", tags=["calendar"])
 
 
 @router.get("/year/{year}")
-def get_calendar_year(year: int):
+def get_calendar_year(year: int, request: Request, response: Response, con=Depends(get_db)):
     if year < 1900 or year > 2100:
         raise HTTPException(status_code=400, detail="year must be between 1900 and 2100")
 
-    con = get_con()
+    cached = not_modified(con, request, response, f"calendar:{year}", DAY_VIEW_TABLES, year_bounds(year))
+    if cached is not None:
+        return cached
     out = compute_year_calendar(con, year)
-    con.close()
     return out
@@ -1,39 +1,21 @@
-from fastapi import APIRouter
+from datetime import date
 
-from backend.db import get_con, get_settings, get_targets
-from backend.services.day_service import compute_day_summary
-from backend.services.week_service import compute_week
+from fastapi import APIRouter, Depends, Request, Response
+
+from backend.db import get_db
+from backend.services.dashboard_service import dashboard_range, load_dashboard
+from backend.services.etag_service import DAY_VIEW_TABLES, not_modified
 from backend.time_utils import parse_date
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
 @router.get("/{day_str}")
-def get_dashboard(day_str: str):
+def get_dashboard(day_str: str, request: Request, response: Response, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    cur = con.cursor()
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row = cur.fetchone()
-
-    day = compute_day_summary(con, day_str, row)
-    week = compute_week(con, day_str)
-    settings = get_settings(con)
-    targets = get_targets(con)
-    con.close()
-
-    return {
-        "day": day,
-        "week": week,
-        "settings": {
-            "settings": {
-                "daily_soft_minutes": int(settings["daily_soft_minutes"]),
-                "daily_hard_minutes": int(settings["daily_hard_minutes"]),
-                "workdays_per_week": int(settings["workdays_per_week"]),
-            },
-            "derived": {
-                "weekly_soft_minutes": targets["weekly_soft"],
-                "weekly_hard_minutes": targets["weekly_hard"],
-            },
-        },
-    }
+    # The week's pace figures depend on today, so it is part of the key.
+    key = f"dashboard:{day_str}:{date.today().isoformat()}"
+    cached = not_modified(con, request, response, key, DAY_VIEW_TABLES, dashboard_range(day_str))
+    if cached is not None:
+        return cached
+    return load_dashboard(con, day_str)
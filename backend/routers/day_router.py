@@ -1,246 +1,137 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime
-from backend.db import get_con
+from backend.db import get_db
 from backend.schemas import MinutesBody, DayPatch, StartAtBody, EndAtBody
-from backend.time_utils import parse_date, validate_hhmm, now_hhmm, dt_for, normalize_datetime, normalize_hhmm
+from backend.time_utils import parse_date, validate_hhmm, normalize_hhmm
 from backend.services.day_service import get_or_create_day, compute_day_summary
+from backend.services.day_mutation_service import (
+    run_day_mutation,
+    day_response,
+    upsert_day_stmt,
+    start_now_stmt,
+    end_now_stmt,
+    end_at_stmt,
+    break_add_stmt,
+    break_subtract_stmt,
+    break_start_stmt,
+    break_end_stmt,
+    end_after_start_check,
+)
 
 router = APIRouter(prefix="/api/day", tags=["day"])
 
+# Mutations accept ?include=week and then answer {"day": ..., "week": ...}
+# so the UI does not need a second /api/week request.
+
+
+def _include_week(include: Optional[str]) -> bool:
+    return include == "week"
+
+
+def _not_started(con, day_str: str):
+    _ = get_or_create_day(con, day_str)
+    raise HTTPException(400, "Day not started yet (no start_time).")
+
+
+def _break_precondition_failed(con, day_str: str, starting: bool):
+    row = get_or_create_day(con, day_str)
+    if not row["start_time"]:
+        raise HTTPException(400, "Day not started yet (no start_time).")
+    if row["end_time"]:
+        raise HTTPException(400, "Day already ended.")
+    if starting:
+        raise HTTPException(400, "Break already started.")
+    raise HTTPException(400, "No active break to end.")
+
+
 @router.get("/{day_str}")
-def get_day(day_str: str):
+def get_day(day_str: str, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
     row = get_or_create_day(con, day_str)
     out = compute_day_summary(con, day_str, row)
     return out
 
 @router.post("/{day_str}/start-now")
-def start_now(day_str: str):
+def start_now(day_str: str, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    row = get_or_create_day(con, day_str)
+    row, week_rows = run_day_mutation(con, day_str, start_now_stmt(day_str, datetime.now()), _include_week(include))
 
-    if row["start_time"]:
-        con.close()
+    if row is None:
+        row = get_or_create_day(con, day_str)
         return { "ok": True, "message": "Already started", "start_time": normalize_hhmm(row["start_time"])}
 
-    cur = con.cursor()
-    cur.execute(
-        "UPDATE work_day SET start_time = %s, end_time = NULL, break_started_at = NULL WHERE date = %s",
-        (now_hhmm(), day_str),
-    )
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2 = cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/start-at")
-def start_at(day_str: str, body: StartAtBody):
+def start_at(day_str: str, body: StartAtBody, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
     validate_hhmm(body.start_time)
 
-    con = get_con()
-    _ = get_or_create_day(con, day_str)
-    cur = con.cursor()
-    cur.execute(
-        "UPDATE work_day SET start_time = %s, end_time = NULL, break_started_at = NULL WHERE date = %s",
-        (body.start_time, day_str),
-    )
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row = cur.fetchone()
-    out = compute_day_summary(con, day_str, row)
-    con.close()
-    return out
+    stmt = upsert_day_stmt(day_str, {"start_time": body.start_time, "end_time": None, "break_started_at": None})
+    row, week_rows = run_day_mutation(con, day_str, stmt, _include_week(include))
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/end-now")
-def end_now(day_str: str):
+def end_now(day_str: str, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    row = get_or_create_day(con, day_str)
-
-    if not row["start_time"]:
-        con.close()
-        raise HTTPException(400, "Day not started yer (no start_time).")
-
-    break_minutes = int(row["break_minutes"] or 0)
-    break_started_at = row["break_started_at"]
-    if break_started_at:
-        try:
-            break_started_dt = normalize_datetime(break_started_at)
-        except (TypeError, ValueError):
-            break_started_dt = None
-        if break_started_dt:
-            extra_break = max(0, int((datetime.now() - break_started_dt).total_seconds() // 60))
-            break_minutes += extra_break
-
-    cur = con.cursor()
-    cur.execute(
-        "UPDATE work_day SET end_time = %s, break_minutes = %s, break_started_at = NULL WHERE date = %s",
-        (now_hhmm(), break_minutes, day_str),
-    )
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2 = cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(con, day_str, end_now_stmt(day_str, datetime.now()), _include_week(include))
+    if row is None:
+        _not_started(con, day_str)
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/end-at")
-def end_at(day_str: str, body: EndAtBody):
-    day = parse_date(day_str)
+def end_at(day_str: str, body: EndAtBody, include: Optional[str] = None, con=Depends(get_db)):
+    _ = parse_date(day_str)
     validate_hhmm(body.end_time)
 
-    con = get_con()
-    row = get_or_create_day(con, day_str)
-    if not row["end_time"]:
-        con.close()
-        raise HTTPException(400, "Day not started yet (no start_time).")
-
-    start_dt = dt_for(day, row["start_time"])
-    end_dt = dt_for(day, body.end_time)
-    if end_dt < start_dt:
-        con.close()
-        raise HTTPException(400, "End time cannot be earlier than start time (no midnight crossing).")
-
-    cur = con.cursor()
-    cur.execute("UPDATE work_day SET end_time = %s WHERE date = %s", (body.end_time, day_str))
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2 = cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(
+        con,
+        day_str,
+        end_at_stmt(day_str, body.end_time),
+        _include_week(include),
+        check=end_after_start_check(day_str, body.end_time),
+    )
+    if row is None:
+        _not_started(con, day_str)
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/clear-end")
-def clear_end(day_str: str):
+def clear_end(day_str: str, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    _ = get_or_create_day(con, day_str)
-    cur = con.cursor()
-    cur.execute("UPDATE work_day SET end_time = NULL WHERE date = %s", (day_str,))
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row = cur.fetchone()
-    out = compute_day_summary(con, day_str, row)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(con, day_str, upsert_day_stmt(day_str, {"end_time": None}), _include_week(include))
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/break/add")
-def break_add(day_str: str, body: MinutesBody):
+def break_add(day_str: str, body: MinutesBody, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    row = get_or_create_day(con, day_str)
-    cur = con.cursor()
-
-    new_val = int(row["break_minutes"] or 0) + body.minutes
-    cur.execute("UPDATE work_day SET break_minutes = %s WHERE date = %s", (new_val, day_str))
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2 = cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(con, day_str, break_add_stmt(day_str, body.minutes), _include_week(include))
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/break/start")
-def break_start(day_str: str):
+def break_start(day_str: str, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    row = get_or_create_day(con, day_str)
-
-    if not row["start_time"]:
-        con.close()
-        raise HTTPException(400, "Day not started yet (no start_time).")
-    if row["end_time"]:
-        con.close()
-        raise HTTPException(400, "Day already ended.")
-    if row["break_started_at"]:
-        con.close()
-        raise HTTPException(400, "Break already started.")
-
-    cur = con.cursor()
-    cur.execute(
-        "UPDATE work_day SET break_started_at = %s WHERE date = %s",
-        (datetime.now().isoformat(), day_str),
-    )
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2 = cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(con, day_str, break_start_stmt(day_str, datetime.now()), _include_week(include))
+    if row is None:
+        _break_precondition_failed(con, day_str, starting=True)
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/break/end")
-def break_end(day_str: str):
+def break_end(day_str: str, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    row = get_or_create_day(con, day_str)
-
-    if not row["start_time"]:
-        con.close()
-        raise HTTPException(400, "Day not started yet (no start_time).")
-    if row["end_time"]:
-        con.close()
-        raise HTTPException(400, "Day already ended.")
-
-    break_started_at = row["break_started_at"]
-    if not break_started_at:
-        con.close()
-        raise HTTPException(400, "No active break to end.")
-
-    try:
-        break_started_dt = normalize_datetime(break_started_at)
-    except (TypeError, ValueError):
-        break_started_dt = None
-
-    extra_break = 0
-    if break_started_dt:
-        extra_break = max(0, int((datetime.now() - break_started_dt).total_seconds() // 60))
-
-    new_break_minutes = int(row["break_minutes"] or 0) + extra_break
-
-    cur = con.cursor()
-    cur.execute(
-        "UPDATE work_day SET break_minutes = %s, break_started_at = NULL WHERE date = %s",
-        (new_break_minutes, day_str),
-    )
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2 = cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(con, day_str, break_end_stmt(day_str, datetime.now()), _include_week(include))
+    if row is None:
+        _break_precondition_failed(con, day_str, starting=False)
+    return day_response(con, day_str, row, week_rows)
 
 @router.post("/{day_str}/break/subtract")
-def break_subtract(day_str: str, body: MinutesBody):
+def break_subtract(day_str: str, body: MinutesBody, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
-    con = get_con()
-    row = get_or_create_day(con, day_str)
-    cur = con.cursor()
-
-    new_val = max(0, int(row["break_minutes"] or 0) - body.minutes)
-    cur.execute("UPDATE work_day SET break_minutes = %s WHERE date = %s" , (new_val, day_str))
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2= cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(con, day_str, break_subtract_stmt(day_str, body.minutes), _include_week(include))
+    return day_response(con, day_str, row, week_rows)
 
 @router.patch("/{day_str}")
-def patch_day(day_str: str, body: DayPatch):
+def patch_day(day_str: str, body: DayPatch, include: Optional[str] = None, con=Depends(get_db)):
     _ = parse_date(day_str)
 
     data = body.model_dump(exclude_unset=True)
@@ -249,33 +140,14 @@ def patch_day(day_str: str, body: DayPatch):
         if k in data and data[k] == "":
             data[k] = None
 
-        
     if "start_time" in data and data["start_time"] is not None:
         validate_hhmm(data["start_time"])
     if "end_time" in data and data["end_time"] is not None:
         validate_hhmm(data["end_time"])
 
-    con = get_con()
-    _ = get_or_create_day(con, day_str)
-    cur = con.cursor()
-
     if not data:
-        con.close()
+        _ = get_or_create_day(con, day_str)
         return {"ok": True}
-        
-    fields = []
-    vals = []
-
-    for key, value in data.items():
-        fields.append(f"{key} = %s")
-        vals.append(value)
 
-    vals.append(day_str)
-    cur.execute(f"UPDATE work_day SET {', '.join(fields)} WHERE date = %s", vals)
-    con.commit()
-
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
-    row2 = cur.fetchone()
-    out = compute_day_summary(con, day_str, row2)
-    con.close()
-    return out
+    row, week_rows = run_day_mutation(con, day_str, upsert_day_stmt(day_str, data), _include_week(include))
+    return day_response(con, day_str, row, week_rows)
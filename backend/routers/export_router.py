@@ -0,0 +1,44 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from backend.time_utils import parse_date
+from backend.services.export_service import export_time_off, export_work_days
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def _stream(chunks, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+def _check_range(from_date: Optional[str], to_date: Optional[str]) -> None:
+    if from_date: parse_date(from_date)
+    if to_date: parse_date(to_date)
+
+
+@router.get("/work-days")
+def get_work_days_export(
+    format: Literal["csv", "ndjson"] = "csv",
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+):
+    _check_range(from_date, to_date)
+    return _stream(export_work_days(format, from_date, to_date), format, "work-days")
+
+
+@router.get("/time-off")
+def get_time_off_export(
+    format: Literal["csv", "ndjson"] = "csv",
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+):
+    _check_range(from_date, to_date)
+    return _stream(export_time_off(format, from_date, to_date), format, "time-off")
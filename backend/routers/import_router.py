@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request
+from starlette.concurrency import run_in_threadpool
+
+from backend.services.import_service import import_time_off, import_work_days, parse_import_body
+
+router = APIRouter(prefix="/api/import", tags=["import"])
+
+# Body: JSON (list of objects or {"rows": [...]}) or CSV with a header row,
+# e.g. the output of /api/export/work-days. ?strict=true writes nothing if any row is invalid.
+
+
+@router.post("/work-days")
+async def post_work_days_import(request: Request, strict: bool = False):
+    rows = parse_import_body(await request.body(), request.headers.get("content-type"))
+    return await run_in_threadpool(import_work_days, rows, strict)
+
+
+@router.post("/time-off")
+async def post_time_off_import(request: Request, strict: bool = False):
+    rows = parse_import_body(await request.body(), request.headers.get("content-type"))
+    return await run_in_threadpool(import_time_off, rows, strict)
@@ -1,29 +1,27 @@
-from fastapi import APIRouter
-from backend.db import get_con
+from fastapi import APIRouter, Depends, Request, Response
+from backend.db import get_db
 from backend.schemas import RecurringHolidayCreate
+from backend.services.etag_service import not_modified
 from backend.services.recurring_holiday_service import list_recurring, upsert_recurring, delete_recurring
 
 router = APIRouter(prefix="/api/recurring-holidays", tags=["recurring-holidays"])
 
 @router.get("")
-def get_all():
-    con = get_con()
+def get_all(request: Request, response: Response, con=Depends(get_db)):
+    cached = not_modified(con, request, response, "recurring-holidays", ("recurring_holiday",))
+    if cached is not None:
+        return cached
     items = list_recurring(con)
-    con.close()
     return {"items": items}
 
 @router.post("")
-def upsert(body: RecurringHolidayCreate):
-    con = get_con()
+def upsert(body: RecurringHolidayCreate, con=Depends(get_db)):
     upsert_recurring(con, body.date, body.label)
     items = list_recurring(con)
-    con.close()
     return {"items": items}
 
 @router.delete("/{rid}")
-def remove(rid: int):
-    con = get_con()
+def remove(rid: int, con=Depends(get_db)):
     delete_recurring(con, rid)
     items = list_recurring(con)
-    con.close()
     return {"items": items}
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Query
+
+from backend.db import get_db
+from backend.services.report_service import compute_report
+
+router = APIRouter(prefix="/api/report", tags=["report"])
+
+
+@router.get("")
+def get_report(
+    from_date: str = Query(alias="from", description="YYYY-MM-DD"),
+    to_date: str = Query(alias="to", description="YYYY-MM-DD"),
+    group: str = Query(default="day", description="day | week | month | year"),
+    con=Depends(get_db),
+):
+    return compute_report(con, from_date, to_date, group)
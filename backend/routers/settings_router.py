@@ -1,15 +1,13 @@
-from fastapi import APIRouter, HTTPException
-from backend.db import get_con, get_settings, get_targets, upsert_settings
+from fastapi import APIRouter, Depends, HTTPException
+from backend.db import get_db, get_settings, get_targets, upsert_settings
 from backend.schemas import SettingsPatch
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
 @router.get("")
-def api_get_settings():
-    con = get_con()
+def api_get_settings(con=Depends(get_db)):
     s = get_settings(con)
     t = get_targets(con)
-    con.close()
     return {
         "settings": {
             "daily_soft_minutes": int(s["daily_soft_minutes"]),
@@ -23,15 +21,13 @@ def api_get_settings():
     }
 
 @router.patch("")
-def api_patch_settings(body: SettingsPatch):
-    con = get_con()
+def api_patch_settings(body: SettingsPatch, con=Depends(get_db)):
     current = get_settings(con)
 
     new_soft = body.daily_soft_minutes if body.daily_soft_minutes is not None else int(current["daily_soft_minutes"])
     new_hard = body.daily_hard_minutes if body.daily_hard_minutes is not None else int(current["daily_hard_minutes"])
 
     if new_soft > new_hard:
-        con.close()
         raise HTTPException(400, "daily_soft_minutes cannot be greater than daily_hard_minutes.")
 
     updates = {}
@@ -48,7 +44,6 @@ def api_patch_settings(body: SettingsPatch):
 
     s = get_settings(con)
     t = get_targets(con)
-    con.close()
     return {
         "settings": {
             "daily_soft_minutes": int(s["daily_soft_minutes"]),
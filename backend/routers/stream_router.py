@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from backend.time_utils import parse_date
+from backend.services.stream_service import event_stream
+from backend.tenant import current_user_id
+
+router = APIRouter(prefix="/api/stream", tags=["stream"])
+
+
+@router.get("/{day_str}")
+async def get_stream(day_str: str):
+    _ = parse_date(day_str)
+    return StreamingResponse(
+        event_stream(day_str, current_user_id()),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: keep nginx-style proxies from holding events back.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
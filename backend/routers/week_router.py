@@ -1,13 +1,18 @@
-from fastapi import APIRouter
-from backend.db import get_con
-from backend.time_utils import parse_date
-from backend.services.week_service import compute_week
+from datetime import date
+
+from fastapi import APIRouter, Depends, Request, Response
+from backend.db import get_db
+from backend.services.etag_service import DAY_VIEW_TABLES, not_modified
+from backend.services.week_service import compute_week, week_bounds
 
 router = APIRouter(prefix="/api/week", tags=["week"])
 
 @router.get("/{day_str}")
-def get_week(day_str: str):
-    con = get_con()
+def get_week(day_str: str, request: Request, response: Response, con=Depends(get_db)):
+    # The pace figures depend on today, so it is part of the key.
+    key = f"week:{day_str}:{date.today().isoformat()}"
+    cached = not_modified(con, request, response, key, DAY_VIEW_TABLES, week_bounds(day_str))
+    if cached is not None:
+        return cached
     out = compute_week(con, day_str)
-    con.close()
-    return out
\ No newline at end of file
+    return out
@@ -1,8 +1,9 @@
 import logging
 import os
 
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
+# sentry_sdk is imported only when SENTRY_DSN is set: it is slow to import and
+# pulls in every integration it can find.
+SENTRY_ENABLED = False
 
 
 def _float_env(name: str, default: float) -> float:
@@ -17,11 +18,15 @@ def _float_env(name: str, default: float) -> float:
 
 
 def init_sentry() -> bool:
+    global SENTRY_ENABLED
     dsn = os.getenv("SENTRY_DSN")
     if not dsn:
         logging.info("Sentry disabled: SENTRY_DSN is not set")
         return False
 
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+
     sentry_sdk.init(
         dsn=dsn,
         environment=os.getenv("SENTRY_ENVIRONMENT", os.getenv("ENV", "development")),
@@ -29,5 +34,25 @@ def init_sentry() -> bool:
         traces_sample_rate=_float_env("SENTRY_TRACES_SAMPLE_RATE", 0.0),
         integrations=[FastApiIntegration()],
     )
+    SENTRY_ENABLED = True
     logging.info("Sentry enabled for backend")
     return True
+
+
+def capture_request_exception(request_id: str, request) -> None:
+    """Report the exception being handled, tagged with the request (no-op without Sentry)."""
+    if not SENTRY_ENABLED:
+        return
+    import sentry_sdk
+
+    with sentry_sdk.push_scope() as scope:
+        scope.set_tag("request_id", request_id)
+        scope.set_context(
+            "request",
+            {
+                "method": request.method,
+                "path": request.url.path,
+                "query": request.url.query,
+            },
+        )
+        sentry_sdk.capture_exception()
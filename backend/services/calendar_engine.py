@@ -0,0 +1,133 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException
+
+from backend.time_utils import normalize_hhmm
+from backend.services.day_service import compute_day_summary
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python columns give the same answers
+    np = None
+
+# Columnar day summaries for long ranges (year calendar and up).
+#
+# A stored day that is finished (or never started) only depends on its
+# start/end/break minutes, so those days are computed as columns in one pass,
+# with NumPy when it is installed. Days that are still running depend on the
+# clock, and rows compute_day_summary would reject (bad times, end before
+# start) must raise exactly as before, so both go through the per-day path.
+# Either way the result is identical to calling compute_day_summary per day.
+
+_NUMPY_MIN_DAYS = 64
+
+
+@lru_cache(maxsize=4096)
+def _minutes_of(hhmm: str) -> Optional[int]:
+    try:
+        t = datetime.strptime(hhmm, "%H:%M")
+    except ValueError:
+        return None
+    return t.hour * 60 + t.minute
+
+
+def _hhmm(value) -> Optional[str]:
+    try:
+        return normalize_hhmm(value)
+    except HTTPException:
+        return None
+
+
+def _columns(starts: list[int], ends: list[int], breaks: list[int], soft: int, hard: int):
+    """gross, net, status code (0 under soft, 1 between, 2 over hard) per day."""
+    if np is not None and len(starts) >= _NUMPY_MIN_DAYS:
+        start_a = np.asarray(starts, dtype=np.int64)
+        gross_a = np.maximum(0, np.asarray(ends, dtype=np.int64) - start_a)
+        net_a = np.maximum(0, gross_a - np.asarray(breaks, dtype=np.int64))
+        status_a = np.where(net_a > hard, 2, np.where(net_a > soft, 1, 0))
+        return gross_a.tolist(), net_a.tolist(), status_a.tolist()
+
+    gross = [max(0, e - s) for s, e in zip(starts, ends)]
+    net = [max(0, g - b) for g, b in zip(gross, breaks)]
+    status = [2 if n > hard else 1 if n > soft else 0 for n in net]
+    return gross, net, status
+
+
+_DAILY_STATUS = ("under_soft", "between_soft_and_hard", "over_hard")
+
+
+def summarize_days(start: date, end: date, row_map: dict[str, dict], targets: dict) -> list[dict]:
+    """compute_day_summary for every day in [start, end], computed column-wise."""
+    soft = targets["daily_soft"]
+    hard = targets["daily_hard"]
+
+    day_strs: list[str] = []
+    texts: list[tuple[Optional[str], Optional[str], int]] = []
+    starts: list[int] = []
+    ends: list[int] = []
+    breaks: list[int] = []
+    per_day: dict[int, dict] = {}
+
+    d = start
+    while d <= end:
+        ds = d.isoformat()
+        row = row_map.get(ds)
+        i = len(day_strs)
+        day_strs.append(ds)
+
+        start_time = end_time = None
+        start_min = end_min = 0
+        break_minutes = 0
+        if row:
+            start_time = _hhmm(row["start_time"]) if row["start_time"] is not None else None
+            end_time = _hhmm(row["end_time"]) if row["end_time"] is not None else None
+            break_minutes = int(row["break_minutes"]) if row["break_minutes"] else 0
+            unreadable = (row["start_time"] is not None and start_time is None) or (
+                row["end_time"] is not None and end_time is None
+            )
+            if start_time and end_time and row.get("net_minutes") is not None:
+                # Stored by the work_day triggers; as a column pair (0, gross) it yields the same net.
+                end_min = row["gross_minutes"]
+            elif start_time:
+                start_min = _minutes_of(start_time)
+                end_min = _minutes_of(end_time) if end_time else None  # no end yet: still running
+            if unreadable or start_min is None or end_min is None or end_min < start_min:
+                per_day[i] = compute_day_summary(None, ds, row, targets)
+                start_min = end_min = 0
+
+        texts.append((start_time, end_time, break_minutes))
+        starts.append(start_min)
+        ends.append(end_min)
+        breaks.append(break_minutes)
+        d += timedelta(days=1)
+
+    gross, net, status = _columns(starts, ends, breaks, soft, hard)
+
+    out: list[dict] = []
+    for i, ds in enumerate(day_strs):
+        summary = per_day.get(i)
+        if summary is None:
+            start_time, end_time, break_minutes = texts[i]
+            n = net[i]
+            summary = {
+                "date": ds,
+                "start_time": start_time,
+                "end_time": end_time,
+                "break_minutes": break_minutes,
+                "gross_minutes": gross[i],
+                "net_minutes": n,
+                "running": False,
+                "break_running": False,
+                "targets": {"daily_soft": soft, "daily_hard": hard},
+                "status": {
+                    "daily": _DAILY_STATUS[status[i]],
+                    "over_soft_by": max(0, n - soft),
+                    "over_hard_by": max(0, n - hard),
+                    "soft_remaining": max(0, soft - n),
+                    "hard_remaining": max(0, hard - n),
+                },
+            }
+        out.append(summary)
+    return out
@@ -1,91 +1,56 @@
-from datetime import date, timedelta
+from datetime import date
 
 from backend.db import get_targets
-from backend.time_utils import parse_date, normalize_date
-from backend.services.day_service import compute_day_summary
-from backend.services.recurring_holiday_service import list_recurring
-from backend.services.timeoff_service import expand_time_off_days
+from backend.async_db import get_targets_async
+from backend.time_utils import parse_date
+from backend.services.calendar_engine import summarize_days
+from backend.services.day_service import fetch_day_rows, fetch_day_rows_async
+from backend.services.offday_index import OffDayIndex, get_offday_index, get_offday_index_async
 
 
-def _year_bounds(year: int) -> tuple[date, date]:
+def year_bounds(year: int) -> tuple[date, date]:
     start = parse_date(f"{year:04d}-01-01")
     end = parse_date(f"{year:04d}-12-31")
     return start, end
 
 
-def _fetch_day_rows_for_range(con, start: date, end: date) -> dict[str, dict]:
-    cur = con.cursor()
-    cur.execute(
-        """
-        SELECT *
-        FROM work_day
-        WHERE date >= %s AND date <= %s
-        """,
-        (start.isoformat(), end.isoformat()),
-    )
-    rows = cur.fetchall()
-    return {normalize_date(r["date"]): r for r in rows}
-
-
 def compute_year_calendar(con, year: int) -> dict:
-    start, end = _year_bounds(year)
-
-    rec_items = list_recurring(con)
-    rec_lookup = {}
-    for r in rec_items:
-        try:
-            d = parse_date(r.get("date"))
-            rec_lookup[(d.month, d.day)] = r
-        except Exception:
-            continue
-
-    personal_map = expand_time_off_days(con, start, end)
-
-    off_map: dict[str, dict] = {}
-    d = start
-    while d <= end:
-        ds = d.isoformat()
-
-        rh = rec_lookup.get((d.month, d.day))
-        if rh:
-            off_map[ds] = {
-                "source": "recurring",
-                "kind": "holiday",
-                "label": rh.get("label"),
-                "recurring_id": rh.get("id"),
-            }
-
-        po = personal_map.get(ds)
-        if po:
-            off_map[ds] = {
-                "source": "personal",
-                "kind": po.get("kind"),
-                "label": po.get("label"),
-                "time_off_id": po.get("id"),
-                "range": {"start": po.get("start_date"), "end": po.get("end_date")},
-            }
-
-        d += timedelta(days=1)
-
-    row_map = _fetch_day_rows_for_range(con, start, end)
+    start, end = year_bounds(year)
+
+    off_index = get_offday_index(con)
+    row_map = fetch_day_rows(con, start, end)
     targets = get_targets(con)
 
-    days: list[dict] = []
-    d = start
-    while d <= end:
-        ds = d.isoformat()
-        row = row_map.get(ds)
-        summary = compute_day_summary(con, ds, row, targets)
-        off_info = off_map.get(ds)
+    return _build_year_calendar(year, targets, off_index, row_map)
+
+
+async def compute_year_calendar_async(con, year: int) -> dict:
+    start, end = year_bounds(year)
 
+    off_index = await get_offday_index_async(con)
+    row_map = await fetch_day_rows_async(con, start, end)
+    targets = await get_targets_async(con)
+
+    return _build_year_calendar(year, targets, off_index, row_map)
+
+
+def build_calendar_days(start: date, end: date, targets: dict, off_index: OffDayIndex, row_map: dict[str, dict]) -> list[dict]:
+    """Day summaries plus off-day flags for every day in [start, end]."""
+    off_map = off_index.off_days(start, end)
+    days = summarize_days(start, end, row_map, targets)
+    for summary in days:
+        off_info = off_map.get(summary["date"])
         summary["is_off"] = off_info is not None
         summary["off"] = off_info
-        days.append(summary)
-        d += timedelta(days=1)
+    return days
+
+
+def _build_year_calendar(year: int, targets: dict, off_index: OffDayIndex, row_map: dict[str, dict]) -> dict:
+    start, end = year_bounds(year)
 
     return {
         "year": year,
         "start_date": start.isoformat(),
         "end_date": end.isoformat(),
-        "days": days,
+        "days": build_calendar_days(start, end, targets, off_index, row_map),
     }
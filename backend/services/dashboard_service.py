@@ -0,0 +1,120 @@
+from backend.db import (
+    SQL_DIALECT,
+    build_settings_snapshot,
+    cached_settings_snapshot,
+    get_settings,
+    get_targets,
+    settings_version,
+    targets_from_settings,
+)
+from backend.time_utils import normalize_date, parse_date
+from backend.services.day_service import compute_day_summary, fetch_day_rows, work_day_from_json
+from backend.services.offday_index import (
+    OffDayIndex,
+    build_offday_index,
+    cached_offday_index,
+    get_offday_index,
+    offday_index_version,
+)
+from backend.services.week_service import build_week, week_bounds
+from backend.tenant import current_user_id
+
+# The dashboard needs the day row, the week's rows, settings and off days. On
+# Postgres they come back from ONE statement (one JSON column per table), and
+# tables already held in the settings / off-day caches are left out of it, so a
+# warm dashboard costs a single round trip.
+
+
+def dashboard_range(day_str: str):
+    """Mon..Fri of the week, stretched to include `day_str` when it is a weekend day."""
+    week_start, week_end = week_bounds(day_str)
+    return week_start, max(week_end, parse_date(day_str))
+
+
+def _batch_sql(need_settings: bool, need_offdays: bool) -> str:
+    columns = [
+        "(SELECT COALESCE(json_agg(w), '[]'::json) FROM work_day w "
+        "WHERE w.user_id = %(user_id)s AND w.date >= %(start)s AND w.date <= %(end)s) AS day_rows"
+    ]
+    if need_settings:
+        columns.append("(SELECT COALESCE(json_agg(s), '[]'::json) FROM settings s WHERE s.user_id = %(user_id)s) AS settings_rows")
+    if need_offdays:
+        columns.append(
+            "(SELECT COALESCE(json_agg(r), '[]'::json) FROM recurring_holiday r WHERE r.user_id = %(user_id)s) AS recurring_rows"
+        )
+        columns.append("(SELECT COALESCE(json_agg(t), '[]'::json) FROM time_off t WHERE t.user_id = %(user_id)s) AS time_off_rows")
+    return "SELECT " + ", ".join(columns)
+
+
+def _batch_params(start, end) -> dict:
+    return {"user_id": current_user_id(), "start": start.isoformat(), "end": end.isoformat()}
+
+
+def _cached_state(con):
+    snap = getattr(con, "settings_snapshot", None) or cached_settings_snapshot()
+    return snap, cached_offday_index()
+
+
+def _from_batch(con, result: dict, snap, settings_ver: int, off_index, offday_ver: int):
+    row_map = {normalize_date(r["date"]): work_day_from_json(r) for r in result["day_rows"]}
+    if snap is None:
+        snap = build_settings_snapshot(
+            settings_ver, result["settings_rows"], publish=not getattr(con, "settings_dirty", False)
+        )
+        if hasattr(con, "settings_snapshot"):
+            con.settings_snapshot = snap
+    if off_index is None:
+        off_index = build_offday_index(offday_ver, result["recurring_rows"], result["time_off_rows"])
+    targets = dict(snap.targets) if snap.targets is not None else targets_from_settings(snap.settings)
+    return row_map, dict(snap.settings), targets, off_index
+
+
+def load_dashboard(con, day_str: str) -> dict:
+    start, end = dashboard_range(day_str)
+
+    if SQL_DIALECT != "postgres":
+        # Local SQLite: sequential queries cost microseconds, reuse the normal loaders.
+        settings = get_settings(con)
+        targets = get_targets(con)
+        off_index = get_offday_index(con)
+        row_map = fetch_day_rows(con, start, end)
+        return build_dashboard(day_str, row_map, settings, targets, off_index)
+
+    snap, off_index = _cached_state(con)
+    settings_ver, offday_ver = settings_version(), offday_index_version()
+    cur = con.cursor()
+    cur.execute(_batch_sql(snap is None, off_index is None), _batch_params(start, end))
+    row_map, settings, targets, off_index = _from_batch(con, cur.fetchone(), snap, settings_ver, off_index, offday_ver)
+    return build_dashboard(day_str, row_map, settings, targets, off_index)
+
+
+async def load_dashboard_async(con, day_str: str) -> dict:
+    start, end = dashboard_range(day_str)
+
+    snap, off_index = _cached_state(con)
+    settings_ver, offday_ver = settings_version(), offday_index_version()
+    cur = con.cursor()
+    await cur.execute(_batch_sql(snap is None, off_index is None), _batch_params(start, end))
+    row_map, settings, targets, off_index = _from_batch(con, await cur.fetchone(), snap, settings_ver, off_index, offday_ver)
+    return build_dashboard(day_str, row_map, settings, targets, off_index)
+
+
+def build_dashboard(day_str: str, row_map: dict[str, dict], settings: dict, targets: dict, off_index: OffDayIndex) -> dict:
+    day = compute_day_summary(None, day_str, row_map.get(day_str), targets)
+    week = build_week(day_str, targets, off_index, row_map)
+
+    return {
+        "day": day,
+        "week": week,
+        "settings": {
+            "settings": {
+                "daily_soft_minutes": int(settings["daily_soft_minutes"]),
+                "daily_hard_minutes": int(settings["daily_hard_minutes"]),
+                "workdays_per_week": int(settings["workdays_per_week"]),
+            },
+            "derived": {
+                "weekly_soft_minutes": targets["weekly_soft"],
+                "weekly_hard_minutes": targets["weekly_hard"],
+            },
+        },
+    }
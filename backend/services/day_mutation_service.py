@@ -0,0 +1,233 @@
+from datetime import datetime
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+
+from backend.async_db import get_targets_async
+from backend.db import SQL_DIALECT, get_targets
+from backend.services.day_service import compute_day_summary, work_day_from_json
+from backend.services.offday_index import get_offday_index, get_offday_index_async
+from backend.services.week_service import build_week, week_bounds
+from backend.tenant import current_user_id
+from backend.time_utils import dt_for, normalize_date, parse_date
+
+# Every /api/day mutation is ONE statement that creates the row if needed,
+# applies the change (break arithmetic included) and returns the new row.
+# Guarded statements return no row when their precondition does not hold; the
+# router then reads the row to explain why. Shared by the sync and async routers.
+# Rows are keyed by (user_id, date) for the current tenant.
+
+if SQL_DIALECT == "postgres":
+    _GREATEST = "GREATEST"
+    _BREAK_ELAPSED = "FLOOR(EXTRACT(EPOCH FROM (%s::timestamp - break_started_at::timestamp)) / 60)::int"
+else:
+    _GREATEST = "MAX"
+    # julianday() differences carry float error (45 minutes can come out as 44.99999);
+    # round to whole milliseconds before the integer division.
+    _BREAK_ELAPSED = "CAST(ROUND((julianday(%s) - julianday(break_started_at)) * 86400000) AS INTEGER) / 60000"
+
+Statement = tuple[str, tuple]
+
+
+def upsert_day_stmt(day_str: str, fields: dict) -> Statement:
+    """Set `fields` on the day, creating the row if it does not exist yet."""
+    cols = list(fields)
+    return (
+        f"INSERT INTO work_day (user_id, date, {', '.join(cols)}) VALUES (%s, %s, {', '.join(['%s'] * len(cols))}) "
+        f"ON CONFLICT (user_id, date) DO UPDATE SET {', '.join(f'{c} = EXCLUDED.{c}' for c in cols)} "
+        "RETURNING *",
+        (current_user_id(), day_str, *fields.values()),
+    )
+
+
+def start_now_stmt(day_str: str, now: datetime) -> Statement:
+    """No row when the day is already started."""
+    return (
+        "INSERT INTO work_day (user_id, date, start_time) VALUES (%s, %s, %s) "
+        "ON CONFLICT (user_id, date) DO UPDATE SET start_time = EXCLUDED.start_time, end_time = NULL, break_started_at = NULL "
+        "WHERE work_day.start_time IS NULL "
+        "RETURNING *",
+        (current_user_id(), day_str, now.strftime("%H:%M")),
+    )
+
+
+def end_now_stmt(day_str: str, now: datetime) -> Statement:
+    """Close the day (and a running break). No row when the day is not started."""
+    return (
+        "UPDATE work_day SET end_time = %s, "
+        f"break_minutes = break_minutes + CASE WHEN break_started_at IS NULL THEN 0 ELSE {_GREATEST}(0, {_BREAK_ELAPSED}) END, "
+        "break_started_at = NULL "
+        "WHERE user_id = %s AND date = %s AND start_time IS NOT NULL "
+        "RETURNING *",
+        (now.strftime("%H:%M"), now.isoformat(), current_user_id(), day_str),
+    )
+
+
+def end_at_stmt(day_str: str, end_time: str) -> Statement:
+    """No row when the day is not started."""
+    return (
+        "UPDATE work_day SET end_time = %s WHERE user_id = %s AND date = %s AND start_time IS NOT NULL RETURNING *",
+        (end_time, current_user_id(), day_str),
+    )
+
+
+def break_add_stmt(day_str: str, minutes: int) -> Statement:
+    return (
+        "INSERT INTO work_day (user_id, date, break_minutes) VALUES (%s, %s, %s) "
+        "ON CONFLICT (user_id, date) DO UPDATE SET break_minutes = work_day.break_minutes + EXCLUDED.break_minutes "
+        "RETURNING *",
+        (current_user_id(), day_str, minutes),
+    )
+
+
+def break_subtract_stmt(day_str: str, minutes: int) -> Statement:
+    return (
+        "INSERT INTO work_day (user_id, date, break_minutes) VALUES (%s, %s, 0) "
+        f"ON CONFLICT (user_id, date) DO UPDATE SET break_minutes = {_GREATEST}(0, work_day.break_minutes - %s) "
+        "RETURNING *",
+        (current_user_id(), day_str, minutes),
+    )
+
+
+def break_start_stmt(day_str: str, now: datetime) -> Statement:
+    """No row unless the day is running without a break."""
+    return (
+        "UPDATE work_day SET break_started_at = %s "
+        "WHERE user_id = %s AND date = %s AND start_time IS NOT NULL AND end_time IS NULL AND break_started_at IS NULL "
+        "RETURNING *",
+        (now.isoformat(), current_user_id(), day_str),
+    )
+
+
+def break_end_stmt(day_str: str, now: datetime) -> Statement:
+    """No row unless a break is running on a running day."""
+    return (
+        f"UPDATE work_day SET break_minutes = break_minutes + {_GREATEST}(0, {_BREAK_ELAPSED}), break_started_at = NULL "
+        "WHERE user_id = %s AND date = %s AND start_time IS NOT NULL AND end_time IS NULL AND break_started_at IS NOT NULL "
+        "RETURNING *",
+        (now.isoformat(), current_user_id(), day_str),
+    )
+
+
+def end_after_start_check(day_str: str, end_time: str) -> Callable[[dict], None]:
+    """`check` for end_at_stmt: the stored start must not be after the new end."""
+    day = parse_date(day_str)
+
+    def check(row: dict) -> None:
+        if dt_for(day, end_time) < dt_for(day, row["start_time"]):
+            raise HTTPException(400, "End time cannot be earlier than start time (no midnight crossing).")
+
+    return check
+
+
+def _with_week_sql(sql: str) -> str:
+    """Wrap a RETURNING statement so the same round trip also returns the other weekday rows."""
+    return (
+        f"WITH changed AS ({sql}) "
+        "SELECT (SELECT row_to_json(changed) FROM changed) AS day_row, "
+        "(SELECT COALESCE(json_agg(w), '[]'::json) FROM work_day w "
+        "WHERE w.user_id = %s AND w.date >= %s AND w.date <= %s AND w.date <> %s) AS week_rows"
+    )
+
+
+def _week_params(day_str: str) -> tuple:
+    week_start, week_end = week_bounds(day_str)
+    return (current_user_id(), week_start.isoformat(), week_end.isoformat(), day_str)
+
+
+def _week_row_map(rows, day_str: str, row: dict) -> dict[str, dict]:
+    row_map = {normalize_date(r["date"]): r for r in rows}
+    row_map[day_str] = row
+    return row_map
+
+
+def run_day_mutation(
+    con,
+    day_str: str,
+    stmt: Statement,
+    include_week: bool = False,
+    check: Optional[Callable[[dict], None]] = None,
+) -> tuple[Optional[dict], Optional[dict[str, dict]]]:
+    """
+    Execute and commit one mutation. Returns (row, week_rows): row is None when
+    the statement's guard did not match; week_rows (date -> row, Mon..Fri) is
+    only filled when include_week. `check` may raise to roll the change back.
+    """
+    sql, params = stmt
+    cur = con.cursor()
+    row_map = None
+    try:
+        if include_week and SQL_DIALECT == "postgres":
+            cur.execute(_with_week_sql(sql), (*params, *_week_params(day_str)))
+            result = cur.fetchone()
+            row = result["day_row"]
+            if row is not None:
+                row = work_day_from_json(row)
+                row_map = _week_row_map([work_day_from_json(r) for r in result["week_rows"]], day_str, row)
+        else:
+            cur.execute(sql, params)
+            row = cur.fetchone()
+            if row is not None and SQL_DIALECT != "postgres":
+                # SQLite's RETURNING predates the AFTER triggers that fill gross/net_minutes.
+                cur.execute("SELECT * FROM work_day WHERE user_id = %s AND date = %s", (current_user_id(), day_str))
+                row = cur.fetchone()
+            if row is not None and include_week:
+                cur.execute(
+                    "SELECT * FROM work_day WHERE user_id = %s AND date >= %s AND date <= %s AND date <> %s",
+                    _week_params(day_str),
+                )
+                row_map = _week_row_map(cur.fetchall(), day_str, row)
+        if row is not None and check is not None:
+            check(row)
+    except Exception:
+        con.rollback()
+        raise
+    con.commit()
+    return row, row_map
+
+
+async def run_day_mutation_async(
+    con,
+    day_str: str,
+    stmt: Statement,
+    include_week: bool = False,
+    check: Optional[Callable[[dict], None]] = None,
+) -> tuple[Optional[dict], Optional[dict[str, dict]]]:
+    sql, params = stmt
+    cur = con.cursor()
+    row_map = None
+    try:
+        if include_week:
+            await cur.execute(_with_week_sql(sql), (*params, *_week_params(day_str)))
+            result = await cur.fetchone()
+            row = result["day_row"]
+            if row is not None:
+                row = work_day_from_json(row)
+                row_map = _week_row_map([work_day_from_json(r) for r in result["week_rows"]], day_str, row)
+        else:
+            await cur.execute(sql, params)
+            row = await cur.fetchone()
+        if row is not None and check is not None:
+            check(row)
+    except Exception:
+        await con.rollback()
+        raise
+    await con.commit()
+    return row, row_map
+
+
+def day_response(con, day_str: str, row: dict, row_map: Optional[dict[str, dict]]) -> dict:
+    """The day summary, or {"day", "week"} when the week was requested."""
+    targets = get_targets(con)
+    day = compute_day_summary(None, day_str, row, targets)
+    if row_map is None:
+        return day
+    return {"day": day, "week": build_week(day_str, targets, get_offday_index(con), row_map)}
+
+
+async def day_response_async(con, day_str: str, row: dict, row_map: Optional[dict[str, dict]]) -> dict:
+    targets = await get_targets_async(con)
+    day = compute_day_summary(None, day_str, row, targets)
+    if row_map is None:
+        return day
+    return {"day": day, "week": build_week(day_str, targets, await get_offday_index_async(con), row_map)}
@@ -1,21 +1,60 @@
 from typing import Any, Optional
-from datetime import datetime
+from datetime import date, datetime
 from fastapi import HTTPException
 from backend.db import get_targets
-from backend.time_utils import parse_date, dt_for, normalize_datetime, normalize_hhmm
+from backend.tenant import current_user_id
+from backend.time_utils import parse_date, dt_for, normalize_date, normalize_datetime, normalize_hhmm
 
 
 def get_or_create_day(con, day_str: str) -> Optional[dict]:
+    key = (current_user_id(), day_str)
     cur = con.cursor()
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
+    cur.execute("SELECT * FROM work_day WHERE user_id = %s AND date = %s", key)
     row = cur.fetchone()
     if row:
         return row
-    cur.execute("INSERT INTO work_day(date) VALUES (%s)", (day_str,))
+    cur.execute("INSERT INTO work_day(user_id, date) VALUES (%s, %s)", key)
     con.commit()
-    cur.execute("SELECT * FROM work_day WHERE date = %s", (day_str,))
+    cur.execute("SELECT * FROM work_day WHERE user_id = %s AND date = %s", key)
     return cur.fetchone()
 
+async def get_or_create_day_async(con, day_str: str) -> Optional[dict]:
+    key = (current_user_id(), day_str)
+    cur = con.cursor()
+    await cur.execute("SELECT * FROM work_day WHERE user_id = %s AND date = %s", key)
+    row = await cur.fetchone()
+    if row:
+        return row
+    await cur.execute("INSERT INTO work_day(user_id, date) VALUES (%s, %s)", key)
+    await con.commit()
+    await cur.execute("SELECT * FROM work_day WHERE user_id = %s AND date = %s", key)
+    return await cur.fetchone()
+
+def fetch_day_rows(con, start: date, end: date) -> dict[str, dict]:
+    """Fetch all stored day rows for dates in [start, end] in ONE query (YYYY-MM-DD -> row)."""
+    cur = con.cursor()
+    cur.execute(
+        "SELECT * FROM work_day WHERE user_id = %s AND date >= %s AND date <= %s",
+        (current_user_id(), start.isoformat(), end.isoformat()),
+    )
+    return {normalize_date(r["date"]): r for r in cur.fetchall()}
+
+async def fetch_day_rows_async(con, start: date, end: date) -> dict[str, dict]:
+    cur = con.cursor()
+    await cur.execute(
+        "SELECT * FROM work_day WHERE user_id = %s AND date >= %s AND date <= %s",
+        (current_user_id(), start.isoformat(), end.isoformat()),
+    )
+    return {normalize_date(r["date"]): r for r in await cur.fetchall()}
+
+def work_day_from_json(row: dict) -> dict:
+    """A work_day row read through json_agg/row_to_json: TIME comes back as HH:MM:SS, trim it to HH:MM."""
+    for col in ("start_time", "end_time"):
+        value = row.get(col)
+        if isinstance(value, str) and len(value) > 5:
+            row[col] = value[:5]
+    return row
+
 def compute_day_summary(con, day_str: str, row: Optional[dict], targets: Optional[dict] = None) -> dict[str, Any]:
     targets = targets or get_targets(con)
     DAILY_SOFT = targets["daily_soft"]
@@ -32,11 +71,15 @@ def compute_day_summary(con, day_str: str, row: Optional[dict], targets: Optiona
     gross_minutes = 0
     net_minutes = 0
 
-    if start_time:
-        start_dt = dt_for(day, start_time)
+    if start_time and end_time and row.get("net_minutes") is not None:
+        # Completed day: gross/net are kept up to date by the work_day triggers.
+        gross_minutes = row["gross_minutes"]
+        net_minutes = row["net_minutes"]
+    elif start_time:
+        start_dt = dt_for(day, row["start_time"])
 
         if end_time:
-            end_dt = dt_for(day, end_time)
+            end_dt = dt_for(day, row["end_time"])
             if end_dt < start_dt:
                 raise HTTPException(400, f"End time earlier than start time on {day_str}.")
         else:
@@ -0,0 +1,97 @@
+import hashlib
+import time
+from datetime import date
+from typing import Optional
+
+from fastapi import Request, Response
+
+from backend.db import int_env
+from backend.metrics import cache_hit, cache_miss
+from backend.tenant import current_user_id
+
+# Conditional GET for read endpoints. The ETag is a hash of the request key and
+# the data_version counters of the tables the payload is built from, so a
+# matching If-None-Match costs one small query and the payload is never
+# computed. A running day changes with the clock: while the range contains one
+# the tag also carries a time bucket and turns over every
+# ETAG_RUNNING_TTL_SECONDS. Responses are `no-cache`: clients always revalidate.
+# Counters are per tenant (the epoch row has user_id '').
+
+ETAG_RUNNING_TTL_SECONDS = max(1, int_env("ETAG_RUNNING_TTL_SECONDS", 30))
+
+DAY_VIEW_TABLES = ("work_day", "settings", "recurring_holiday", "time_off")
+
+
+def _versions_sql(with_range: bool) -> str:
+    sql = "SELECT name, version FROM data_version WHERE user_id IN ('', %s)"
+    if with_range:
+        sql += (
+            " UNION ALL SELECT 'running' AS name, COUNT(*) AS version FROM work_day "
+            "WHERE user_id = %s AND date >= %s AND date <= %s AND start_time IS NOT NULL AND end_time IS NULL"
+        )
+    return sql
+
+
+def _versions_params(day_range: Optional[tuple[date, date]]) -> tuple:
+    user_id = current_user_id()
+    if day_range is None:
+        return (user_id,)
+    return (user_id, user_id, day_range[0].isoformat(), day_range[1].isoformat())
+
+
+def _etag(key: str, tables: tuple[str, ...], rows) -> str:
+    versions = {r["name"]: int(r["version"]) for r in rows}
+    parts = [current_user_id(), key, versions.get("epoch", 0)]
+    parts += [versions.get(t, 0) for t in tables]
+    if versions.get("running"):
+        parts.append(int(time.time() // ETAG_RUNNING_TTL_SECONDS))
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest() + '"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _conditional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _matches(request, etag):
+        cache_hit("etag")
+        return Response(status_code=304, headers=headers)
+    cache_miss("etag")
+    response.headers.update(headers)
+    return None
+
+
+def not_modified(
+    con,
+    request: Request,
+    response: Response,
+    key: str,
+    tables: tuple[str, ...],
+    day_range: Optional[tuple[date, date]] = None,
+) -> Optional[Response]:
+    """
+    A 304 response when the client's copy is current; otherwise None, with the
+    ETag already set on `response`. `day_range` is the work_day span whose
+    running days make the payload time-dependent.
+    """
+    cur = con.cursor()
+    cur.execute(_versions_sql(day_range is not None), _versions_params(day_range))
+    return _conditional(request, response, _etag(key, tables, cur.fetchall()))
+
+
+async def not_modified_async(
+    con,
+    request: Request,
+    response: Response,
+    key: str,
+    tables: tuple[str, ...],
+    day_range: Optional[tuple[date, date]] = None,
+) -> Optional[Response]:
+    cur = con.cursor()
+    await cur.execute(_versions_sql(day_range is not None), _versions_params(day_range))
+    return _conditional(request, response, _etag(key, tables, await cur.fetchall()))
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+from typing import Iterator, Optional
+
+from backend.db import db_session, get_targets, int_env
+from backend.time_utils import normalize_date
+from backend.services.day_service import compute_day_summary
+from backend.services.timeoff_service import time_off_overlap_clause
+from backend.tenant import current_user_id
+
+# Streaming exports. Each generator borrows its own pooled connection (the
+# request-scoped one is gone before the body is sent) and reads through a
+# named cursor, i.e. a server-side cursor on Postgres, EXPORT_BATCH_SIZE rows
+# at a time, so memory stays flat and the first batch is sent right away.
+
+EXPORT_BATCH_SIZE = int_env("EXPORT_BATCH_SIZE", 500)
+
+WORK_DAY_CSV_COLUMNS = (
+    "date",
+    "start_time",
+    "end_time",
+    "break_minutes",
+    "gross_minutes",
+    "net_minutes",
+    "running",
+    "daily_status",
+    "notes",
+)
+TIME_OFF_COLUMNS = ("id", "start_date", "end_date", "kind", "label")
+
+
+def _range_clause(column: str, from_date: Optional[str], to_date: Optional[str]) -> tuple[str, list]:
+    where, params = ["user_id = %s"], [current_user_id()]
+    if from_date:
+        where.append(f"{column} >= %s")
+        params.append(from_date)
+    if to_date:
+        where.append(f"{column} <= %s")
+        params.append(to_date)
+    return " WHERE " + " AND ".join(where), params
+
+
+def _batches(con, name: str, sql: str, params) -> Iterator[list[dict]]:
+    cur = con.cursor(name=name)
+    try:
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cur.close()
+
+
+def _work_day_summaries(from_date: Optional[str], to_date: Optional[str]) -> Iterator[list[dict]]:
+    where, params = _range_clause("date", from_date, to_date)
+    with db_session() as con:
+        targets = get_targets(con)
+        for rows in _batches(con, "export_work_days", f"SELECT * FROM work_day{where} ORDER BY date", params):
+            batch = []
+            for row in rows:
+                day_str = normalize_date(row["date"])
+                summary = compute_day_summary(None, day_str, row, targets)
+                summary["notes"] = row.get("notes")
+                batch.append(summary)
+            yield batch
+
+
+def _time_off_rows(from_date: Optional[str], to_date: Optional[str]) -> Iterator[list[dict]]:
+    with db_session() as con:
+        if from_date or to_date:
+            where, params = time_off_overlap_clause(con, from_date, to_date)
+        else:
+            where, params = "user_id = %s", [current_user_id()]
+        sql = f"SELECT * FROM time_off WHERE {where} ORDER BY start_date, id"
+        for rows in _batches(con, "export_time_off", sql, params):
+            yield [{c: row.get(c) for c in TIME_OFF_COLUMNS} for row in rows]
+
+
+def _csv_chunks(header, batches: Iterator[list[list]]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    yield buf.getvalue()
+    for rows in batches:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(rows)
+        yield buf.getvalue()
+
+
+def _ndjson_chunks(batches: Iterator[list[dict]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(json.dumps(item, default=str) + "\n" for item in batch)
+
+
+def export_work_days(fmt: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Iterator[str]:
+    batches = _work_day_summaries(from_date, to_date)
+    if fmt == "ndjson":
+        return _ndjson_chunks(batches)
+    return _csv_chunks(
+        WORK_DAY_CSV_COLUMNS,
+        (
+            [
+                [s["date"], s["start_time"], s["end_time"], s["break_minutes"], s["gross_minutes"],
+                 s["net_minutes"], s["running"], s["status"]["daily"], s["notes"]]
+                for s in batch
+            ]
+            for batch in batches
+        ),
+    )
+
+
+def export_time_off(fmt: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Iterator[str]:
+    batches = _time_off_rows(from_date, to_date)
+    if fmt == "ndjson":
+        return _ndjson_chunks(batches)
+    return _csv_chunks(TIME_OFF_COLUMNS, ([[r[c] for c in TIME_OFF_COLUMNS] for r in batch] for batch in batches))
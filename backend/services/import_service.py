@@ -0,0 +1,169 @@
+import csv
+import io
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+
+from backend.db import SQL_DIALECT, db_session, int_env
+from backend.time_utils import dt_for, normalize_date, parse_date, validate_hhmm
+from backend.services.offday_index import invalidate_offday_index_on_commit
+from backend.services.timeoff_service import new_sync_id, raise_if_overlap_rejected
+from backend.tenant import current_user_id
+
+# Bulk import of historical data. Rows are validated with the same rules as
+# the day/time-off endpoints, then written in multi-row batches (execute_values
+# on Postgres, executemany on SQLite) inside ONE transaction. Invalid rows are
+# reported with their 1-based position and skipped, or with strict=True abort
+# the whole import. Rows go to the current tenant.
+
+IMPORT_BATCH_SIZE = int_env("IMPORT_BATCH_SIZE", 1000)
+TIME_OFF_KINDS = ("vacation", "personal")
+
+_WORK_DAY_UPSERT = (
+    "INSERT INTO work_day (user_id, date, start_time, end_time, break_minutes, notes) VALUES {values} "
+    "ON CONFLICT (user_id, date) DO UPDATE SET start_time = EXCLUDED.start_time, end_time = EXCLUDED.end_time, "
+    "break_minutes = EXCLUDED.break_minutes, notes = EXCLUDED.notes"
+)
+_TIME_OFF_INSERT = "INSERT INTO time_off (user_id, sync_id, start_date, end_date, kind, label) VALUES {values}"
+
+
+def parse_import_body(body: bytes, content_type: Optional[str]) -> list[dict]:
+    """JSON (a list of objects, or {"rows": [...]}) or CSV with a header row."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(400, "Import body must be UTF-8.")
+
+    if "json" in (content_type or ""):
+        try:
+            data = json.loads(text or "null")
+        except ValueError:
+            raise HTTPException(400, "Invalid JSON body.")
+        if isinstance(data, dict):
+            data = data.get("rows")
+        if not isinstance(data, list) or not all(isinstance(r, dict) for r in data):
+            raise HTTPException(400, 'JSON body must be a list of objects or {"rows": [...]}.')
+        return data
+
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def _text(row: dict, key: str) -> Optional[str]:
+    value = row.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _work_day_values(row: dict) -> tuple:
+    day_str = _text(row, "date")
+    if not day_str:
+        raise HTTPException(400, "date is required.")
+    day = parse_date(day_str)
+    start_time = _text(row, "start_time")
+    end_time = _text(row, "end_time")
+    if start_time is not None:
+        validate_hhmm(start_time)
+    if end_time is not None:
+        validate_hhmm(end_time)
+    if start_time and end_time and dt_for(day, end_time) < dt_for(day, start_time):
+        raise HTTPException(400, "End time cannot be earlier than start time (no midnight crossing).")
+
+    raw_break = _text(row, "break_minutes")
+    try:
+        break_minutes = int(raw_break) if raw_break is not None else 0
+    except ValueError:
+        raise HTTPException(400, "break_minutes must be an integer.")
+    if not 0 <= break_minutes <= 24 * 60:
+        raise HTTPException(400, "break_minutes must be between 0 and 1440.")
+
+    return (day.isoformat(), start_time, end_time, break_minutes, _text(row, "notes"))
+
+
+def _time_off_values(row: dict) -> tuple:
+    start_str = _text(row, "start_date")
+    end_str = _text(row, "end_date")
+    if not start_str or not end_str:
+        raise HTTPException(400, "start_date and end_date are required.")
+    s = parse_date(start_str)
+    e = parse_date(end_str)
+    if e < s:
+        raise HTTPException(400, "end_date cannot be earlier than start_date")
+    kind = _text(row, "kind")
+    if kind not in TIME_OFF_KINDS:
+        raise HTTPException(400, f"kind must be one of: {', '.join(TIME_OFF_KINDS)}.")
+    return (s.isoformat(), e.isoformat(), kind, _text(row, "label"))
+
+
+def _validate(rows: list[dict], to_values) -> tuple[list[tuple], list[dict]]:
+    values, errors = [], []
+    for i, row in enumerate(rows, start=1):
+        try:
+            values.append(to_values(row))
+        except HTTPException as exc:
+            errors.append({"row": i, "error": exc.detail})
+    return values, errors
+
+
+def _write_batches(con, sql: str, values: list[tuple]) -> None:
+    cur = con.cursor()
+    if SQL_DIALECT == "postgres":
+        from psycopg2.extras import execute_values
+
+        execute_values(cur, sql.format(values="%s"), values, page_size=IMPORT_BATCH_SIZE)
+        return
+    placeholders = "(" + ", ".join(["%s"] * len(values[0])) + ")"
+    for i in range(0, len(values), IMPORT_BATCH_SIZE):
+        cur.executemany(sql.format(values=placeholders), values[i:i + IMPORT_BATCH_SIZE])
+
+
+def _abort_if_strict(errors: list[dict], strict: bool) -> None:
+    if strict and errors:
+        raise HTTPException(400, {"message": "Import aborted: invalid rows.", "errors": errors})
+
+
+def import_work_days(rows: list[dict], strict: bool = False) -> dict:
+    values, errors = _validate(rows, _work_day_values)
+    _abort_if_strict(errors, strict)
+
+    # A date listed twice keeps its last row (one upsert may not touch a row twice).
+    by_date = {v[0]: v for v in values}
+    values = list(by_date.values())
+    if values:
+        user_id = current_user_id()
+        with db_session() as con:
+            _write_batches(con, _WORK_DAY_UPSERT, [(user_id, *v) for v in values])
+            con.commit()
+    return {"imported": len(values), "skipped": len(rows) - len(errors) - len(values), "errors": errors}
+
+
+def import_time_off(rows: list[dict], strict: bool = False) -> dict:
+    values, errors = _validate(rows, _time_off_values)
+    _abort_if_strict(errors, strict)
+
+    user_id = current_user_id()
+    with db_session() as con:
+        cur = con.cursor()
+        cur.execute("SELECT start_date, end_date, kind, label FROM time_off WHERE user_id = %s", (user_id,))
+        # Re-importing the same file must not duplicate ranges.
+        seen = {
+            (normalize_date(r["start_date"]), normalize_date(r["end_date"]), r["kind"], r["label"])
+            for r in cur.fetchall()
+        }
+        fresh = []
+        for v in values:
+            if v not in seen:
+                seen.add(v)
+                fresh.append(v)
+        if fresh:
+            try:
+                _write_batches(con, _TIME_OFF_INSERT, [(user_id, new_sync_id(), *v) for v in fresh])
+            except Exception as exc:
+                con.rollback()
+                raise_if_overlap_rejected(exc)
+                raise
+            invalidate_offday_index_on_commit(con)
+            con.commit()
+    return {"imported": len(fresh), "skipped": len(values) - len(fresh), "errors": errors}
@@ -0,0 +1,213 @@
+import heapq
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Optional
+
+from backend.db import SETTINGS_CACHE_TTL_SECONDS, float_env, publish_per_tenant
+from backend.metrics import cache_hit, cache_miss
+from backend.tenant import current_user_id
+from backend.time_utils import parse_date
+
+# Cached "is this day off?" index over recurring_holiday and time_off, one per
+# tenant. Built from two small scans of the tenant's rows, kept in memory, and
+# dropped whenever one of the four mutating services commits, so week/calendar
+# reads never touch those tables. Like the settings cache, entries expire after
+# a TTL so writes made by another process show up (defaults to the settings TTL).
+
+OFFDAY_CACHE_TTL_SECONDS = float_env("OFFDAY_CACHE_TTL_SECONDS", SETTINGS_CACHE_TTL_SECONDS)
+
+_INDEX: dict[str, "OffDayIndex"] = {}
+_VERSION = 0
+_LOCK = threading.Lock()
+
+
+class OffDayIndex:
+    def __init__(self, recurring_rows: list[dict], time_off_rows: list[dict]):
+        self.loaded_at = time.monotonic()
+        self._recurring: dict[tuple[int, int], dict] = {}
+        for r in recurring_rows:
+            try:
+                d = parse_date(r.get("date"))
+            except Exception:
+                continue
+            self._recurring[(d.month, d.day)] = dict(r)
+
+        self._starts: list[date] = []
+        self._segments: list[tuple[date, date, dict]] = []
+        self._build_segments([dict(r) for r in time_off_rows])
+
+    def _build_segments(self, rows: list[dict]) -> None:
+        """
+        Flatten possibly-overlapping time off ranges into sorted, disjoint
+        segments. Where ranges overlap, the later one in (start_date, id)
+        order wins, matching what a day-by-day expansion would produce.
+        """
+        intervals = []
+        for r in rows:
+            try:
+                s = parse_date(r["start_date"])
+                e = parse_date(r["end_date"])
+            except Exception:
+                continue
+            if e >= s:
+                intervals.append((s, e, r))
+        intervals.sort(key=lambda it: (it[0], it[2].get("id") or 0))
+
+        bounds = sorted({s for s, _, _ in intervals} | {e + timedelta(days=1) for _, e, _ in intervals})
+        active: list[tuple[int, date, dict]] = []
+        i = 0
+        for lo, hi in zip(bounds, bounds[1:]):
+            while i < len(intervals) and intervals[i][0] <= lo:
+                s, e, r = intervals[i]
+                heapq.heappush(active, (-i, e, r))
+                i += 1
+            while active and active[0][1] < lo:
+                heapq.heappop(active)
+            if not active:
+                continue
+            row = active[0][2]
+            last = hi - timedelta(days=1)
+            if self._segments and self._segments[-1][2] is row and self._segments[-1][1] + timedelta(days=1) == lo:
+                self._segments[-1] = (self._segments[-1][0], last, row)
+            else:
+                self._segments.append((lo, last, row))
+        self._starts = [s for s, _, _ in self._segments]
+
+    def time_off_row(self, d: date) -> Optional[dict]:
+        i = bisect_right(self._starts, d) - 1
+        if i >= 0 and self._segments[i][1] >= d:
+            return self._segments[i][2]
+        return None
+
+    def time_off_days(self, start: date, end: date) -> dict[str, dict]:
+        """Map YYYY-MM-DD -> time_off row for any personal off day in [start, end]."""
+        out: dict[str, dict] = {}
+        i = max(0, bisect_right(self._starts, start) - 1)
+        while i < len(self._segments):
+            s, e, row = self._segments[i]
+            if s > end:
+                break
+            d = max(s, start)
+            last = min(e, end)
+            while d <= last:
+                out[d.isoformat()] = row
+                d += timedelta(days=1)
+            i += 1
+        return out
+
+    def off_info(self, d: date) -> Optional[dict]:
+        """Why `d` is off (personal time off beats a recurring holiday), or None."""
+        po = self.time_off_row(d)
+        if po:
+            return _personal_info(po)
+        rh = self._recurring.get((d.month, d.day))
+        if rh:
+            return _recurring_info(rh)
+        return None
+
+    def off_days(self, start: date, end: date) -> dict[str, dict]:
+        """Map YYYY-MM-DD -> off info for every off day in [start, end]."""
+        out: dict[str, dict] = {}
+        if self._recurring:
+            d = start
+            while d <= end:
+                rh = self._recurring.get((d.month, d.day))
+                if rh:
+                    out[d.isoformat()] = _recurring_info(rh)
+                d += timedelta(days=1)
+        for ds, po in self.time_off_days(start, end).items():
+            out[ds] = _personal_info(po)
+        return out
+
+
+def _recurring_info(rh: dict) -> dict:
+    return {
+        "source": "recurring",
+        "kind": "holiday",
+        "label": rh.get("label"),
+        "recurring_id": rh.get("id"),
+    }
+
+
+def _personal_info(po: dict) -> dict:
+    return {
+        "source": "personal",
+        "kind": po.get("kind"),  # vacation | personal
+        "label": po.get("label"),
+        "time_off_id": po.get("id"),
+        "range": {"start": po.get("start_date"), "end": po.get("end_date")},
+    }
+
+
+def invalidate_offday_index(user_id: Optional[str] = None) -> None:
+    """Drop one tenant's index, or every tenant's."""
+    global _VERSION
+    with _LOCK:
+        _VERSION += 1
+        if user_id is None:
+            _INDEX.clear()
+        else:
+            _INDEX.pop(user_id, None)
+
+
+def invalidate_offday_index_on_commit(con) -> None:
+    """Drop the current tenant's index now and again once `con` commits (readers may race the write)."""
+    user_id = current_user_id()
+    invalidate_offday_index(user_id)
+    on_commit = getattr(con, "on_commit", None)
+    if on_commit is not None:
+        on_commit(lambda: invalidate_offday_index(user_id))
+
+
+def offday_index_version() -> int:
+    return _VERSION
+
+
+def build_offday_index(version: int, recurring_rows, time_off_rows) -> OffDayIndex:
+    """Build the current tenant's index from all of its rows read at `version` and cache it."""
+    index = OffDayIndex(recurring_rows, time_off_rows)
+    with _LOCK:
+        # Don't publish a read that raced with an invalidation.
+        if version == _VERSION:
+            publish_per_tenant(_INDEX, current_user_id(), index)
+    return index
+
+
+def cached_offday_index() -> Optional[OffDayIndex]:
+    """The current tenant's cached index, or None when it is missing or expired."""
+    index = _INDEX.get(current_user_id())
+    if index is not None and OFFDAY_CACHE_TTL_SECONDS > 0 and time.monotonic() - index.loaded_at > OFFDAY_CACHE_TTL_SECONDS:
+        return None
+    return index
+
+
+def get_offday_index(con) -> OffDayIndex:
+    user_id = current_user_id()
+    index = cached_offday_index()
+    if index is not None:
+        cache_hit("offday_index")
+        return index
+    cache_miss("offday_index")
+    version = _VERSION
+    cur = con.cursor()
+    cur.execute("SELECT * FROM recurring_holiday WHERE user_id = %s", (user_id,))
+    recurring = cur.fetchall()
+    cur.execute("SELECT * FROM time_off WHERE user_id = %s", (user_id,))
+    return build_offday_index(version, recurring, cur.fetchall())
+
+
+async def get_offday_index_async(con) -> OffDayIndex:
+    user_id = current_user_id()
+    index = cached_offday_index()
+    if index is not None:
+        cache_hit("offday_index")
+        return index
+    cache_miss("offday_index")
+    version = _VERSION
+    cur = con.cursor()
+    await cur.execute("SELECT * FROM recurring_holiday WHERE user_id = %s", (user_id,))
+    recurring = await cur.fetchall()
+    await cur.execute("SELECT * FROM time_off WHERE user_id = %s", (user_id,))
+    return build_offday_index(version, recurring, await cur.fetchall())
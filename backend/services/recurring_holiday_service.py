@@ -1,9 +1,12 @@
 from typing import Optional
 
+from backend.services.offday_index import invalidate_offday_index_on_commit
+from backend.tenant import current_user_id
+
 
 def list_recurring(con) -> list[dict]:
     cur = con.cursor()
-    cur.execute("SELECT * FROM recurring_holiday ORDER BY date ASC")
+    cur.execute("SELECT * FROM recurring_holiday WHERE user_id = %s ORDER BY date ASC", (current_user_id(),))
     return cur.fetchall()
 
 
@@ -11,16 +14,18 @@ def upsert_recurring(con, date: str, label: Optional[str]) -> None:
     cur = con.cursor()
     cur.execute(
         """
-        INSERT INTO recurring_holiday (date, label)
-        VALUES (%s, %s)
-        ON CONFLICT(date) DO UPDATE SET label=excluded.label
+        INSERT INTO recurring_holiday (user_id, date, label)
+        VALUES (%s, %s, %s)
+        ON CONFLICT(user_id, date) DO UPDATE SET label=excluded.label
         """,
-        (date, label),
+        (current_user_id(), date, label),
     )
+    invalidate_offday_index_on_commit(con)
     con.commit()
 
 
 def delete_recurring(con, rid: int):
     cur = con.cursor()
-    cur.execute("DELETE FROM recurring_holiday WHERE id = %s", (rid,))
+    cur.execute("DELETE FROM recurring_holiday WHERE id = %s AND user_id = %s", (rid, current_user_id()))
+    invalidate_offday_index_on_commit(con)
     con.commit()
@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+from fastapi import HTTPException
+
+from backend.db import get_targets
+from backend.time_utils import parse_date
+from backend.services.calendar_engine import summarize_days
+from backend.services.day_service import fetch_day_rows
+from backend.services.offday_index import get_offday_index
+
+REPORT_GROUPS = ("day", "week", "month", "year")
+MAX_REPORT_DAYS = 366 * 10
+
+
+def _bucket_start(d: date, group: str) -> date:
+    if group == "week":
+        return d - timedelta(days=d.weekday())
+    if group == "month":
+        return d.replace(day=1)
+    if group == "year":
+        return d.replace(month=1, day=1)
+    return d
+
+
+def _bucket_key(start: date, group: str) -> str:
+    if group == "month":
+        return start.strftime("%Y-%m")
+    if group == "year":
+        return start.strftime("%Y")
+    return start.isoformat()  # day, or the Monday of the week
+
+
+def _new_bucket(key: str, d: date) -> dict:
+    return {
+        "key": key,
+        "start": d.isoformat(),
+        "end": d.isoformat(),
+        "net_minutes": 0,
+        "gross_minutes": 0,
+        "working_days": 0,
+        "off_days": 0,
+    }
+
+
+def compute_report(con, from_str: str, to_str: str, group: str) -> dict:
+    """
+    Net minutes vs targets over [from, to], rolled up by day/week/month/year.
+    Working days follow compute_week: Monday..Friday that are not off days
+    (off_days counts the weekdays that are).
+    Costs one work_day range query; settings and off days come from the caches.
+    """
+    start = parse_date(from_str)
+    end = parse_date(to_str)
+    if end < start:
+        raise HTTPException(400, "to cannot be earlier than from")
+    if (end - start).days >= MAX_REPORT_DAYS:
+        raise HTTPException(400, f"report range is limited to {MAX_REPORT_DAYS} days")
+    if group not in REPORT_GROUPS:
+        raise HTTPException(400, f"group must be one of: {', '.join(REPORT_GROUPS)}")
+
+    targets = get_targets(con)
+    off_map = get_offday_index(con).off_days(start, end)
+    days = summarize_days(start, end, fetch_day_rows(con, start, end), targets)
+
+    buckets: list[dict] = []
+    current = None
+    d = start
+    for summary in days:
+        key = _bucket_key(_bucket_start(d, group), group)
+        if current is None or current["key"] != key:
+            current = _new_bucket(key, d)
+            buckets.append(current)
+        current["end"] = summary["date"]
+        current["net_minutes"] += summary["net_minutes"]
+        current["gross_minutes"] += summary["gross_minutes"]
+        if d.weekday() < 5:
+            if summary["date"] in off_map:
+                current["off_days"] += 1
+            else:
+                current["working_days"] += 1
+        d += timedelta(days=1)
+
+    totals = _new_bucket("total", start)
+    totals["end"] = end.isoformat()
+    for b in buckets:
+        for field in ("net_minutes", "gross_minutes", "working_days", "off_days"):
+            totals[field] += b[field]
+
+    for b in (*buckets, totals):
+        b["soft_target"] = targets["daily_soft"] * b["working_days"]
+        b["hard_target"] = targets["daily_hard"] * b["working_days"]
+        b["soft_variance"] = b["net_minutes"] - b["soft_target"]
+        b["hard_variance"] = b["net_minutes"] - b["hard_target"]
+
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "group": group,
+        "targets": {"daily_soft": targets["daily_soft"], "daily_hard": targets["daily_hard"]},
+        "buckets": buckets,
+        "totals": totals,
+    }
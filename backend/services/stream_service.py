@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import signal
+import time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.db import db_session, float_env, int_env
+from backend.services.dashboard_service import load_dashboard
+from backend.tenant import current_user_id, tenant_scope
+
+# Live day/week state for /api/stream/{date} (server-sent events).
+#
+# One hub task serves every subscriber. It watches the data_version counters:
+# it is woken at once by mutating requests in this process and otherwise
+# polls every STREAM_POLL_SECONDS, so writes from imports, replica pulls or
+# other processes are picked up too. When the counters move, each subscribed
+# date is recomputed ONCE and the result is fanned out to all of its
+# subscribers. While a date's day is running the hub also sends a small
+# "tick" with the fresh day summary every STREAM_TICK_SECONDS. Channels are
+# per (tenant, date), and only the subscribed tenants' counters are read.
+
+STREAM_POLL_SECONDS = float_env("STREAM_POLL_SECONDS", 2.0)
+STREAM_TICK_SECONDS = float_env("STREAM_TICK_SECONDS", 60.0)
+STREAM_KEEPALIVE_SECONDS = float_env("STREAM_KEEPALIVE_SECONDS", 15.0)
+STREAM_QUEUE_SIZE = int_env("STREAM_QUEUE_SIZE", 16)
+
+_CLOSE = None  # queued to a subscriber to end its stream
+
+
+class _Channel:
+    __slots__ = ("subscribers", "last", "running", "next_tick")
+
+    def __init__(self):
+        self.subscribers: set[asyncio.Queue] = set()
+        self.last: Optional[dict] = None
+        self.running = False
+        self.next_tick = 0.0
+
+
+_CHANNELS: dict[tuple[str, str], _Channel] = {}  # (user_id, date) -> channel
+_VERSIONS: Optional[dict] = None  # user_id -> that tenant's counters
+_WAKE: Optional[asyncio.Event] = None
+_TASK: Optional[asyncio.Task] = None
+
+
+def _read_versions(user_ids: list[str]) -> dict:
+    placeholders = ", ".join(["%s"] * len(user_ids))
+    with db_session() as con:
+        cur = con.cursor()
+        cur.execute(
+            f"SELECT user_id, name, version FROM data_version WHERE user_id IN ('', {placeholders})",
+            user_ids,
+        )
+        rows = cur.fetchall()
+    epoch = {r["name"]: r["version"] for r in rows if r["user_id"] == ""}
+    versions = {user_id: dict(epoch) for user_id in user_ids}
+    for r in rows:
+        if r["user_id"]:
+            versions[r["user_id"]][r["name"]] = r["version"]
+    return versions
+
+
+def _snapshot(user_id: str, day_str: str) -> dict:
+    with tenant_scope(user_id), db_session() as con:
+        data = load_dashboard(con, day_str)
+    return {"day": data["day"], "week": data["week"]}
+
+
+def _is_running(state: dict) -> bool:
+    return state["day"]["running"] or any(d["running"] for d in state["week"]["days"])
+
+
+def _send(channel: _Channel, message) -> None:
+    for queue in channel.subscribers:
+        if queue.full():
+            queue.get_nowait()  # slow client: drop its oldest message
+        queue.put_nowait(message)
+
+
+async def _refresh(key: tuple[str, str], channel: _Channel, event: str) -> None:
+    state = await run_in_threadpool(_snapshot, *key)
+    channel.running = _is_running(state)
+    channel.next_tick = time.monotonic() + STREAM_TICK_SECONDS
+    if event == "tick":
+        channel.last = state
+        _send(channel, ("tick", {"day": state["day"]}))
+    elif state != channel.last:
+        channel.last = state
+        _send(channel, ("state", state))
+
+
+async def _hub_loop() -> None:
+    global _VERSIONS
+    while _CHANNELS:
+        try:
+            await asyncio.wait_for(_WAKE.wait(), timeout=STREAM_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _WAKE.clear()
+        try:
+            versions = await run_in_threadpool(_read_versions, sorted({user_id for user_id, _ in _CHANNELS}))
+            previous = _VERSIONS or {}
+            _VERSIONS = versions
+            now = time.monotonic()
+            for key, channel in list(_CHANNELS.items()):
+                changed = versions.get(key[0]) != previous.get(key[0])
+                if changed or channel.last is None:
+                    await _refresh(key, channel, "state")
+                elif channel.running and now >= channel.next_tick:
+                    await _refresh(key, channel, "tick")
+        except Exception:
+            logging.warning("Stream refresh failed; retrying", exc_info=True)
+    _stop_hub()
+
+
+def _stop_hub() -> None:
+    global _TASK, _VERSIONS
+    _TASK = None
+    _VERSIONS = None
+
+
+def notify_change() -> None:
+    """Wake the hub now (call from the event loop after a mutating request)."""
+    if _WAKE is not None and _TASK is not None:
+        _WAKE.set()
+
+
+def subscribe(user_id: str, day_str: str) -> asyncio.Queue:
+    global _WAKE, _TASK
+    channel = _CHANNELS.setdefault((user_id, day_str), _Channel())
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    channel.subscribers.add(queue)
+    if channel.last is not None:
+        queue.put_nowait(("state", channel.last))
+    if _WAKE is None:
+        _WAKE = asyncio.Event()
+    if _TASK is None:
+        _TASK = asyncio.get_running_loop().create_task(_hub_loop())
+    _WAKE.set()
+    return queue
+
+
+def unsubscribe(user_id: str, day_str: str, queue: asyncio.Queue) -> None:
+    channel = _CHANNELS.get((user_id, day_str))
+    if channel is None:
+        return
+    channel.subscribers.discard(queue)
+    if not channel.subscribers:
+        del _CHANNELS[(user_id, day_str)]
+
+
+def close_streams() -> None:
+    """End every open stream and the hub (app shutdown)."""
+    for channel in _CHANNELS.values():
+        _send(channel, _CLOSE)
+    _CHANNELS.clear()
+    if _TASK is not None:
+        _TASK.cancel()
+    _stop_hub()
+
+
+def watch_exit_signals() -> None:
+    """
+    Servers wait for open responses before running the lifespan shutdown, and
+    an SSE response never ends by itself: close the streams as soon as
+    SIGINT/SIGTERM arrives, then let the server's own handler run.
+    """
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            loop.call_soon_threadsafe(close_streams)
+            previous(signum, frame)
+
+        try:
+            signal.signal(sig, handler)
+        except ValueError:
+            return  # not the main thread (e.g. TestClient): nothing to chain
+
+
+def _format(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def event_stream(day_str: str, user_id: Optional[str] = None):
+    """SSE body for one client of `user_id` (default: the current tenant)."""
+    user_id = user_id or current_user_id()
+    queue = subscribe(user_id, day_str)
+    try:
+        yield f"retry: {int(STREAM_POLL_SECONDS * 1000) + 1000}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is _CLOSE:
+                return
+            yield _format(*message)
+    finally:
+        unsubscribe(user_id, day_str, queue)
@@ -1,6 +1,48 @@
+import uuid
 from typing import Optional
-from datetime import date, timedelta
+from datetime import date
+from fastapi import HTTPException
+from backend.db import SQL_DIALECT
 from backend.time_utils import parse_date
+from backend.services.offday_index import get_offday_index, invalidate_offday_index_on_commit
+from backend.tenant import current_user_id
+
+_EXCLUSION_VIOLATION = "23P01"  # Postgres SQLSTATE raised by time_off_no_overlap
+
+
+def time_off_overlap_clause(con, from_date: Optional[str], to_date: Optional[str]) -> tuple[str, list]:
+    """
+    WHERE condition for the current tenant's ranges overlapping [from_date,
+    to_date] (None = open bound). Served on Postgres by the (user_id, daterange)
+    GiST index when btree_gist is available, else by the daterange-only one; on
+    SQLite by the (user_id, start_date, end_date) B-tree.
+    """
+    user_id = current_user_id()
+    if SQL_DIALECT == "postgres":
+        return (
+            "user_id = %s AND daterange(start_date, end_date, '[]') && daterange(%s::date, %s::date, '[]')",
+            [user_id, from_date, to_date],
+        )
+
+    where, params = ["user_id = %s"], [user_id]
+    if from_date:
+        where.append("end_date >= %s")
+        params.append(from_date)
+    if to_date:
+        where.append("start_date <= %s")
+        params.append(to_date)
+    return " AND ".join(where), params
+
+
+def raise_if_overlap_rejected(exc: Exception) -> None:
+    """Turn a time_off_no_overlap violation (TIME_OFF_EXCLUSIVE=1) into a 409."""
+    if getattr(exc, "pgcode", None) == _EXCLUSION_VIOLATION:
+        raise HTTPException(409, "Time off overlaps an existing range.")
+
+
+def new_sync_id() -> str:
+    """Identifies a time_off row across databases (ids are per database)."""
+    return uuid.uuid4().hex
 
 def add_time_off(con, start_date: str, end_date: str, kind: str, label: Optional[str]) -> int:
     s = parse_date(start_date)
@@ -8,62 +50,40 @@ def add_time_off(con, start_date: str, end_date: str, kind: str, label: Optional
     if e < s:
         raise ValueError("end_date cannot be earlier than start_date")
     cur = con.cursor()
-    cur.execute(
-        """
-        INSERT INTO time_off (start_date, end_date, kind, label)
-        VALUES (%s, %s, %s, %s)
-        RETURNING id
-        """,
-        (start_date, end_date, kind, label),
-    )
+    try:
+        cur.execute(
+            """
+            INSERT INTO time_off (user_id, sync_id, start_date, end_date, kind, label)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING id
+            """,
+            (current_user_id(), new_sync_id(), start_date, end_date, kind, label),
+        )
+    except Exception as exc:
+        con.rollback()
+        raise_if_overlap_rejected(exc)
+        raise
     row = cur.fetchone()
+    invalidate_offday_index_on_commit(con)
     con.commit()
     return row["id"]
 
 def list_time_off(con, from_date: Optional[str] = None, to_date: Optional[str] = None) -> list[dict]:
     cur = con.cursor()
     if from_date and to_date:
-        cur.execute(
-            """
-            SELECT * FROM time_off
-            WHERE NOT (end_date < %s OR start_date > %s)
-            ORDER BY start_date ASC, id ASC
-            """,
-            (from_date, to_date),
-        )
+        where, params = time_off_overlap_clause(con, from_date, to_date)
+        cur.execute(f"SELECT * FROM time_off WHERE {where} ORDER BY start_date ASC, id ASC", params)
     else:
-        cur.execute("SELECT * FROM time_off ORDER BY start_date ASC, id ASC")
+        cur.execute("SELECT * FROM time_off WHERE user_id = %s ORDER BY start_date ASC, id ASC", (current_user_id(),))
     
     return [dict(r) for r in cur.fetchall()]
 
 def delete_time_off(con, tid: int) -> None:
     cur = con.cursor()
-    cur.execute("DELETE FROM time_off WHERE id = %s", (tid,))
+    cur.execute("DELETE FROM time_off WHERE id = %s AND user_id = %s", (tid, current_user_id()))
+    invalidate_offday_index_on_commit(con)
     con.commit()
 
 def expand_time_off_days(con, start: date, end: date) -> dict[str, dict]:
     """Map YYY-MM-DD -> time_off row for any off day in [start, end]."""
-    def iso(d: date) -> str:
-        return d.isoformat()
-    
-    cur = con.cursor()
-    cur.execute(
-        """
-        SELECT * FROM time_off
-        WHERE NOT (end_date < %s OR start_date > %s)
-        """,
-        (iso(start), iso(end)),
-    )
-    rows = cur.fetchall()
-
-    out: dict[str, dict] = {}
-    for r in rows:
-        s = parse_date(r["start_date"])
-        e = parse_date(r["end_date"])
-        d = max(s, start)
-        last = min(e, end)
-        while d<= last:
-            out[iso(d)] = r
-            d += timedelta(days=1)
-    
-    return out
+    return get_offday_index(con).time_off_days(start, end)
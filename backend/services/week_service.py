@@ -2,15 +2,15 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 
-from backend.time_utils import parse_date, normalize_date
+from backend.time_utils import parse_date
 from backend.db import get_targets
+from backend.async_db import get_targets_async
 
-from backend.services.day_service import compute_day_summary
-from backend.services.recurring_holiday_service import list_recurring
-from backend.services.timeoff_service import expand_time_off_days
+from backend.services.day_service import compute_day_summary, fetch_day_rows, fetch_day_rows_async
+from backend.services.offday_index import OffDayIndex, get_offday_index, get_offday_index_async
 
 
-def _week_bounds(day_str: str) -> tuple[date, date]:
+def week_bounds(day_str: str) -> tuple[date, date]:
     anchor = parse_date(day_str)  # YYYY-MM-DD
     monday = anchor - timedelta(days=anchor.weekday())
     friday = monday + timedelta(days=4)
@@ -23,79 +23,35 @@ def _ceil_div(a: int, b: int) -> int:
     return (a + b - 1) // b
 
 
-def _fetch_day_rows_for_range(con, start: date, end: date) -> dict[str, dict]:
-    """
-    Fetch all stored day rows for dates in [start, end] in ONE query.
-    Returns: map YYYY-MM-DD -> row
-    Adjust table/column names if yours differ.
-    """
-    cur = con.cursor()
-
-    # IMPORTANT: adjust table name if yours isn't 'days'
-    # IMPORTANT: adjust column name if your date column isn't 'day' or 'date'
-    cur.execute(
-        """
-        SELECT *
-        FROM work_day
-        WHERE date >= %s AND date <= %s
-        """,
-        (start.isoformat(), end.isoformat()),
-    )
-    rows = cur.fetchall()
-
-    out = {}
-    for r in rows:
-        out[normalize_date(r["date"])] = r
-    return out
-
-
 def compute_week(con, day_str: str) -> dict:
-    week_start, week_end = _week_bounds(day_str)
+    week_start, week_end = week_bounds(day_str)
 
     # Settings (your project uses *_minutes keys)
     targets = get_targets(con)
-    daily_soft = targets["daily_soft"]
-    daily_hard = targets["daily_hard"]
+    off_index = get_offday_index(con)  # recurring + personal, cached in memory
+    # --- Fetch all day rows once ---
+    row_map = fetch_day_rows(con, week_start, week_end)
 
-    # --- OFF MAP (recurring + personal) ---
-    rec_items = list_recurring(con)  # {id, date, label}
-    rec_lookup = {}
-    for r in rec_items:
-        try:
-            d = parse_date(r.get("date"))
-            rec_lookup[(d.month, d.day)] = r
-        except Exception:
-            continue
-    personal_map = expand_time_off_days(con, week_start, week_end)  # YYYY-MM-DD -> time_off row
-
-    off_map: dict[str, dict] = {}
-    d = week_start
-    while d <= week_end:
-        ds = d.isoformat()
+    return build_week(day_str, targets, off_index, row_map)
 
-        rh = rec_lookup.get((d.month, d.day))
-        if rh:
-            off_map[ds] = {
-                "source": "recurring",
-                "kind": "holiday",
-                "label": rh.get("label"),
-                "recurring_id": rh.get("id"),
-            }
-
-        po = personal_map.get(ds)
-        if po:
-            off_map[ds] = {
-                "source": "personal",
-                "kind": po.get("kind"),  # vacation | personal
-                "label": po.get("label"),
-                "time_off_id": po.get("id"),
-                "range": {"start": po.get("start_date"), "end": po.get("end_date")},
-            }
 
-        d += timedelta(days=1)
+async def compute_week_async(con, day_str: str) -> dict:
+    week_start, week_end = week_bounds(day_str)
 
-    # --- Fetch all day rows once ---
-    row_map = _fetch_day_rows_for_range(con, week_start, week_end)
+    targets = await get_targets_async(con)
+    off_index = await get_offday_index_async(con)
+    row_map = await fetch_day_rows_async(con, week_start, week_end)
+
+    return build_week(day_str, targets, off_index, row_map)
+
+
+def build_week(day_str: str, targets: dict, off_index: OffDayIndex, row_map: dict[str, dict]) -> dict:
+    week_start, week_end = week_bounds(day_str)
+    daily_soft = targets["daily_soft"]
+    daily_hard = targets["daily_hard"]
+
+    # --- OFF MAP (recurring + personal) ---
+    off_map = off_index.off_days(week_start, week_end)
 
     # --- Build day summaries Mon..Fri ---
     days: list[dict] = []
@@ -107,7 +63,7 @@ def compute_week(con, day_str: str) -> dict:
         ds = d.isoformat()
 
         row = row_map.get(ds)  # may be None if not stored yet
-        summary = compute_day_summary(con, ds, row, targets)
+        summary = compute_day_summary(None, ds, row, targets)
 
         off_info = off_map.get(ds)
         is_off = off_info is not None
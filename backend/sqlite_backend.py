@@ -0,0 +1,87 @@
+import re
+import sqlite3
+
+# Services are written against psycopg2 (%s placeholders, dict rows). This thin
+# adapter gives sqlite3 the same surface so they run unchanged on either backend.
+
+_PLACEHOLDER = re.compile(r"%(s|%)")
+_TRANSLATED: dict[str, str] = {}
+
+
+def _translate(sql: str) -> str:
+    out = _TRANSLATED.get(sql)
+    if out is None:
+        out = _PLACEHOLDER.sub(lambda m: "?" if m.group(1) == "s" else "%", sql)
+        _TRANSLATED[sql] = out
+    return out
+
+
+def _dict_row(cursor, row) -> dict:
+    return {col[0]: row[i] for i, col in enumerate(cursor.description)}
+
+
+class SQLiteCursor:
+    def __init__(self, cur: sqlite3.Cursor):
+        self._cur = cur
+
+    def execute(self, sql: str, params=()):
+        self._cur.execute(_translate(sql), tuple(params or ()))
+        return self
+
+    def executemany(self, sql: str, seq_of_params):
+        self._cur.executemany(_translate(sql), (tuple(p) for p in seq_of_params))
+        return self
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def fetchmany(self, size: int):
+        return self._cur.fetchmany(size)
+
+    def close(self) -> None:
+        self._cur.close()
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    @property
+    def rowcount(self) -> int:
+        return self._cur.rowcount
+
+    @property
+    def description(self):
+        return self._cur.description
+
+
+class SQLiteConnection:
+    def __init__(self, con: sqlite3.Connection, cursor_class=SQLiteCursor):
+        self._con = con
+        self._cursor_class = cursor_class
+        self.closed = False
+        self.autocommit = False
+
+    def cursor(self, name=None):
+        # `name` mirrors psycopg2's server-side cursors; SQLite cursors already stream.
+        return self._cursor_class(self._con.cursor())
+
+    def commit(self) -> None:
+        self._con.commit()
+
+    def rollback(self) -> None:
+        self._con.rollback()
+
+    def close(self) -> None:
+        self.closed = True
+        self._con.close()
+
+
+def connect_sqlite(path: str, cursor_class=SQLiteCursor) -> SQLiteConnection:
+    con = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    con.row_factory = _dict_row
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.execute("PRAGMA busy_timeout=30000")
+    return SQLiteConnection(con, cursor_class)
@@ -0,0 +1,96 @@
+import time
+
+_STARTED_AT = time.perf_counter()  # before the heavy imports below, so they are timed too
+
+import asyncio
+import logging
+import os
+import threading
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from backend.db import float_env
+
+# Startup mode (DB_INIT_MODE):
+#   "blocking"   - init_db() runs before the app is created, as always
+#   "background" - the server binds and serves the SPA at once; init_db() runs
+#                  in a thread and /api requests wait at the readiness gate
+#                  (up to DB_INIT_WAIT_SECONDS) until it has finished
+DB_INIT_MODE = os.getenv("DB_INIT_MODE", "blocking").strip().lower()
+DB_INIT_WAIT_SECONDS = float_env("DB_INIT_WAIT_SECONDS", 30.0)
+
+_LAST_MARK = _STARTED_AT
+_READY = threading.Event()
+# What gated requests await: set on the event loop once _READY is set, so a
+# waiting request holds no threadpool worker.
+_READY_ASYNC = asyncio.Event()
+_INIT_ERROR = None
+
+
+def mark_phase(phase: str) -> None:
+    """Log one step of the startup timeline (time since the previous step and since start)."""
+    global _LAST_MARK
+    now = time.perf_counter()
+    logging.info(
+        "Startup | phase=%s | took=%.0fms | total=%.0fms",
+        phase,
+        (now - _LAST_MARK) * 1000,
+        (now - _STARTED_AT) * 1000,
+    )
+    _LAST_MARK = now
+
+
+def mark_ready() -> None:
+    _READY.set()
+    mark_phase("ready")
+
+
+def start_background_init(init, after_init) -> None:
+    """Run `init` then `after_init` in a thread; the gate opens when both are done (call from the event loop)."""
+    loop = asyncio.get_running_loop()
+
+    def open_gate():
+        try:
+            loop.call_soon_threadsafe(_READY_ASYNC.set)
+        except RuntimeError:
+            pass  # the loop already closed: nobody is waiting
+
+    def run():
+        global _INIT_ERROR
+        try:
+            init()
+            mark_phase("db_init")
+            after_init()
+        except Exception as exc:
+            _INIT_ERROR = str(exc)
+            logging.exception("Background database initialization failed")
+            _READY.set()  # release waiting requests; the gate now answers 503
+            open_gate()
+            return
+        mark_ready()
+        open_gate()
+
+    threading.Thread(target=run, name="db-init", daemon=True).start()
+
+
+def add_readiness_gate(app) -> None:
+    """Hold /api requests until the background init has finished."""
+
+    @app.middleware("http")
+    async def readiness_gate(request: Request, call_next):
+        if request.url.path.startswith("/api/"):
+            if not _READY.is_set():
+                try:
+                    await asyncio.wait_for(_READY_ASYNC.wait(), DB_INIT_WAIT_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            if _INIT_ERROR is not None:
+                return JSONResponse(status_code=503, content={"detail": f"Database initialization failed: {_INIT_ERROR}"})
+            if not _READY.is_set():
+                return JSONResponse(
+                    status_code=503,
+                    content={"detail": "Database is still initializing, please retry."},
+                    headers={"Retry-After": "2"},
+                )
+        return await call_next(request)
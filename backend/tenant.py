@@ -0,0 +1,53 @@
+import os
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi import HTTPException, Request
+
+# Tenancy: every table carries a user_id and every query is scoped to the
+# current one. The id comes from the TENANT_HEADER request header, which an
+# authenticating reverse proxy sets (the app does no authentication itself);
+# requests without it belong to DEFAULT_USER_ID, so a single-user install
+# behaves exactly as before. The request middleware sets the current id for
+# the request; code outside a request (workers, CLI) runs as DEFAULT_USER_ID
+# unless it enters tenant_scope().
+
+DEFAULT_USER_ID = "default"
+TENANT_HEADER = os.getenv("TENANT_HEADER", "X-User-Id")
+
+_USER_ID = re.compile(r"[A-Za-z0-9._@+-]{1,128}")
+_CURRENT: ContextVar[str] = ContextVar("tenant_user_id", default=DEFAULT_USER_ID)
+
+
+def current_user_id() -> str:
+    return _CURRENT.get()
+
+
+def validate_user_id(user_id: str) -> str:
+    if not _USER_ID.fullmatch(user_id):
+        raise HTTPException(400, f"Invalid {TENANT_HEADER}: use 1-128 letters, digits or . _ @ + -")
+    return user_id
+
+
+def user_id_from_request(request: Request) -> str:
+    raw = request.headers.get(TENANT_HEADER)
+    return validate_user_id(raw.strip()) if raw else DEFAULT_USER_ID
+
+
+def begin_tenant(user_id: str):
+    """Make `user_id` current; returns the token for end_tenant."""
+    return _CURRENT.set(user_id)
+
+
+def end_tenant(token) -> None:
+    _CURRENT.reset(token)
+
+
+@contextmanager
+def tenant_scope(user_id: str):
+    token = _CURRENT.set(user_id)
+    try:
+        yield
+    finally:
+        _CURRENT.reset(token)
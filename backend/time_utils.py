@@ -2,6 +2,11 @@ from datetime import datetime, date, timedelta, time
 from fastapi import HTTPException
 
 def parse_date(s) -> date:
+    # DATE columns already come back as native values on Postgres.
+    if isinstance(s, datetime):
+        return s.date()
+    if isinstance(s, date):
+        return s
     try:
         return datetime.strptime(normalize_date(s), "%Y-%m-%d").date()
     except ValueError:
@@ -35,6 +40,8 @@ def normalize_datetime(value):
     raise HTTPException(400, "Invalid datetime format.")
 
 def validate_hhmm(s) -> None:
+    if isinstance(s, time):
+        return
     try:
         datetime.strptime(normalize_hhmm(s), "%H:%M")
     except ValueError:
@@ -44,6 +51,8 @@ def now_hhmm() -> str:
     return datetime.now().strftime("%H:%M")
 
 def dt_for(day: date, hhmm) -> datetime:
+    if isinstance(hhmm, time):
+        return datetime.combine(day, hhmm.replace(second=0, microsecond=0))
     hhmm = normalize_hhmm(hhmm)
     validate_hhmm(hhmm)
     t = datetime.strptime(hhmm, "%H:%M").time()
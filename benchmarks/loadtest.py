@@ -0,0 +1,337 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+# HTTP load test against a running app. Each simulated browser tab is a
+# thread with its own keep-alive connection that loops over a weighted mix of
+# the requests the UI makes (dashboard loads, week refetches, punches,
+# calendar-year views, ...) and revalidates GETs with If-None-Match like the
+# browser does. Concurrency is swept in stages (--tabs 1,2,4,8,...); for each
+# stage the report gives throughput, p50/p95/p99 latency, the error rate and
+# the DB pool figures sampled from /metrics, and flags the first stage where
+# the app collapses (error rate or p99 over the limits).
+#
+#   python -m benchmarks.loadtest --url http://127.0.0.1:8000 --tabs 1,4,16,64
+#   python -m benchmarks.loadtest --spawn-sqlite --tabs 1,8,32 --out load.json
+#
+# Reads use --date (today); punches go to --punch-date, a day far in the
+# future by default, so a run never touches real history.
+
+MIX = (
+    # (operation, weight)
+    ("dashboard", 25),
+    ("week", 25),
+    ("day", 10),
+    ("punch", 20),
+    ("calendar_year", 10),
+    ("time_off", 5),
+    ("settings", 5),
+)
+
+_METRIC_LINE = re.compile(r"^(timetracker_db_pool_\w+|timetracker_db_async_pool_\w+) (\S+)$", re.M)
+
+
+def _percentile(sorted_ms: list[float], pct: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    index = min(len(sorted_ms) - 1, max(0, int(round(pct / 100 * len(sorted_ms))) - 1))
+    return round(sorted_ms[index], 2)
+
+
+class _Tab(threading.Thread):
+    def __init__(self, index: int, base: str, day: str, punch_day: str, stop: threading.Event, think_ms: float, seed: int):
+        super().__init__(name=f"tab-{index}", daemon=True)
+        parts = urlsplit(base)
+        self._host, self._port = parts.hostname, parts.port or 80
+        self._day = day
+        self._punch_day = punch_day
+        self._done = stop
+        self._think = think_ms / 1000
+        self._rng = random.Random(seed * 1000 + index)
+        self._etags: dict[str, str] = {}
+        self._break_added = False
+        self._con = None
+        self.samples: list[tuple[str, float, int]] = []  # (operation, ms, status; 0 = connection error)
+
+    def _request(self, method: str, path: str, body=None) -> int:
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        if method == "GET" and path in self._etags:
+            headers["If-None-Match"] = self._etags[path]
+        if self._con is None:
+            self._con = http.client.HTTPConnection(self._host, self._port, timeout=60)
+        try:
+            self._con.request(method, path, body=payload, headers=headers)
+            response = self._con.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self._con.close()
+            self._con = None
+            return 0
+        etag = response.getheader("ETag")
+        if method == "GET" and etag:
+            self._etags[path] = etag
+        return response.status
+
+    def _punch(self) -> int:
+        # Alternate +1/-1 break minutes so the scratch day never drifts.
+        action = "subtract" if self._break_added else "add"
+        self._break_added = not self._break_added
+        return self._request("POST", f"/api/day/{self._punch_day}/break/{action}?include=week", {"minutes": 1})
+
+    def _run_one(self, operation: str) -> int:
+        day, year = self._day, self._day[:4]
+        if operation == "dashboard":
+            return self._request("GET", f"/api/dashboard/{day}")
+        if operation == "week":
+            return self._request("GET", f"/api/week/{day}")
+        if operation == "day":
+            return self._request("GET", f"/api/day/{day}")
+        if operation == "punch":
+            return self._punch()
+        if operation == "calendar_year":
+            return self._request("GET", f"/api/calendar/year/{year}")
+        if operation == "time_off":
+            return self._request("GET", f"/api/time-off?from_date={year}-01-01&to_date={year}-12-31")
+        return self._request("GET", "/api/settings")
+
+    def run(self):
+        operations = [op for op, _ in MIX]
+        weights = [w for _, w in MIX]
+        while not self._done.is_set():
+            operation = self._rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            status = self._run_one(operation)
+            self.samples.append((operation, (time.perf_counter() - start) * 1000, status))
+            if self._think:
+                time.sleep(self._rng.uniform(0, 2 * self._think))
+        if self._con is not None:
+            self._con.close()
+
+
+def _read_pool_metrics(base: str) -> dict:
+    parts = urlsplit(base)
+    con = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=5)
+    try:
+        con.request("GET", "/metrics")
+        response = con.getresponse()
+        text = response.read().decode()
+    except (OSError, http.client.HTTPException):
+        return {}
+    finally:
+        con.close()
+    if response.status != 200:
+        return {}
+    return {name: float(value) for name, value in _METRIC_LINE.findall(text)}
+
+
+def _sample_pool(base: str, stop: threading.Event, out: list) -> None:
+    while not stop.wait(0.5):
+        sample = _read_pool_metrics(base)
+        if sample:
+            out.append(sample)
+
+
+def _pool_summary(before: dict, after: dict, samples: list[dict]) -> dict:
+    if not after:
+        return {}
+
+    def peak(name):
+        return max((s.get(name, 0.0) for s in samples), default=after.get(name, 0.0))
+
+    def delta(name):
+        return after.get(name, 0.0) - before.get(name, 0.0)
+
+    if "timetracker_db_pool_max_size" in after:
+        return {
+            "max_size": after["timetracker_db_pool_max_size"],
+            "peak_in_use": peak("timetracker_db_pool_in_use"),
+            "peak_waiters": peak("timetracker_db_pool_waiters"),
+            "waited_checkouts": delta("timetracker_db_pool_waited_checkouts_total"),
+            "wait_seconds": round(delta("timetracker_db_pool_wait_seconds_total"), 3),
+            "timeouts": delta("timetracker_db_pool_timeouts_total"),
+        }
+    return {
+        "max_size": after.get("timetracker_db_async_pool_pool_max", 0.0),
+        "peak_in_use": max(
+            (s.get("timetracker_db_async_pool_pool_size", 0.0) - s.get("timetracker_db_async_pool_pool_available", 0.0) for s in samples),
+            default=0.0,
+        ),
+        "peak_waiters": peak("timetracker_db_async_pool_requests_waiting"),
+    }
+
+
+def run_stage(base: str, tabs: int, duration: float, day: str, punch_day: str, think_ms: float, seed: int) -> dict:
+    stop = threading.Event()
+    sampler_stop = threading.Event()
+    pool_samples: list[dict] = []
+    before = _read_pool_metrics(base)
+    workers = [_Tab(i, base, day, punch_day, stop, think_ms, seed) for i in range(tabs)]
+    sampler = threading.Thread(target=_sample_pool, args=(base, sampler_stop, pool_samples), daemon=True)
+
+    started = time.perf_counter()
+    sampler.start()
+    for worker in workers:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    sampler_stop.set()
+    sampler.join()
+    after = _read_pool_metrics(base)
+
+    samples = [s for worker in workers for s in worker.samples]
+    errors = [s for s in samples if s[2] == 0 or s[2] >= 400]
+    by_operation = {}
+    for operation, _ in MIX:
+        ms = sorted(s[1] for s in samples if s[0] == operation)
+        if ms:
+            by_operation[operation] = {"requests": len(ms), "p50_ms": _percentile(ms, 50), "p99_ms": _percentile(ms, 99)}
+    all_ms = sorted(s[1] for s in samples)
+    return {
+        "tabs": tabs,
+        "requests": len(samples),
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": _percentile(all_ms, 50),
+        "p95_ms": _percentile(all_ms, 95),
+        "p99_ms": _percentile(all_ms, 99),
+        "max_ms": round(all_ms[-1], 2) if all_ms else 0.0,
+        "error_rate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "status_503": sum(1 for s in samples if s[2] == 503),
+        "connection_errors": sum(1 for s in samples if s[2] == 0),
+        "operations": by_operation,
+        "pool": _pool_summary(before, after, pool_samples),
+    }
+
+
+def _print_stage(stage: dict) -> None:
+    pool = stage["pool"]
+    pool_text = (
+        f"pool {pool.get('peak_in_use', 0):.0f}/{pool.get('max_size', 0):.0f} waiters<={pool.get('peak_waiters', 0):.0f}"
+        + (f" wait={pool['wait_seconds']:.2f}s timeouts={pool['timeouts']:.0f}" if "wait_seconds" in pool else "")
+        if pool else "pool n/a"
+    )
+    print(
+        f"  tabs={stage['tabs']:<4} {stage['throughput_rps']:>8.1f} req/s  "
+        f"p50 {stage['p50_ms']:>8.1f}ms  p95 {stage['p95_ms']:>8.1f}ms  p99 {stage['p99_ms']:>8.1f}ms  "
+        f"errors {stage['error_rate']:>6.1%}  {pool_text}"
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(base: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    parts = urlsplit(base)
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The app exited during startup; see its output above.")
+        con = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+        try:
+            con.request("GET", "/api/settings")
+            if con.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            con.close()
+        time.sleep(0.2)
+    raise RuntimeError(f"The app did not answer on {base} within {timeout:.0f}s")
+
+
+def spawn_sqlite_app(db_path: str, years: int) -> tuple[subprocess.Popen, str]:
+    """Start the app on a free port over a synthetic SQLite history (offline)."""
+    from benchmarks.synthetic import main as generate_main
+
+    generate_main(["--db", db_path, "--years", str(years)])
+    port = _free_port()
+    env = dict(os.environ, DB_TYPE="sqlite", SQLITE_PATH=os.path.abspath(db_path), SERVE_FRONTEND="0", LOG_LEVEL="WARNING")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_up(base, process)
+    except Exception:
+        process.terminate()
+        raise
+    return process, base
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a realistic request mix against a running TimeTracker app.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="base URL of the running app")
+    parser.add_argument("--tabs", default="1,2,4,8,16,32", help="comma-separated concurrency levels to sweep")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per stage")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between a tab's requests (0 = closed loop)")
+    parser.add_argument("--date", default=date.today().isoformat(), help="day the reads look at")
+    parser.add_argument("--punch-date", default=(date.today() + timedelta(days=3650)).isoformat(), help="scratch day the punches write to")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="a stage above this has collapsed")
+    parser.add_argument("--max-p99-ms", type=float, default=2000.0, help="a stage above this has collapsed")
+    parser.add_argument("--spawn-sqlite", action="store_true", help="start the app locally over synthetic SQLite data")
+    parser.add_argument("--years", type=int, default=3, help="synthetic history for --spawn-sqlite")
+    parser.add_argument("--out", help="write the stage results as JSON here")
+    args = parser.parse_args(argv)
+
+    levels = [int(x) for x in args.tabs.split(",") if x.strip()]
+    process = None
+    tmp = None
+    base = args.url.rstrip("/")
+    if args.spawn_sqlite:
+        tmp = tempfile.TemporaryDirectory(prefix="timetracker-load-")
+        process, base = spawn_sqlite_app(os.path.join(tmp.name, "load.db"), args.years)
+
+    stages = []
+    collapsed_at = None
+    try:
+        print(f"Load test against {base} | {args.duration:.0f}s per stage | reads {args.date} | punches {args.punch_date}")
+        for tabs in levels:
+            stage = run_stage(base, tabs, args.duration, args.date, args.punch_date, args.think_ms, args.seed)
+            stages.append(stage)
+            _print_stage(stage)
+            if collapsed_at is None and (stage["error_rate"] > args.max_error_rate or stage["p99_ms"] > args.max_p99_ms):
+                collapsed_at = tabs
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        if tmp is not None:
+            tmp.cleanup()
+
+    if collapsed_at is None:
+        print(f"\nNo collapse up to {levels[-1]} tabs (limits: errors {args.max_error_rate:.0%}, p99 {args.max_p99_ms:.0f}ms).")
+    else:
+        print(f"\nCollapsed at {collapsed_at} tabs (limits: errors {args.max_error_rate:.0%}, p99 {args.max_p99_ms:.0f}ms).")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"url": base, "duration": args.duration, "collapsed_at": collapsed_at, "stages": stages}, f, indent=2)
+        print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks.synthetic import generate, use_local_database
+
+# Benchmark suite. Fills a throwaway SQLite database with synthetic history,
+# times the core services and every read endpoint (plus idempotent writes)
+# end to end through the ASGI test client, and writes JSON results. Fully
+# offline: nothing but the embedded SQLite backend is used.
+#
+#   python -m benchmarks.run --out bench.json
+#   python -m benchmarks.run --save-baseline benchmarks/baseline.json
+#   python -m benchmarks.run --baseline benchmarks/baseline.json   # exit 1 on regressions
+#   python -m benchmarks.run --users 1000    # same cases, one tenant among 1000
+#
+# A case regresses when its median is more than --tolerance slower than the
+# baseline AND slower by at least --min-delta-ms (sub-0.1ms noise is ignored).
+# Baselines are machine specific: save one on the machine that compares.
+
+
+def _measure(fn, repeat: int, warmup: int, setup=None) -> dict:
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "runs": repeat,
+    }
+
+
+def _drop_caches():
+    from backend.db import invalidate_settings_cache
+    from backend.services.offday_index import invalidate_offday_index
+
+    invalidate_settings_cache()
+    invalidate_offday_index()
+
+
+def _service_cases(con, today: date) -> list[tuple]:
+    from backend.db import get_targets
+    from backend.services.calendar_service import compute_year_calendar
+    from backend.services.day_service import compute_day_summary, fetch_day_rows
+    from backend.services.timeoff_service import expand_time_off_days
+    from backend.services.week_service import compute_week
+
+    day = today.isoformat()
+    past = (today - timedelta(days=7)).isoformat()
+    year_start, year_end = date(today.year, 1, 1), date(today.year, 12, 31)
+    rows = fetch_day_rows(con, today - timedelta(days=7), today)
+    targets = get_targets(con)
+
+    return [
+        ("service.compute_day_summary[done]", lambda: compute_day_summary(con, past, rows.get(past), targets), None),
+        ("service.compute_day_summary[running]", lambda: compute_day_summary(con, day, rows.get(day), targets), None),
+        ("service.compute_week", lambda: compute_week(con, day), None),
+        ("service.compute_week[cold]", lambda: compute_week(con, day), _drop_caches),
+        ("service.compute_year_calendar", lambda: compute_year_calendar(con, today.year), None),
+        ("service.compute_year_calendar[cold]", lambda: compute_year_calendar(con, today.year), _drop_caches),
+        ("service.expand_time_off_days", lambda: expand_time_off_days(con, year_start, year_end), None),
+        ("service.expand_time_off_days[cold]", lambda: expand_time_off_days(con, year_start, year_end), _drop_caches),
+    ]
+
+
+def _get(client, url: str, headers=None):
+    def call():
+        r = client.get(url, headers=headers)
+        if r.status_code not in (200, 304):
+            raise RuntimeError(f"GET {url} -> {r.status_code}: {r.text[:200]}")
+    return call
+
+
+def _send(client, method: str, url: str, **kwargs):
+    def call():
+        r = client.request(method, url, **kwargs)
+        if r.status_code >= 400:
+            raise RuntimeError(f"{method} {url} -> {r.status_code}: {r.text[:200]}")
+    return call
+
+
+def _endpoint_cases(client, today: date, first_day: date) -> list[tuple]:
+    day = today.isoformat()
+    year = today.year
+    etag = client.get(f"/api/dashboard/{day}").headers.get("etag")
+    # Writes go to a day past the generated history and are idempotent, so
+    # repeating them does not change what the reads above measure.
+    spare = (today + timedelta(days=400)).isoformat()
+    import_rows = [
+        {"date": (first_day + timedelta(days=i)).isoformat(), "start_time": "09:00", "end_time": "17:00", "break_minutes": 30}
+        for i in range(30)
+    ]
+
+    return [
+        ("api.GET /api/day/{day_str}", _get(client, f"/api/day/{day}"), None),
+        ("api.GET /api/week/{day_str}", _get(client, f"/api/week/{day}"), None),
+        ("api.GET /api/dashboard/{day_str}", _get(client, f"/api/dashboard/{day}"), None),
+        ("api.GET /api/dashboard/{day_str}[304]", _get(client, f"/api/dashboard/{day}", {"If-None-Match": etag}), None),
+        ("api.GET /api/calendar/year/{year}", _get(client, f"/api/calendar/year/{year}"), None),
+        ("api.GET /api/calendar/year/{year}[cold]", _get(client, f"/api/calendar/year/{year}"), _drop_caches),
+        ("api.GET /api/settings", _get(client, "/api/settings"), None),
+        ("api.GET /api/recurring-holidays", _get(client, "/api/recurring-holidays"), None),
+        ("api.GET /api/time-off", _get(client, "/api/time-off"), None),
+        ("api.GET /api/time-off[year]", _get(client, f"/api/time-off?from_date={year}-01-01&to_date={year}-12-31"), None),
+        ("api.GET /api/report[month]", _get(client, f"/api/report?from={first_day}&to={day}&group=month"), None),
+        ("api.GET /api/export/work-days", _get(client, "/api/export/work-days?format=csv"), None),
+        ("api.GET /metrics", _get(client, "/metrics"), None),
+        ("api.PATCH /api/day/{day_str}", _send(client, "PATCH", f"/api/day/{spare}", json={"start_time": "08:00", "end_time": "16:30", "break_minutes": 30}), None),
+        ("api.POST /api/day/{day_str}/start-now[noop]", _send(client, "POST", f"/api/day/{spare}/start-now"), None),
+        ("api.POST /api/import/work-days[30]", _send(client, "POST", "/api/import/work-days", json=import_rows), None),
+    ]
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def run(db_path: str, years: int, seed: int, repeat: int, warmup: int, only: str | None, users: int = 1) -> dict:
+    use_local_database(db_path)
+    from fastapi.testclient import TestClient
+
+    from backend.db import db_session
+    from backend.main import app
+
+    today = date.today()
+    with db_session() as con:
+        data = generate(con, years, seed, today, users)
+
+    results = {}
+    with TestClient(app) as client, db_session() as con:
+        cases = _service_cases(con, today) + _endpoint_cases(client, today, date.fromisoformat(data["first_day"]))
+        for name, fn, setup in cases:
+            if only and only not in name:
+                continue
+            results[name] = _measure(fn, repeat, warmup, setup)
+            print(f"  {name:<50} median {results[name]['median_ms']:>9.3f}ms  p95 {results[name]['p95_ms']:>9.3f}ms")
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "years": years,
+            "seed": seed,
+            "users": users,
+            "repeat": repeat,
+            "data": data,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_ms: float, report_missing: bool = True) -> list[str]:
+    """Print a comparison table; returns the names of regressed cases."""
+    regressions = []
+    base = baseline.get("results", {})
+    print(f"\n  {'case':<50} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, res in current["results"].items():
+        if name not in base:
+            print(f"  {name:<50} {'-':>10} {res['median_ms']:>9.3f}ms {'new':>8}")
+            continue
+        before, now = base[name]["median_ms"], res["median_ms"]
+        change = (now - before) / before if before else 0.0
+        regressed = change > tolerance and now - before >= min_delta_ms
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {name:<50} {before:>9.3f}ms {now:>9.3f}ms {change:>+7.0%}{flag}")
+        if regressed:
+            regressions.append(name)
+    for name in sorted(base.keys() - current["results"].keys()) if report_missing else ():
+        print(f"  {name:<50} missing from this run")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TimeTracker benchmark suite (offline, SQLite).")
+    parser.add_argument("--years", type=int, default=3, help="years of synthetic history")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--users", type=int, default=1, help="tenants sharing the database (cases run as one of them)")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per case")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--db", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--save-baseline", help="write results JSON here as the new baseline")
+    parser.add_argument("--baseline", help="compare against this results JSON; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="timetracker-bench-") as tmp:
+        db_path = args.db or os.path.join(tmp, "bench.db")
+        print(f"Benchmarking {args.years} years of synthetic history for {args.users} user(s) in {db_path}")
+        current = run(db_path, args.years, args.seed, args.repeat, args.warmup, args.only, args.users)
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2, sort_keys=True)
+            print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance, args.min_delta_ms, report_missing=not args.only)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import argparse
+import os
+import random
+import uuid
+from datetime import date, timedelta
+
+# Synthetic history for benchmarks: N years of weekday work_day rows ending
+# at `until` (which is left running), a set of recurring holidays and time off
+# ranges, some of which overlap. The same seed always produces the same data.
+# With users > 1 the other tenants get histories of their own, so per-user
+# queries can be timed against a shared database; the measured tenant is always
+# the default user and its data does not depend on `users`.
+
+RECURRING_HOLIDAYS = (
+    (1, 1, "New Year"),
+    (1, 6, "Epiphany"),
+    (5, 1, "Labour Day"),
+    (7, 18, "Constitution Day"),
+    (8, 25, "Independence Day"),
+    (10, 12, "Columbus Day"),
+    (11, 2, "All Souls' Day"),
+    (12, 25, "Christmas"),
+)
+NOTES = ("standup", "release day", "on call", "workshop", "customer visit")
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _time_off_ranges(rng: random.Random, first: date, until: date) -> list[tuple]:
+    rows = []
+    for year in range(first.year, until.year + 1):
+        for _ in range(rng.randint(3, 5)):
+            start = date(year, rng.randint(1, 12), rng.randint(1, 28))
+            length = rng.randint(1, 10)
+            rows.append((start, start + timedelta(days=length - 1), "vacation", None))
+            if rng.random() < 0.3:
+                # a personal day inside or across the vacation: overlapping ranges
+                inner = start + timedelta(days=rng.randint(0, length))
+                rows.append((inner, inner, "personal", "appointment"))
+    return [(s.isoformat(), e.isoformat(), kind, label) for s, e, kind, label in rows if s >= first and e <= until]
+
+
+def _work_days(rng: random.Random, first: date, until: date, off: set[str]) -> list[tuple]:
+    rows = []
+    d = first
+    while d <= until:
+        key = d.isoformat()
+        if d.weekday() < 5 and key not in off:
+            start = rng.randint(7 * 60 + 15, 9 * 60 + 45)
+            worked = rng.randint(6 * 60 + 30, 9 * 60 + 45)
+            end = None if d == until else _hhmm(min(start + worked, 23 * 60 + 59))
+            notes = rng.choice(NOTES) if rng.random() < 0.1 else None
+            rows.append((key, _hhmm(start), end, rng.choice((0, 15, 30, 30, 45, 60)), notes))
+        elif d.weekday() >= 5 and rng.random() < 0.03:
+            rows.append((key, "10:00", "12:30", 0, "weekend fix"))  # the odd weekend session
+        d += timedelta(days=1)
+    return rows
+
+
+def _off_days(time_off: list[tuple], first: date, until: date) -> set[str]:
+    off = set()
+    for start, end, _, _ in time_off:
+        d = date.fromisoformat(start)
+        while d <= date.fromisoformat(end):
+            off.add(d.isoformat())
+            d += timedelta(days=1)
+    d = first
+    holidays = {(m, day) for m, day, _ in RECURRING_HOLIDAYS}
+    while d <= until:
+        if (d.month, d.day) in holidays:
+            off.add(d.isoformat())
+        d += timedelta(days=1)
+    return off
+
+
+def _user_rows(rng: random.Random, user_id: str, first: date, until: date) -> tuple[list, list, list]:
+    time_off = _time_off_ranges(rng, first, until)
+    work_days = _work_days(rng, first, until, _off_days(time_off, first, until))
+    holidays = [(date(first.year, m, d).isoformat(), label) for m, d, label in RECURRING_HOLIDAYS]
+    return (
+        [(user_id, *row) for row in work_days],
+        [(user_id, *row) for row in holidays],
+        [(user_id, uuid.UUID(int=rng.getrandbits(128)).hex, *row) for row in time_off],
+    )
+
+
+def generate(con, years: int, seed: int = 1, until: date | None = None, users: int = 1) -> dict:
+    """Replace the work_day, recurring_holiday and time_off contents; returns the default user's row counts."""
+    from backend.tenant import DEFAULT_USER_ID
+
+    until = until or date.today()
+    first = date(until.year - years + 1, 1, 1)
+
+    cur = con.cursor()
+    for table in ("work_day", "recurring_holiday", "time_off"):
+        cur.execute(f"DELETE FROM {table}")
+    for i in range(users):
+        user_id = DEFAULT_USER_ID if i == 0 else f"user{i:05d}"
+        rng = random.Random(seed if i == 0 else f"{seed}:{user_id}")
+        work_days, holidays, time_off = _user_rows(rng, user_id, first, until)
+        if i == 0:
+            counts = {"work_day": len(work_days), "recurring_holiday": len(holidays), "time_off": len(time_off)}
+        cur.executemany(
+            "INSERT INTO work_day (user_id, date, start_time, end_time, break_minutes, notes) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            work_days,
+        )
+        cur.executemany("INSERT INTO recurring_holiday (user_id, date, label) VALUES (%s, %s, %s)", holidays)
+        cur.executemany(
+            "INSERT INTO time_off (user_id, sync_id, start_date, end_date, kind, label) VALUES (%s, %s, %s, %s, %s, %s)",
+            time_off,
+        )
+    con.commit()
+
+    from backend.db import invalidate_settings_cache
+    from backend.services.offday_index import invalidate_offday_index
+
+    invalidate_settings_cache()
+    invalidate_offday_index()
+    return {
+        "first_day": first.isoformat(),
+        "until": until.isoformat(),
+        "users": users,
+        **counts,
+    }
+
+
+def use_local_database(path: str) -> None:
+    """Point the backend at a SQLite file. Call before anything imports backend.db."""
+    os.environ["DB_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = os.path.abspath(path)
+    os.environ["DB_INIT_MODE"] = "blocking"
+    os.environ["SERVE_FRONTEND"] = "0"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Fill a local SQLite database with synthetic history.")
+    parser.add_argument("--db", required=True, help="SQLite file to (re)fill")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--until", type=date.fromisoformat, default=None, help="last day (YYYY-MM-DD), default today")
+    parser.add_argument("--users", type=int, default=1, help="tenants to generate histories for")
+    args = parser.parse_args(argv)
+
+    use_local_database(args.db)
+    from backend.db import db_session, init_db
+
+    init_db()
+    with db_session() as con:
+        counts = generate(con, args.years, args.seed, args.until, args.users)
+    print(f"Generated {counts} in {os.environ['SQLITE_PATH']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import { useEffect, useRef, useState } from "react";
-import { apiGet, apiGetDashboard, apiPatch, apiPost, subscribeToApiActivity } from "./api";
+import { apiGetDashboard, apiPatch, apiPost, subscribeToApiActivity } from "./api";
 import { computeNetMinutesLive, minutesToHHMM, todayISO } from "./time";
 import HolidaysPanel from "./components/HolidaysPanel";
 import TimeTrackerView from "./components/TimeTrackerView";
@@ -27,6 +27,12 @@ export default function App() {
   const [liveNet, setLiveNet] = useState(0);
   const prevActiveTab = useRef(activeTab);
 
+  // Last day received from the server: an edit field still showing its value is not dirty.
+  const dayRef = useRef(day);
+  useEffect(() => {
+    dayRef.current = day;
+  }, [day]);
+
   const loadAll = async (dateStr) => {
     setErr("");
     const data = await apiGetDashboard(dateStr);
@@ -51,6 +57,33 @@ export default function App() {
     loadAll(selectedDate).catch((e) => setErr(String(e)));
   }, [activeTab]);
 
+  // Live updates pushed by the server (changes from other tabs/devices, running-day ticks).
+  useEffect(() => {
+    if (activeTab !== "timetracker" || typeof EventSource === "undefined") return;
+    const source = new EventSource(`/api/stream/${selectedDate}`);
+
+    source.addEventListener("state", (event) => {
+      const data = JSON.parse(event.data);
+      const previous = dayRef.current;
+      dayRef.current = data.day;
+      setDay(data.day);
+      setWeek(data.week);
+      // Never overwrite what the user is typing: skip fields that are focused or edited.
+      const refresh = (field, setEdit, value) => {
+        if (document.activeElement?.dataset?.dayEdit === field) return;
+        setEdit((current) => (current === value(previous) ? value(data.day) : current));
+      };
+      refresh("start", setStartEdit, (d) => d?.start_time ?? "");
+      refresh("end", setEndEdit, (d) => d?.end_time ?? "");
+      refresh("break", setBreakEdit, (d) => String(d?.break_minutes ?? 0));
+    });
+    source.addEventListener("tick", (event) => {
+      setDay(JSON.parse(event.data).day);
+    });
+
+    return () => source.close();
+  }, [selectedDate, activeTab]);
+
   useEffect(() => subscribeToApiActivity(setApiBusy), []);
 
   useEffect(() => {
@@ -156,13 +189,23 @@ export default function App() {
     ? (weekWithLiveToday.days ?? []).reduce((sum, d) => sum + (d.net_minutes ?? 0), 0)
     : 0;
 
+  // Day mutations ask for ?include=week so one request refreshes both panels.
+  const applyDayAndWeek = (res) => {
+    setDay(res.day);
+    setWeek(res.week);
+    return res.day;
+  };
+
   const startNow = async () => {
     try {
-      const d = await apiPost(`/api/day/${selectedDate}/start-now`);
-      setDay(d);
+      const res = await apiPost(`/api/day/${selectedDate}/start-now?include=week`);
+      if (!res.day) {
+        // Already started elsewhere: resync everything.
+        await loadAll(selectedDate);
+        return;
+      }
+      const d = applyDayAndWeek(res);
       setStartEdit(d.start_time ?? "");
-      const w = await apiGet(`/api/week/${selectedDate}`);
-      setWeek(w);
     } catch (e) {
       setErr(String(e));
     }
@@ -170,11 +213,8 @@ export default function App() {
 
   const endNow = async () => {
     try {
-      const d = await apiPost(`/api/day/${selectedDate}/end-now`);
-      setDay(d);
+      const d = applyDayAndWeek(await apiPost(`/api/day/${selectedDate}/end-now?include=week`));
       setEndEdit(d.end_time ?? "");
-      const w = await apiGet(`/api/week/${selectedDate}`);
-      setWeek(w);
     } catch (e) {
       setErr(String(e));
     }
@@ -182,11 +222,8 @@ export default function App() {
 
   const addBreak = async (m) => {
     try {
-      const d = await apiPost(`/api/day/${selectedDate}/break/add`, { minutes: m });
-      setDay(d);
+      const d = applyDayAndWeek(await apiPost(`/api/day/${selectedDate}/break/add?include=week`, { minutes: m }));
       setBreakEdit(String(d.break_minutes ?? 0));
-      const w = await apiGet(`/api/week/${selectedDate}`);
-      setWeek(w);
     } catch (e) {
       setErr(String(e));
     }
@@ -194,11 +231,8 @@ export default function App() {
 
   const startBreak = async () => {
     try {
-      const d = await apiPost(`/api/day/${selectedDate}/break/start`);
-      setDay(d);
+      const d = applyDayAndWeek(await apiPost(`/api/day/${selectedDate}/break/start?include=week`));
       setBreakEdit(String(d.break_minutes ?? 0));
-      const w = await apiGet(`/api/week/${selectedDate}`);
-      setWeek(w);
     } catch (e) {
       setErr(String(e));
     }
@@ -206,11 +240,8 @@ export default function App() {
 
   const endBreak = async () => {
     try {
-      const d = await apiPost(`/api/day/${selectedDate}/break/end`);
-      setDay(d);
+      const d = applyDayAndWeek(await apiPost(`/api/day/${selectedDate}/break/end?include=week`));
       setBreakEdit(String(d.break_minutes ?? 0));
-      const w = await apiGet(`/api/week/${selectedDate}`);
-      setWeek(w);
     } catch (e) {
       setErr(String(e));
     }
@@ -218,11 +249,8 @@ export default function App() {
 
   const subBreak = async (m) => {
     try {
-      const d = await apiPost(`/api/day/${selectedDate}/break/subtract`, { minutes: m });
-      setDay(d);
+      const d = applyDayAndWeek(await apiPost(`/api/day/${selectedDate}/break/subtract?include=week`, { minutes: m }));
       setBreakEdit(String(d.break_minutes ?? 0));
-      const w = await apiGet(`/api/week/${selectedDate}`);
-      setWeek(w);
     } catch (e) {
       setErr(String(e));
     }
@@ -235,10 +263,7 @@ export default function App() {
         end_time: endEdit === "" ? null : endEdit,
         break_minutes: breakEdit === "" ? 0 : Number(breakEdit),
       };
-      const d = await apiPatch(`/api/day/${selectedDate}`, payload);
-      setDay(d);
-      const w = await apiGet(`/api/week/${selectedDate}`);
-      setWeek(w);
+      applyDayAndWeek(await apiPatch(`/api/day/${selectedDate}?include=week`, payload));
     } catch (e) {
       setErr(String(e));
     }
@@ -236,6 +236,7 @@ export default function TimeTrackerView({
                                     <input
                                         type="time"
                                         value={startEdit}
+                                        data-day-edit="start"
                                         onChange={(e) => onStartEdit(e.target.value)}
                                         style={{ padding: "6px 8px", borderRadius: 10, fontSize: 13, width: 100, height: 20 }}
                                     />
@@ -245,6 +246,7 @@ export default function TimeTrackerView({
                                     <input
                                         type="time"
                                         value={endEdit}
+                                        data-day-edit="end"
                                         onChange={(e) => onEndEdit(e.target.value)}
                                         style={{ padding: "6px 8px", borderRadius: 10, fontSize: 13, width: 100, height: 20 }}
                                     />
@@ -256,6 +258,7 @@ export default function TimeTrackerView({
                                         type="number"
                                         min="0"
                                         value={breakEdit}
+                                        data-day-edit="break"
                                         onChange={(e) => onBreakEdit(e.target.value)}
                                         style={{ padding: "6px 8px", borderRadius: 10, fontSize: 13, width: 100, height: 20 }}
                                     />
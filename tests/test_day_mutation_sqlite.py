@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+# The backend reads its configuration at import time.
+os.environ["DB_TYPE"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "timetracker.db")
+os.environ["SERVE_FRONTEND"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.main import app  # noqa: E402
+
+DAY = "2026-10-14"
+
+
+def test_break_add_on_completed_day_returns_new_totals():
+    with TestClient(app) as client:
+        client.patch(f"/api/day/{DAY}", json={"start_time": "09:00", "end_time": "17:00", "break_minutes": 30})
+
+        day = client.post(f"/api/day/{DAY}/break/add", json={"minutes": 30}).json()
+        assert day["break_minutes"] == 60
+        assert day["gross_minutes"] == 480
+        assert day["net_minutes"] == 420
+
+        res = client.post(f"/api/day/{DAY}/break/subtract?include=week", json={"minutes": 30}).json()
+        assert res["day"]["net_minutes"] == 450
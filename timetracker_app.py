@@ -16,15 +16,13 @@ ENV_PATH = os.path.join(RUNTIME_DIR, ".env")
 ENV_EXAMPLE_PATH = os.path.join(RUNTIME_DIR, ".env.example")
 
 
-def _wait_for_server_and_open_browser() -> None:
-    url = f"http://{HOST}:{PORT}/"
-    for _ in range(60):
-        try:
-            with socket.create_connection((HOST, PORT), timeout=0.5):
-                webbrowser.open(url)
-                return
-        except OSError:
-            time.sleep(0.5)
+class _BrowserOpeningServer(uvicorn.Server):
+    """Opens the browser as soon as the socket is bound (no polling)."""
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            threading.Thread(target=webbrowser.open, args=(f"http://{HOST}:{PORT}/",), daemon=True).start()
 
 
 def _terminate_existing_listener() -> None:
@@ -85,6 +83,8 @@ def _show_startup_error(message: str) -> None:
 if __name__ == "__main__":
     try:
         _terminate_existing_listener()
+        # Bind and show the UI right away; the database is initialized behind the readiness gate.
+        os.environ.setdefault("DB_INIT_MODE", "background")
         from backend.main import app
         from backend.build_info import get_build_info
 
@@ -102,8 +102,7 @@ if __name__ == "__main__":
             build_info["built_at"],
         )
 
-        threading.Thread(target=_wait_for_server_and_open_browser, daemon=True).start()
-        uvicorn.run(app, host=HOST, port=PORT)
+        _BrowserOpeningServer(uvicorn.Config(app, host=HOST, port=PORT)).run()
     except Exception as exc:
         _show_startup_error(str(exc))
         raise SystemExit(1) from exc